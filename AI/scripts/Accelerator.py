@@ -0,0 +1,255 @@
+import math
+import numpy as np
+import config.config as config
+from scripts.Agent import Agent
+from AI.scripts.Network import compile_network, pack_networks
+try:
+    import numba
+except ImportError:
+    numba = None
+
+#? AVAILABLE = False -> numba is not installed, MainAI keeps using the Agent objects
+AVAILABLE = numba is not None
+
+
+def _step(y, velocity, can_jump, jump_timer, score, hit, collision_timer, score_timer, can_add_score,
+          alive, action, frames, score_events, collisions, frame, score_event_count, values,
+          node_offsets, nodes, biases, responses, link_starts, link_ends, link_sources, link_weights, outputs,
+          pipe_x, pipe_y, pipe_two_x, pipe_two_y, pipe_width, pipe_height,
+          distance_to_pipe_only_x, distance_x_squared, gap_y_center,
+          bird_x, bird_width, bird_height, screen_height, ticks, query,
+          gravity, force, max_velocity, jump_cooldown, collision_cooldown):
+    """
+    Fused per-bird simulation step: physics, sensors, network and collision.
+
+    Follows Agent.update followed by the network query and jump of
+    MainAI.ai_update, for every alive bird in parallel. A bird that dies
+    records its fitness counters; survivors are not touched.
+
+    Returns:
+        int: The number of birds that died in this step.
+    """
+    half_height = bird_height // 2
+    died = 0
+
+    for i in numba.prange(y.shape[0]):
+        if not alive[i]:
+            continue
+
+        '''
+        Sensors
+        '''
+        player_center_y = y[i] + half_height
+        dy = gap_y_center - player_center_y
+        distance_to_pipe = math.sqrt(distance_x_squared + dy**2)
+        rel_y_to_gap = player_center_y - gap_y_center
+
+        '''
+        Cooldowns and physics
+        '''
+        if hit[i]:
+            if ticks - collision_timer[i] > collision_cooldown:
+                hit[i] = False
+                collision_timer[i] = ticks
+
+        if ticks - score_timer[i] > collision_cooldown:
+            score_timer[i] = ticks
+            can_add_score[i] = True
+
+        v = velocity[i] + gravity
+        if v > max_velocity:
+            v = max_velocity
+        if v < -max_velocity:
+            v = -max_velocity
+        velocity[i] = v
+        y[i] += v
+
+        collision = False
+        if not hit[i]:
+            top = int(y[i] + 0.5) if y[i] >= 0 else -int(0.5 - y[i])
+            if ((bird_x < pipe_x + pipe_width and pipe_x < bird_x + bird_width and
+                    top < pipe_y + pipe_height and pipe_y < top + bird_height) or
+                    (bird_x < pipe_two_x + pipe_width and pipe_two_x < bird_x + bird_width and
+                     top < pipe_two_y + pipe_height and pipe_two_y < top + bird_height)):
+                collision = True
+                hit[i] = True
+
+        if can_add_score[i]:
+            if pipe_x < bird_x < pipe_x + pipe_width:
+                score[i] += 1
+                score_timer[i] = ticks
+                can_add_score[i] = False
+
+        if y[i] > screen_height - half_height or y[i] < 0 - half_height:
+            collision = True
+
+        if ticks - jump_timer[i] > jump_cooldown:
+            can_jump[i] = True
+            jump_timer[i] = ticks
+
+        if collision:
+            frames[i] = frame
+            score_events[i] = score_event_count
+            collisions[i] = 1
+            alive[i] = False
+            died += 1
+            continue
+
+        '''
+        Network
+        '''
+        if query:
+            row = values[i]
+            row[0] = player_center_y
+            row[1] = distance_to_pipe
+            row[2] = distance_to_pipe_only_x
+            row[3] = gap_y_center
+            row[4] = rel_y_to_gap
+            for k in range(node_offsets[i], node_offsets[i + 1]):
+                s = 0.0
+                for j in range(link_starts[k], link_ends[k]):
+                    s += row[link_sources[j]] * link_weights[j]
+                z = 2.5 * (biases[k] + responses[k] * s)
+                z = max(-60.0, min(60.0, z))
+                row[nodes[k]] = math.tanh(z)
+            action[i] = row[outputs[i]] > 0.5
+
+        if action[i] and can_jump[i]:
+            velocity[i] -= force
+            can_jump[i] = False
+
+    return died
+
+
+if AVAILABLE:
+    # nogil lets a render thread run while the kernel simulates
+    _step = numba.njit(parallel=True, cache=True, nogil=True)(_step)
+    # start the thread pool from the importing thread, a pool first started by the simulation thread hangs TBB at exit
+    numba.get_num_threads()
+
+
+def use_one_thread():
+    """
+    Runs the kernel on one thread in the calling thread.
+
+    For worker processes (sweep trials, islands) that already run one per
+    core, where a full thread pool each would oversubscribe the CPU. The
+    workers also set NUMBA_NUM_THREADS = 1 before the first import of numba,
+    which this covers when a forked worker inherited an imported numba.
+    """
+    if AVAILABLE:
+        numba.set_num_threads(1)
+
+
+class Accelerator:
+    """
+    Optional numba backend that simulates a whole generation as arrays.
+
+    Keeps the simulation state of every bird in numpy arrays and advances
+    all of them with one compiled, multi-threaded kernel per step. The
+    Agent objects are only used to draw the birds.
+    """
+    def __init__(self, agents, nets):
+        """
+        Initializes the state arrays from the agents and packs the networks.
+
+        Args:
+            agents (list): The Agent of every bird, used for their start state.
+            nets (list): The neat FeedForwardNetwork of every bird.
+
+        Raises:
+            ValueError: If a network can not be compiled for the kernel.
+        """
+        self.network = pack_networks([compile_network(net) for net in nets])
+
+        n = len(agents)
+        self.y = np.array([agent.y for agent in agents], dtype=np.float64)
+        self.velocity = np.array([agent.velocity for agent in agents], dtype=np.float64)
+        self.can_jump = np.array([agent.can_jump for agent in agents], dtype=np.bool_)
+        self.jump_timer = np.array([agent.jump_cooldown_timer for agent in agents], dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.hit = np.zeros(n, dtype=np.bool_)
+        self.collision_timer = np.array([agent.collision_cooldown_timer for agent in agents], dtype=np.int64)
+        self.score_timer = np.array([agent.score_cooldown_timer for agent in agents], dtype=np.int64)
+        self.can_add_score = np.ones(n, dtype=np.bool_)
+        self.alive = np.ones(n, dtype=np.bool_)
+        self.action = np.zeros(n, dtype=np.bool_)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.score_events = np.zeros(n, dtype=np.int64)
+        self.collisions = np.zeros(n, dtype=np.int64)
+        self.frame = 0
+        self.score_event_count = 0
+        self.values = np.zeros((n, max(self.network['max_slots'], 1)), dtype=np.float64)
+
+    def step(self, observation, ticks, query):
+        """
+        Advances every alive bird by one simulation step.
+
+        Args:
+            observation (Observation): The shared pipe terms from PipeManager.get_observation.
+            ticks (int): The SimClock step.
+            query (bool): Whether the networks decide again in this step.
+
+        Returns:
+            int: The number of birds that died in this step.
+        """
+        network = self.network
+        died = _step(
+            self.y, self.velocity, self.can_jump, self.jump_timer, self.score, self.hit,
+            self.collision_timer, self.score_timer, self.can_add_score,
+            self.alive, self.action, self.frames, self.score_events, self.collisions,
+            self.frame, self.score_event_count, self.values,
+            network['node_offsets'], network['nodes'], network['biases'], network['responses'],
+            network['link_starts'], network['link_ends'], network['link_sources'], network['link_weights'],
+            network['outputs'],
+            observation.top_x, observation.top_y, observation.bottom_x, observation.bottom_y,
+            observation.pipe_width, observation.pipe_height,
+            observation.distance_to_pipe_only_x, observation.distance_x_squared, observation.gap_y_center,
+            Agent.X, Agent.COLLIDER_WIDTH, Agent.COLLIDER_HEIGHT, config.HEIGHT, int(ticks), query,
+            Agent.GRAVITY, Agent.FORCE, Agent.MAX_VELOCITY, Agent.CAN_JUMP_TICKS, Agent.COLLISION_TICKS
+        )
+        self.frame += 1
+        return died
+
+    def first_alive_score(self):
+        """
+        Returns the score of the first alive bird.
+
+        Returns:
+            int: The score, or 0 if every bird is dead.
+        """
+        index = int(np.argmax(self.alive))
+        return int(self.score[index]) if self.alive[index] else 0
+
+    def add_score_event(self):
+        """
+        Counts a score event for every bird that is still alive.
+        """
+        self.score_event_count += 1
+
+    def fitness_counters(self):
+        """
+        Returns the fitness counters of every bird, filling in the survivors.
+
+        Returns:
+            tuple: The frames, score_events and collisions arrays in bird order.
+        """
+        self.frames[self.alive] = self.frame
+        self.score_events[self.alive] = self.score_event_count
+        return self.frames, self.score_events, self.collisions
+
+    def sync(self, agents):
+        """
+        Copies the positions of the alive birds to their Agents for drawing.
+
+        Args:
+            agents (list): The Agent of every bird.
+
+        Returns:
+            list: The alive mask as a list of bools.
+        """
+        alive = self.alive.tolist()
+        for agent, y, is_alive in zip(agents, self.y.tolist(), alive):
+            if is_alive:
+                agent.y = y
+        return alive
@@ -0,0 +1,206 @@
+import math
+from collections import OrderedDict
+
+'''
+Generated networks
+
+#? A network becomes one straight-line Python function, e.g.
+#
+# def activate(inputs):
+#     i0, i1, i2, i3, i4 = inputs
+#     z = 2.5 * (-0.41 + 1.3 * (i0 * 0.52 + i3 * -1.7))
+#     n0 = tanh(-60.0 if z < -60.0 else 60.0 if z > 60.0 else z)
+#     return [n0]
+#
+# Weights, biases and responses are written in as literals (a response of 1.0 and a
+# bias of 0.0 are left out), so no per-node lists or dicts are walked. Only enabled
+# connections and the nodes neat would evaluate for the outputs are generated, in
+# neat's order, so the outputs equal neat.nn.FeedForwardNetwork.activate exactly.
+# tanh/sum are inlined, other activations and aggregations are called by name.
+# Functions are cached by the content of the network, identical genomes share one.
+'''
+CACHE_SIZE = 4096
+_cache = OrderedDict()
+
+
+def _literal(value):
+    """
+    Writes a float so that it reads back exactly.
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        str: Python source of the value.
+    """
+    return repr(float(value))
+
+
+def generate_source(num_inputs, outputs, program):
+    """
+    Writes the Python source of a network.
+
+    Args:
+        num_inputs (int): The number of inputs, they take slots 0..num_inputs-1.
+        outputs (tuple): The slot of every output; slots no node writes return 0.0.
+        program (tuple): (slot, bias, response, links, activation, aggregation) per node in
+            evaluation order, links being (source slot, weight) pairs.
+
+    Returns:
+        str: The source of a function `activate(inputs)` returning the outputs as a list.
+    """
+    names = {slot: f'i{slot}' for slot in range(num_inputs)}
+    lines = ['def activate(inputs):']
+    if num_inputs:
+        lines.append(f'    {", ".join(names[slot] for slot in range(num_inputs))}{"," if num_inputs == 1 else ""} = inputs')
+
+    for slot, bias, response, links, activation, aggregation in program:
+        terms = [f'{names[source]} * {_literal(weight)}' for source, weight in links]
+        if aggregation == 'sum':
+            s = '(' + ' + '.join(terms) + ')' if terms else '0.0'
+        else:
+            s = f'aggregation_{aggregation}([{", ".join(terms)}])'
+        z = s if response == 1.0 else f'{_literal(response)} * {s}'
+        if bias != 0.0:
+            z = f'{_literal(bias)} + {z}'
+
+        name = f'n{len(names) - num_inputs}'
+        if activation == 'tanh':
+            lines.append(f'    z = 2.5 * ({z})')
+            lines.append(f'    {name} = tanh(-60.0 if z < -60.0 else 60.0 if z > 60.0 else z)')
+        else:
+            lines.append(f'    {name} = activation_{activation}({z})')
+        names[slot] = name
+
+    lines.append(f'    return [{", ".join(names.get(slot, "0.0") for slot in outputs)}]')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_function(num_inputs, outputs, program, functions=None):
+    """
+    Returns the generated function of a network, from the cache if it was seen before.
+
+    Args:
+        num_inputs (int): The number of inputs.
+        outputs (tuple): The slot of every output.
+        program (tuple): The nodes as described in generate_source.
+        functions (dict): Activation and aggregation functions by name, for
+            anything but tanh and sum.
+
+    Returns:
+        function: activate(inputs) returning the list of outputs.
+    """
+    key = (num_inputs, outputs, program)
+    function = _cache.get(key)
+    if function is not None:
+        _cache.move_to_end(key)
+        return function
+
+    namespace = {'tanh': math.tanh}
+    for slot, bias, response, links, activation, aggregation in program:
+        if activation != 'tanh':
+            namespace[f'activation_{activation}'] = functions['activation', activation]
+        if aggregation != 'sum':
+            namespace[f'aggregation_{aggregation}'] = functions['aggregation', aggregation]
+    exec(compile(generate_source(num_inputs, outputs, program), '<generated network>', 'exec'), namespace)
+    function = namespace['activate']
+
+    _cache[key] = function
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return function
+
+
+def compile_genome(genome, config):
+    """
+    Generates the activation function of a feed-forward genome.
+
+    Follows neat.nn.FeedForwardNetwork.create: disabled connections are
+    skipped and only the layers neat evaluates for the outputs are kept.
+
+    Args:
+        genome (neat.DefaultGenome): The genome.
+        config (neat.config.Config): The NEAT configuration.
+
+    Returns:
+        function: activate(inputs) returning the list of outputs.
+    """
+    from neat.graphs import feed_forward_layers
+    genome_config = config.genome_config
+    connections = [connection.key for connection in genome.connections.values() if connection.enabled]
+    layers = feed_forward_layers(genome_config.input_keys, genome_config.output_keys, connections)
+
+    slots = {key: slot for slot, key in enumerate(genome_config.input_keys)}
+    functions = {}
+    program = []
+    for layer in layers:
+        for node in sorted(layer):
+            links = tuple(
+                (slots[in_key], genome.connections[in_key, out_key].weight)
+                for in_key, out_key in connections if out_key == node
+            )
+            gene = genome.nodes[node]
+            functions['activation', gene.activation] = genome_config.activation_defs.get(gene.activation)
+            functions['aggregation', gene.aggregation] = genome_config.aggregation_function_defs.get(gene.aggregation)
+            slots[node] = len(slots)
+            program.append((slots[node], gene.bias, gene.response, links, gene.activation, gene.aggregation))
+
+    outputs = tuple(slots.get(key, -1) for key in genome_config.output_keys)
+    return generate_function(len(genome_config.input_keys), outputs, tuple(program), functions)
+
+
+def compile_policy_network(network):
+    """
+    Generates the activation function of a CompiledNetwork, e.g. a loaded policy.
+
+    Args:
+        network (AI.scripts.Network.CompiledNetwork): The network, tanh/sum only.
+
+    Returns:
+        function: activate(inputs) returning the list of outputs.
+    """
+    program = tuple(
+        (
+            slot,
+            network.biases[k],
+            network.responses[k],
+            tuple(zip(
+                network.link_sources[network.link_starts[k]:network.link_starts[k + 1]],
+                network.link_weights[network.link_starts[k]:network.link_starts[k + 1]],
+            )),
+            'tanh',
+            'sum',
+        )
+        for k, slot in enumerate(network.nodes)
+    )
+    return generate_function(network.num_inputs, tuple(network.outputs), program)
+
+
+class GeneratedNetwork:
+    """
+    Drop-in for neat.nn.FeedForwardNetwork that activates a generated function.
+    """
+    __slots__ = ('activate',)
+
+    def __init__(self, activate):
+        """
+        Wraps a generated function.
+
+        Args:
+            activate (function): The function from compile_genome.
+        """
+        self.activate = activate
+
+    @staticmethod
+    def create(genome, config):
+        """
+        Generates the network of a genome, like neat.nn.FeedForwardNetwork.create.
+
+        Args:
+            genome (neat.DefaultGenome): The genome.
+            config (neat.config.Config): The NEAT configuration.
+
+        Returns:
+            GeneratedNetwork: The network.
+        """
+        return GeneratedNetwork(compile_genome(genome, config))
@@ -0,0 +1,440 @@
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import queue
+import threading
+import time
+from neat.reporting import BaseReporter
+import config.config as config
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+ALIVE_CURVE_POINTS = 120
+HISTORY_SIZE = 500
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Flappy AI - training</title>
+<style>
+body { background: #111; color: #ddd; font-family: monospace; margin: 16px; }
+canvas { background: #1b1b1b; display: block; margin: 8px 0 16px 0; }
+span { margin-right: 24px; }
+</style>
+</head>
+<body>
+<div>
+<span id="generation">generation: -</span>
+<span id="best">best: -</span>
+<span id="mean">mean: -</span>
+<span id="species">species: -</span>
+<span id="speed">steps/s: -</span>
+</div>
+<canvas id="fitness" width="800" height="220"></canvas>
+<canvas id="counts" width="800" height="160"></canvas>
+<canvas id="alive" width="800" height="160"></canvas>
+<script>
+const rows = [];
+
+function plot(id, series) {
+    const canvas = document.getElementById(id);
+    const ctx = canvas.getContext('2d');
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    let lo = Infinity, hi = -Infinity, n = 0;
+    for (const s of series) {
+        for (const v of s.values) { lo = Math.min(lo, v); hi = Math.max(hi, v); }
+        n = Math.max(n, s.values.length);
+    }
+    if (n < 2) return;
+    if (hi === lo) hi = lo + 1;
+    series.forEach((s, k) => {
+        ctx.strokeStyle = s.color;
+        ctx.beginPath();
+        s.values.forEach((v, i) => {
+            const x = i / (n - 1) * (canvas.width - 1);
+            const y = canvas.height - 1 - (v - lo) / (hi - lo) * (canvas.height - 1);
+            if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+        });
+        ctx.stroke();
+        ctx.fillStyle = s.color;
+        ctx.fillText(s.label, 8, 14 + 14 * k);
+    });
+}
+
+function render() {
+    const last = rows[rows.length - 1];
+    document.getElementById('generation').textContent = 'generation: ' + last.generation;
+    document.getElementById('best').textContent = 'best: ' + last.best_fitness.toFixed(2);
+    document.getElementById('mean').textContent = 'mean: ' + last.mean_fitness.toFixed(2);
+    document.getElementById('species').textContent = 'species: ' + last.species;
+    document.getElementById('speed').textContent = 'steps/s: ' + last.steps_per_second.toFixed(1);
+    plot('fitness', [
+        {label: 'best fitness', color: '#4caf50', values: rows.map(r => r.best_fitness)},
+        {label: 'mean fitness', color: '#2196f3', values: rows.map(r => r.mean_fitness)},
+    ]);
+    plot('counts', [
+        {label: 'species', color: '#ff9800', values: rows.map(r => r.species)},
+        {label: 'steps/s', color: '#e91e63', values: rows.map(r => r.steps_per_second)},
+    ]);
+    const curves = rows.slice(-5).map((r, i, a) => ({
+        label: 'alive (generation ' + r.generation + ')',
+        color: 'rgba(255, 255, 255, ' + (0.2 + 0.8 * (i + 1) / a.length) + ')',
+        values: r.alive,
+    }));
+    plot('alive', curves);
+}
+
+const socket = new WebSocket('ws://' + location.host + '/ws');
+socket.onmessage = (event) => {
+    rows.push(JSON.parse(event.data));
+    render();
+};
+</script>
+</body>
+</html>
+'''
+
+
+class Dashboard:
+    """
+    Singleton live training dashboard served over HTTP and WebSocket.
+
+    The game loop records the alive count of every simulation step, the
+    DashboardReporter publishes one summary row per generation, and an asyncio
+    server running in a daemon thread streams the rows to connected browsers.
+    Rows cross the thread boundary through a bounded queue that is never
+    waited on, so a slow or missing client can not stall the game loop.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance of Dashboard and enforces the singleton pattern.
+
+        Returns:
+            Dashboard: The instance of Dashboard.
+        """
+        if cls._instance is None:
+            cls._instance = super(Dashboard, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the Dashboard singleton.
+
+        Creates the bounded queue shared with the server thread and the
+        per-generation step counters filled by the game loop. The server
+        itself is only started by `start()`.
+        """
+        if getattr(self, '_initialized', False):
+            return
+        self._initialized = True
+
+        self.HOST = config.DASHBOARD_HOST
+        self.PORT = config.DASHBOARD_PORT
+
+        self.queue = queue.Queue(maxsize=config.DASHBOARD_QUEUE_SIZE)
+        self.thread = None
+        self.dropped = 0
+
+        # alive count of every `stride`-th step; the stride doubles whenever the
+        # list fills up, so a generation that never ends stays bounded
+        self.alive = []
+        self.stride = 1
+        self.last_alive = None
+        self.steps = 0
+        self.generation_start = None
+
+    def start(self):
+        """
+        Starts the dashboard server in a daemon thread.
+
+        Calling this method more than once has no effect.
+        """
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._serve_forever, name='dashboard', daemon=True)
+        self.thread.start()
+        print(f'[Dashboard: http://{self.HOST}:{self.PORT}]')
+
+    def record_step(self, alive, steps):
+        """
+        Records the state of a single simulation step of the current generation.
+
+        Args:
+            alive (int): The number of birds still alive.
+            steps (int): The SimClock step, counted from the start of the generation.
+        """
+        if self.generation_start is None:
+            self.generation_start = time.perf_counter()
+        self.steps = steps
+        self.last_alive = alive
+        if (steps - 1) % self.stride:
+            return
+        self.alive.append(alive)
+        if len(self.alive) >= 2 * ALIVE_CURVE_POINTS:
+            self.alive = self.alive[::2]
+            self.stride *= 2
+
+    def take_generation(self):
+        """
+        Returns and clears the steps recorded for the current generation.
+
+        Returns:
+            tuple: The down-sampled alive curve (list) and the simulation steps per wall-clock second (float).
+        """
+        alive, last_alive = self.alive, self.last_alive
+        elapsed = time.perf_counter() - self.generation_start if self.generation_start is not None else 0.0
+        steps_per_second = self.steps / elapsed if elapsed > 0 else 0.0
+        self.alive, self.stride, self.last_alive, self.steps, self.generation_start = [], 1, None, 0, None
+
+        step = max(1, -(-len(alive) // ALIVE_CURVE_POINTS))
+        curve = alive[::step]
+        if curve and curve[-1] != last_alive:
+            curve.append(last_alive)
+        return curve, steps_per_second
+
+    def publish(self, row):
+        """
+        Hands a generation row to the server thread without blocking.
+
+        If the queue is full the oldest pending row is dropped to make room.
+
+        Args:
+            row (dict): The JSON-serializable generation summary.
+        """
+        while True:
+            try:
+                self.queue.put_nowait(row)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _serve_forever(self):
+        """
+        Entry point of the server thread.
+        """
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        """
+        Runs the HTTP/WebSocket server and the broadcast loop.
+        """
+        self.history = collections.deque(maxlen=HISTORY_SIZE)
+        self.clients = set()
+        server = await asyncio.start_server(self._handle, self.HOST, self.PORT)
+        async with server:
+            await self._broadcast()
+
+    async def _broadcast(self):
+        """
+        Moves rows from the thread-safe queue to every connected client.
+
+        Each client has its own bounded asyncio queue; a client that can not
+        keep up loses its oldest rows instead of slowing the others down.
+        """
+        while True:
+            try:
+                row = self.queue.get_nowait()
+            except queue.Empty:
+                await asyncio.sleep(0.1)
+                continue
+
+            message = json.dumps(row)
+            self.history.append(message)
+            for client in self.clients:
+                if client.full():
+                    client.get_nowait()
+                client.put_nowait(message)
+
+    async def _handle(self, reader, writer):
+        """
+        Serves a single HTTP connection.
+
+        Args:
+            reader (asyncio.StreamReader): The connection reader.
+            writer (asyncio.StreamWriter): The connection writer.
+        """
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        lines = request.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        path = parts[1] if len(parts) > 1 else '/'
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+
+        if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+            await self._websocket(reader, writer, headers)
+            return
+
+        if path == '/':
+            status, body, content_type = '200 OK', PAGE.encode(), 'text/html; charset=utf-8'
+        else:
+            status, body, content_type = '404 Not Found', b'not found', 'text/plain'
+        writer.write(
+            f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _websocket(self, reader, writer, headers):
+        """
+        Completes the WebSocket handshake and streams rows to the client.
+
+        Args:
+            reader (asyncio.StreamReader): The connection reader.
+            writer (asyncio.StreamWriter): The connection writer.
+            headers (dict): The lower-cased request headers.
+        """
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write(
+            'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept}\r\n\r\n'.encode()
+        )
+
+        client = asyncio.Queue(maxsize=config.DASHBOARD_QUEUE_SIZE)
+        for message in list(self.history)[-config.DASHBOARD_QUEUE_SIZE:]:
+            client.put_nowait(message)
+        self.clients.add(client)
+
+        closed = asyncio.ensure_future(self._read_until_close(reader))
+        try:
+            while not closed.done():
+                sender = asyncio.ensure_future(client.get())
+                await asyncio.wait([sender, closed], return_when=asyncio.FIRST_COMPLETED)
+                if not sender.done():
+                    sender.cancel()
+                    break
+                writer.write(self._frame(sender.result()))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            closed.cancel()
+            writer.close()
+
+    async def _read_until_close(self, reader):
+        """
+        Reads and discards client frames until the client disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The connection reader.
+        """
+        try:
+            while True:
+                header = await reader.readexactly(2)
+                opcode = header[0] & 0x0F
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = int.from_bytes(await reader.readexactly(2), 'big')
+                elif length == 127:
+                    length = int.from_bytes(await reader.readexactly(8), 'big')
+                if header[1] & 0x80:
+                    length += 4
+                await reader.readexactly(length)
+                if opcode == 0x8:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+    @staticmethod
+    def _frame(message):
+        """
+        Encodes a text message as a single unmasked WebSocket frame.
+
+        Args:
+            message (str): The message to encode.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        payload = message.encode()
+        length = len(payload)
+        if length < 126:
+            header = bytes([0x81, length])
+        elif length < 65536:
+            header = bytes([0x81, 126]) + length.to_bytes(2, 'big')
+        else:
+            header = bytes([0x81, 127]) + length.to_bytes(8, 'big')
+        return header + payload
+
+
+class DashboardReporter(BaseReporter):
+    """
+    NEAT reporter that publishes per-generation statistics to the Dashboard.
+    """
+    def __init__(self):
+        """
+        Initializes the reporter and its generation timer.
+        """
+        self.dashboard = Dashboard()
+        self.generation = 0
+        self.generation_start = time.time()
+
+    def start_generation(self, generation):
+        """
+        Remembers the generation number and starts its timer.
+
+        Args:
+            generation (int): The generation that is about to be evaluated.
+        """
+        self.generation = generation
+        self.generation_start = time.time()
+
+    def __getstate__(self):
+        """
+        Leaves the Dashboard and its queue out when neat.Checkpointer pickles
+        the reporter along with the species set.
+        """
+        state = self.__dict__.copy()
+        del state['dashboard']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Reconnects a restored reporter to the Dashboard singleton.
+        """
+        self.__dict__.update(state)
+        self.dashboard = Dashboard()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Publishes best and mean fitness, species count, simulation speed and the
+        alive-count curve of the generation that was just evaluated.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The evaluated genomes by key.
+            species (neat.species.DefaultSpeciesSet): The current species set.
+            best_genome (neat.DefaultGenome): The best genome of the generation.
+        """
+        fitnesses = [genome.fitness for genome in population.values()]
+        alive, steps_per_second = self.dashboard.take_generation()
+        self.dashboard.publish({
+            'generation': self.generation,
+            'best_fitness': best_genome.fitness,
+            'mean_fitness': sum(fitnesses) / len(fitnesses),
+            'species': len(species.species),
+            'steps_per_second': steps_per_second,
+            'alive': alive,
+            'time': time.time() - self.generation_start,
+        })
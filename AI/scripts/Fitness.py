@@ -0,0 +1,82 @@
+'''
+Fitness functions
+
+#? A fitness function maps the per-genome counters of a generation to fitness values
+# frames -> simulation steps the bird survived
+# score_events -> times the population score went up while the bird was alive
+# collisions -> 1 if the bird crashed, 0 if it was still alive when the generation ended
+# All three are numpy int64 arrays in genome order; the result is one float per genome.
+# Pick one with config.FITNESS, add new ones with @register('name').
+'''
+
+FITNESS_FUNCTIONS = {}
+
+
+def register(name):
+    """
+    Registers a fitness function under a name usable in config.FITNESS.
+
+    Args:
+        name (str): The name of the fitness function.
+
+    Returns:
+        function: Decorator that registers and returns the function unchanged.
+    """
+    def decorator(function):
+        FITNESS_FUNCTIONS[name] = function
+        return function
+    return decorator
+
+
+def get_fitness_function(name):
+    """
+    Looks up a registered fitness function.
+
+    Args:
+        name (str): The name the function was registered under.
+
+    Returns:
+        function: The fitness function.
+
+    Raises:
+        ValueError: If no function is registered under the name.
+    """
+    try:
+        return FITNESS_FUNCTIONS[name]
+    except KeyError:
+        raise ValueError(f'Unknown fitness function {name!r}, expected one of {sorted(FITNESS_FUNCTIONS)}') from None
+
+
+@register('default')
+def default_fitness(frames, score_events, collisions):
+    """
+    Survival reward, scoring bonus and collision penalty.
+
+    Closed form of the per-frame accounting: +0.1 per survived step, +5 per
+    score event and -1 for crashing.
+
+    Args:
+        frames (np.ndarray): Steps survived by every genome.
+        score_events (np.ndarray): Score events every genome was alive for.
+        collisions (np.ndarray): 1 for every genome that crashed.
+
+    Returns:
+        np.ndarray: The fitness of every genome.
+    """
+    return 0.1 * frames + 5.0 * score_events - collisions
+
+
+@register('survival')
+def survival_fitness(frames, score_events, collisions):
+    """
+    Rewards only the steps survived, ignoring score and crashes.
+
+    Args:
+        frames (np.ndarray): Steps survived by every genome.
+        score_events (np.ndarray): Score events every genome was alive for.
+        collisions (np.ndarray): 1 for every genome that crashed.
+
+    Returns:
+        np.ndarray: The fitness of every genome.
+    """
+    return 0.1 * frames
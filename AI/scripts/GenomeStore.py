@@ -0,0 +1,230 @@
+import json
+import os
+import numpy as np
+
+'''
+Columns
+
+#? One raw little-endian file per column, like AI/scripts/StreamingStatistics.py
+# genome_* -> one value per genome
+# node_* -> one value per node gene, genome g owns node_offsets[g]:node_offsets[g + 1]
+# conn_* -> one value per connection gene, genome g owns conn_offsets[g]:conn_offsets[g + 1]
+# node_activation/node_aggregation index the names listed in the header
+# conn_innovation numbers every distinct (in, out) pair in order of first appearance,
+# since neat-python identifies connection genes by that pair
+'''
+GENOME_COLUMNS = {
+    'genome_key': '<i8',
+    'genome_fitness': '<f8',
+    'node_offsets': '<i8',
+    'conn_offsets': '<i8',
+}
+NODE_COLUMNS = {
+    'node_key': '<i8',
+    'node_bias': '<f8',
+    'node_response': '<f8',
+    'node_activation': '<i2',
+    'node_aggregation': '<i2',
+}
+CONN_COLUMNS = {
+    'conn_in': '<i8',
+    'conn_out': '<i8',
+    'conn_weight': '<f8',
+    'conn_enabled': '|u1',
+    'conn_innovation': '<i8',
+}
+HEADER = 'genomes.json'
+
+
+def write_genomes(path, genomes):
+    """
+    Writes genomes to a columnar genome store directory.
+
+    Args:
+        path (str): The directory the column files are written to.
+        genomes (list): (key, genome) tuples as passed to a NEAT fitness function, or a dict.
+
+    Returns:
+        int: The number of genomes written.
+    """
+    if isinstance(genomes, dict):
+        genomes = list(genomes.items())
+
+    activations = []
+    aggregations = []
+    innovations = {}
+    columns = {name: [] for name in list(GENOME_COLUMNS) + list(NODE_COLUMNS) + list(CONN_COLUMNS)}
+    columns['node_offsets'].append(0)
+    columns['conn_offsets'].append(0)
+
+    for key, genome in genomes:
+        columns['genome_key'].append(key)
+        columns['genome_fitness'].append(np.nan if genome.fitness is None else genome.fitness)
+
+        for node_key, node in genome.nodes.items():
+            if node.activation not in activations:
+                activations.append(node.activation)
+            if node.aggregation not in aggregations:
+                aggregations.append(node.aggregation)
+            columns['node_key'].append(node_key)
+            columns['node_bias'].append(node.bias)
+            columns['node_response'].append(node.response)
+            columns['node_activation'].append(activations.index(node.activation))
+            columns['node_aggregation'].append(aggregations.index(node.aggregation))
+        columns['node_offsets'].append(len(columns['node_key']))
+
+        for (in_key, out_key), connection in genome.connections.items():
+            columns['conn_in'].append(in_key)
+            columns['conn_out'].append(out_key)
+            columns['conn_weight'].append(connection.weight)
+            columns['conn_enabled'].append(connection.enabled)
+            columns['conn_innovation'].append(innovations.setdefault((in_key, out_key), len(innovations)))
+        columns['conn_offsets'].append(len(columns['conn_in']))
+
+    os.makedirs(path, exist_ok=True)
+    for dtypes in (GENOME_COLUMNS, NODE_COLUMNS, CONN_COLUMNS):
+        for name, dtype in dtypes.items():
+            np.array(columns[name], dtype=dtype).tofile(os.path.join(path, name + '.bin'))
+    with open(os.path.join(path, HEADER), 'w') as file:
+        json.dump({
+            'genomes': len(genomes),
+            'nodes': len(columns['node_key']),
+            'connections': len(columns['conn_in']),
+            'genome_columns': GENOME_COLUMNS,
+            'node_columns': NODE_COLUMNS,
+            'conn_columns': CONN_COLUMNS,
+            'activations': activations,
+            'aggregations': aggregations,
+        }, file, indent=4)
+    return len(genomes)
+
+
+class GenomeStore:
+    """
+    Read-only, memory-mapped view of a genome store directory.
+
+    Every column is a np.memmap, so any number of processes can open the same
+    store and read genomes without copying or unpickling them; pages are only
+    loaded when they are touched. Genomes can be read as plain arrays or
+    converted back to neat genome objects.
+    """
+    def __init__(self, path):
+        """
+        Opens a genome store directory.
+
+        Args:
+            path (str): The directory written by write_genomes.
+        """
+        self.path = path
+        with open(os.path.join(self.path, HEADER)) as file:
+            header = json.load(file)
+        self.activations = header['activations']
+        self.aggregations = header['aggregations']
+        self.columns = {}
+        for group in ('genome_columns', 'node_columns', 'conn_columns'):
+            for name, dtype in header[group].items():
+                self.columns[name] = self._map(name, dtype)
+        self.size = header['genomes']
+
+    def _map(self, name, dtype):
+        """
+        Memory-maps a column file.
+
+        Args:
+            name (str): The column name.
+            dtype (str): The numpy dtype of the column.
+
+        Returns:
+            numpy.ndarray: A read-only view of the column.
+        """
+        file_path = os.path.join(self.path, name + '.bin')
+        count = os.path.getsize(file_path) // np.dtype(dtype).itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode='r', shape=(count,))
+
+    def __len__(self):
+        """
+        Returns the number of genomes in the store.
+
+        Returns:
+            int: The number of genomes.
+        """
+        return self.size
+
+    def __getitem__(self, name):
+        """
+        Returns a whole column.
+
+        Args:
+            name (str): The column name, e.g. 'conn_weight'.
+
+        Returns:
+            numpy.ndarray: The memory-mapped column.
+        """
+        return self.columns[name]
+
+    def arrays(self, index):
+        """
+        Returns the node and connection arrays of one genome as views.
+
+        Args:
+            index (int): The position of the genome in the store.
+
+        Returns:
+            dict: Column name to numpy array, sliced to this genome.
+        """
+        node_begin, node_end = self.columns['node_offsets'][index:index + 2]
+        conn_begin, conn_end = self.columns['conn_offsets'][index:index + 2]
+        arrays = {name: self.columns[name][node_begin:node_end] for name in NODE_COLUMNS}
+        arrays.update({name: self.columns[name][conn_begin:conn_end] for name in CONN_COLUMNS})
+        return arrays
+
+    def genome(self, index, config):
+        """
+        Converts one stored genome back to a neat genome object.
+
+        Args:
+            index (int): The position of the genome in the store.
+            config (neat.config.Config): The NEAT configuration, for the genome and gene types.
+
+        Returns:
+            neat.DefaultGenome: The genome, with its fitness if one was stored.
+        """
+        node_gene = config.genome_config.node_gene_type
+        connection_gene = config.genome_config.connection_gene_type
+        genome = config.genome_type(int(self.columns['genome_key'][index]))
+        fitness = float(self.columns['genome_fitness'][index])
+        genome.fitness = None if np.isnan(fitness) else fitness
+
+        arrays = self.arrays(index)
+        for key, bias, response, activation, aggregation in zip(
+                arrays['node_key'].tolist(), arrays['node_bias'].tolist(), arrays['node_response'].tolist(),
+                arrays['node_activation'].tolist(), arrays['node_aggregation'].tolist()):
+            node = node_gene(key)
+            node.bias = bias
+            node.response = response
+            node.activation = self.activations[activation]
+            node.aggregation = self.aggregations[aggregation]
+            genome.nodes[key] = node
+
+        for in_key, out_key, weight, enabled in zip(
+                arrays['conn_in'].tolist(), arrays['conn_out'].tolist(),
+                arrays['conn_weight'].tolist(), arrays['conn_enabled'].tolist()):
+            connection = connection_gene((in_key, out_key))
+            connection.weight = weight
+            connection.enabled = bool(enabled)
+            genome.connections[(in_key, out_key)] = connection
+        return genome
+
+    def genomes(self, config):
+        """
+        Converts every stored genome back to neat genome objects.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration, for the genome and gene types.
+
+        Returns:
+            list: (key, genome) tuples in store order, as a NEAT fitness function expects them.
+        """
+        return [(genome.key, genome) for genome in (self.genome(index, config) for index in range(self.size))]
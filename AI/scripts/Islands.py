@@ -0,0 +1,307 @@
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import tempfile
+import traceback
+import neat
+from neat.reporting import BaseReporter
+import config.config as config
+from AI.scripts.GenomeStore import GenomeStore, write_genomes
+
+'''
+Genome hand-off
+
+#? Genomes never travel through the queues, only the directory of a genome store does
+# An island writes its emigrants (and at the end its best genome) with
+# AI/scripts/GenomeStore.write_genomes into its own directory below the run's
+# store directory; the receiver memory-maps that store and builds the genomes
+# from the columns, so no genome graph is pickled between processes.
+'''
+
+
+def load_genomes(path, neat_config):
+    """
+    Reads every genome of a store written by another island.
+
+    Args:
+        path (str): The genome store directory.
+        neat_config (neat.config.Config): The NEAT configuration, for the genome and gene types.
+
+    Returns:
+        list: The genomes in store order.
+    """
+    return [genome for _, genome in GenomeStore(path).genomes(neat_config)]
+
+
+class IslandStopped(Exception):
+    """
+    Raised inside an island once another island has found a solution.
+    """
+    pass
+
+
+class MigrationReporter(BaseReporter):
+    """
+    NEAT reporter that connects an island to its neighbours.
+
+    After every evaluation it sends statistics to the coordinator. Every
+    `interval` generations it writes the island's best genomes to a genome
+    store, sends its directory to the next island and replaces random members
+    of the new population with whatever migrants have arrived, then
+    re-speciates. Receiving never blocks, so a slow island never holds the
+    others up.
+    """
+    def __init__(self, population, island, inbox, outbox, stats, stop, interval, migrants, store_path):
+        """
+        Initializes the reporter.
+
+        Args:
+            population (neat.Population): The population of this island.
+            island (int): The index of this island.
+            inbox (multiprocessing.Queue): Migrants sent to this island.
+            outbox (multiprocessing.Queue): The inbox of the next island.
+            stats (multiprocessing.Queue): Statistics sent to the coordinator.
+            stop (multiprocessing.Event): Set when any island found a solution.
+            interval (int): Generations between migrations.
+            migrants (int): Genomes sent per migration.
+            store_path (str): The directory this island writes its genome stores into.
+        """
+        self.population = population
+        self.island = island
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stats = stats
+        self.stop = stop
+        self.interval = interval
+        self.migrants = migrants
+        self.store_path = store_path
+        self.random = random.Random(island)
+        self.generation = 0
+        self.emigrants = None
+
+    def start_generation(self, generation):
+        """
+        Stops the island if another island already found a solution.
+
+        Args:
+            generation (int): The generation that is about to be evaluated.
+
+        Raises:
+            IslandStopped: If the stop event is set.
+        """
+        if self.stop.is_set():
+            raise IslandStopped()
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Reports the generation to the coordinator and stores the emigrants before a migration.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The evaluated genomes by key.
+            species (neat.species.DefaultSpeciesSet): The current species set.
+            best_genome (neat.DefaultGenome): The best genome of the generation.
+        """
+        genomes = sorted(population.values(), key=lambda genome: genome.fitness, reverse=True)
+        if not (self.generation + 1) % self.interval:
+            # the store is the copy, the genomes may change during reproduction
+            self.emigrants = os.path.join(self.store_path, f'generation-{self.generation}')
+            write_genomes(self.emigrants, [(genome.key, genome) for genome in genomes[:self.migrants]])
+        fitnesses = [genome.fitness for genome in genomes]
+        self.stats.put((self.island, self.generation, best_genome.fitness,
+                        sum(fitnesses) / len(fitnesses), len(species.species)))
+
+    def found_solution(self, config, generation, best):
+        """
+        Tells the other islands to stop.
+        """
+        self.stop.set()
+
+    def end_generation(self, config, population, species_set):
+        """
+        Exchanges migrants with the neighbouring islands every `interval` generations.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The next generation, modified in place.
+            species_set (neat.species.DefaultSpeciesSet): The species set, re-speciated after immigration.
+        """
+        if (self.generation + 1) % self.interval:
+            return
+
+        if self.emigrants is not None:
+            self.outbox.put(self.emigrants)
+            self.emigrants = None
+
+        arrived = []
+        while True:
+            try:
+                path = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            arrived.extend(load_genomes(path, config))
+            shutil.rmtree(path, ignore_errors=True)
+        if not arrived:
+            return
+
+        victims = self.random.sample(list(population), min(len(arrived), len(population)))
+        for key, migrant in zip(victims, arrived):
+            del population[key]
+            migrant.key = next(self.population.reproduction.genome_indexer)
+            migrant.fitness = None
+            population[migrant.key] = migrant
+        species_set.speciate(config, population, self.generation)
+
+
+def island_main(island, config_path, seed, generations, inbox, outbox, stats, results, stop, interval, migrants, store_path):
+    """
+    Evolves one island headless. Runs in its own process.
+
+    Args:
+        island (int): The index of the island.
+        config_path (str): The NEAT config file.
+        seed (int): Base seed; the island uses seed + island for its course and NEAT.
+        generations (int): The maximum number of generations.
+        inbox (multiprocessing.Queue): Migrants sent to this island.
+        outbox (multiprocessing.Queue): The inbox of the next island.
+        stats (multiprocessing.Queue): Statistics sent to the coordinator.
+        results (multiprocessing.Queue): Receives (island, genome store of the best genome or None) at the end.
+        stop (multiprocessing.Event): Set when any island found a solution.
+        interval (int): Generations between migrations.
+        migrants (int): Genomes sent per migration.
+        store_path (str): The directory of the run's genome stores.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    config.HEADLESS = True
+    config.PRINT_DATA = False
+    config.DASHBOARD = False
+    config.COURSE_SEED = seed + island
+    config.SIM_STEPS_PER_RENDER = max(config.SIM_STEPS_PER_RENDER, 64)
+    # one kernel thread per island, the islands already use every core
+    os.environ['NUMBA_NUM_THREADS'] = '1'
+    # main pulls in pygame and the game objects, only islands need it
+    import main
+    from AI.scripts.Accelerator import use_one_thread
+    use_one_thread()
+
+    # leftover migrants must not keep this process alive at exit
+    outbox.cancel_join_thread()
+    random.seed(seed + island)
+    config_file = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                     neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+    population = neat.Population(config_file)
+    island_path = os.path.join(store_path, f'island-{island}')
+    population.add_reporter(MigrationReporter(population, island, inbox, outbox, stats, stop, interval, migrants, island_path))
+    try:
+        population.run(main.main_ai, generations)
+    except IslandStopped:
+        pass
+    except neat.CompleteExtinctionException:
+        print(f'[Islands: island {island} went extinct in generation {population.generation}]')
+    except Exception:
+        # the coordinator waits for every island, it has to get a result either way
+        print(f'[Islands: island {island} failed]\n{traceback.format_exc()}')
+    best = None
+    if population.best_genome is not None:
+        best = os.path.join(island_path, 'best')
+        write_genomes(best, [(population.best_genome.key, population.best_genome)])
+    results.put((island, best))
+
+
+def run_islands(config_path, islands=None, interval=None, migrants=None, generations=50, seed=0):
+    """
+    Evolves several islands in parallel and returns the best genome of all.
+
+    The islands form a ring: each one sends its best genomes to the next
+    one. The coordinator prints one aggregated line per generation once every
+    running island has reported it.
+
+    Args:
+        config_path (str): The NEAT config file.
+        islands (int): The number of islands, defaults to config.ISLANDS.
+        interval (int): Generations between migrations, defaults to config.MIGRATION_INTERVAL.
+        migrants (int): Genomes sent per migration, defaults to config.MIGRANTS.
+        generations (int): The maximum number of generations per island.
+        seed (int): Base seed of the islands.
+
+    Returns:
+        neat.DefaultGenome: The best genome found by any island.
+
+    Raises:
+        RuntimeError: If no island returned a genome.
+    """
+    islands = islands or config.ISLANDS
+    interval = interval or config.MIGRATION_INTERVAL
+    migrants = migrants or config.MIGRANTS
+    neat_config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                     neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+    store_path = tempfile.mkdtemp(prefix='islands-')
+
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    stats = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(
+            target=island_main,
+            args=(island, config_path, seed, generations, inboxes[island], inboxes[(island + 1) % islands],
+                  stats, results, stop, interval, migrants, store_path),
+            daemon=True,
+        )
+        for island in range(islands)
+    ]
+    for process in processes:
+        process.start()
+
+    def report(generation, rows):
+        best_island = max(rows, key=lambda key: rows[key][0])
+        print(f'[Islands: generation {generation}, best fitness {rows[best_island][0]:.3f} (island {best_island}), '
+              f'mean fitness {sum(row[1] for row in rows.values()) / len(rows):.3f}, '
+              f'species {sum(row[2] for row in rows.values())}]')
+
+    reports = {}
+    finished = {}
+    while len(finished) < islands:
+        try:
+            island, best = results.get_nowait()
+            finished[island] = load_genomes(best, neat_config)[0] if best is not None else None
+            continue
+        except queue.Empty:
+            pass
+        try:
+            island, generation, best, mean, species = stats.get(timeout=0.5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes) and results.empty():
+                break
+            continue
+        reports.setdefault(generation, {})[island] = (best, mean, species)
+        if len(reports[generation]) == islands - len(finished):
+            report(generation, reports.pop(generation))
+
+    for process in processes:
+        process.join()
+
+    # generations only some islands reached, e.g. after one found a solution
+    while True:
+        try:
+            island, generation, best, mean, species = stats.get_nowait()
+        except queue.Empty:
+            break
+        reports.setdefault(generation, {})[island] = (best, mean, species)
+    for generation in sorted(reports):
+        report(generation, reports[generation])
+
+    shutil.rmtree(store_path, ignore_errors=True)
+
+    genomes = [genome for genome in finished.values() if genome is not None]
+    if not genomes:
+        raise RuntimeError(f'None of the {islands} islands returned a genome, see their messages above')
+    return max(genomes, key=lambda genome: genome.fitness)
+
+
+if __name__ == '__main__':
+    winner = run_islands('AI/config/config.txt')
+    print(f'[Islands: winner fitness {winner.fitness}]')
@@ -0,0 +1,248 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import pygame
+from neat.reporting import BaseReporter
+from scripts.Player import Player
+from scripts.Agent import Agent
+from scripts.Pipe import Pipe
+try:
+    import resource
+except ImportError:
+    resource = None
+
+'''
+Memory report
+
+#? One block per generation in MEMORY_REPORT_PATH, measured around the evaluation
+#  (start_generation -> post_evaluate, both after a full gc.collect):
+# - live Player, Agent, Pipe and pygame.Surface objects at the start and the end
+# - traced memory now and at its peak during the generation, and the peak RSS of the process
+# - the tracemalloc difference of the generation summed per module, largest first
+# A generation that ends with more of the counted objects than it started with
+# is printed as a warning. The first generation is not warned about, it loads the
+# assets and creates the singletons every later generation reuses.
+#? tracemalloc slows the simulation down a lot, only turn MEMORY_REPORT on to look for leaks
+'''
+#? Classes whose live instances are counted, by name
+COUNTED = {
+    'Player': Player,
+    'Agent': Agent,
+    'Pipe': Pipe,
+    'Surface': pygame.Surface,
+}
+
+
+def count_objects():
+    """
+    Counts the live instances of the COUNTED classes after a full collection.
+
+    Surfaces are not tracked by the garbage collector, so they are found as
+    the referents of the objects it does track and counted once each.
+
+    Returns:
+        dict: Class name to the number of live instances.
+    """
+    gc.collect()
+    classes = {cls: name for name, cls in COUNTED.items() if cls is not pygame.Surface}
+    counts = dict.fromkeys(COUNTED, 0)
+    surfaces = set()
+    for obj in gc.get_objects():
+        name = classes.get(type(obj))
+        if name is not None:
+            counts[name] += 1
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, pygame.Surface):
+                surfaces.add(id(referent))
+    counts['Surface'] = len(surfaces)
+    return counts
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the process.
+
+    Returns:
+        int: The peak RSS in bytes, or None where the resource module is missing (Windows).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def module_name(filename):
+    """
+    Turns a source file into the dotted name of its module.
+
+    Args:
+        filename (str): The file of a traceback frame.
+
+    Returns:
+        str: The module, e.g. 'scripts.Player' or 'neat.genome', or the file itself if it is not on sys.path.
+    """
+    path = os.path.abspath(filename)
+    roots = [os.path.abspath(entry or os.curdir) for entry in sys.path]
+    root = max((root for root in roots if path.startswith(root + os.sep)), key=len, default=None)
+    if root is None:
+        return filename
+    name = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '.')
+    return name[:-len('.__init__')] if name.endswith('.__init__') else name
+
+
+def group_by_module(snapshot, previous):
+    """
+    Sums the tracemalloc difference between two snapshots per module.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): The later snapshot.
+        previous (tracemalloc.Snapshot): The earlier snapshot.
+
+    Returns:
+        list: (module, size difference in bytes, block count difference), largest change first.
+    """
+    modules = {}
+    for stat in snapshot.compare_to(previous, 'filename'):
+        name = module_name(stat.traceback[0].filename)
+        size, count = modules.get(name, (0, 0))
+        modules[name] = (size + stat.size_diff, count + stat.count_diff)
+    rows = [(name, size, count) for name, (size, count) in modules.items() if size or count]
+    return sorted(rows, key=lambda row: -abs(row[1]))
+
+
+def megabytes(size):
+    """
+    Formats a number of bytes in megabytes.
+
+    Args:
+        size (int): The bytes, or None.
+
+    Returns:
+        str: e.g. '1.25 MB', or 'n/a'.
+    """
+    return 'n/a' if size is None else f'{size / 2**20:.2f} MB'
+
+
+class MemoryReporter(BaseReporter):
+    """
+    NEAT reporter that measures what every generation leaves behind in memory.
+
+    Starts tracemalloc when it is created. Around every evaluation it counts
+    the live COUNTED objects and takes a tracemalloc snapshot, appends the
+    difference to the report file and warns about generations that end with
+    more objects than they started with.
+    """
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
+    def __init__(self, path, top_modules=10):
+        """
+        Starts tracemalloc (unless it is already tracing) and creates (or truncates) the report file.
+
+        Args:
+            path (str): The report file.
+            top_modules (int): Modules listed per generation, the ones that changed most.
+        """
+        self.path = path
+        self.top_modules = top_modules
+        self.generation = 0
+        self.generations = 0
+        self.generation_start = time.time()
+        self.counts = {}
+        self.snapshot = None
+
+        # only the reporter that started tracemalloc stops it again
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, 'w')
+
+    def take_snapshot(self):
+        """
+        Takes a tracemalloc snapshot without the frames of tracemalloc and the import system.
+
+        Returns:
+            tracemalloc.Snapshot: The snapshot.
+        """
+        return tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    def start_generation(self, generation):
+        """
+        Counts the live objects and takes the snapshot the generation is compared to.
+
+        Args:
+            generation (int): The generation that is about to be evaluated.
+        """
+        self.generation = generation
+        self.counts = count_objects()
+        self.snapshot = self.take_snapshot()
+        tracemalloc.reset_peak()
+        self.generation_start = time.time()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Measures the generation that was just evaluated, writes it to the report and warns about leaks.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The evaluated genomes by key.
+            species (neat.species.DefaultSpeciesSet): The current species set.
+            best_genome (neat.DefaultGenome): The best genome of the generation.
+        """
+        evaluation_time = time.time() - self.generation_start
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        counts = count_objects()
+        snapshot = self.take_snapshot()
+        modules = group_by_module(snapshot, self.snapshot) if self.snapshot is not None else []
+        self.snapshot = None
+
+        lines = [
+            f'Generation {self.generation} ({len(population)} genomes, {evaluation_time:.2f} s)',
+            f'  traced {megabytes(traced)}, traced peak {megabytes(traced_peak)}, peak RSS {megabytes(peak_rss())}',
+            '  objects ' + ', '.join(
+                f'{name} {self.counts.get(name, 0)} -> {count}' for name, count in counts.items()),
+        ]
+        for name, size, count in modules[:self.top_modules]:
+            lines.append(f'  {size / 1024:+12.1f} KiB {count:+9d} blocks  {name}')
+        if self.file is not None:
+            self.file.write('\n'.join(lines) + '\n\n')
+            self.file.flush()
+
+        leaked = {name: count - self.counts[name] for name, count in counts.items()
+                  if name in self.counts and count > self.counts[name]}
+        if leaked and self.generations:
+            print(f'[Memory: generation {self.generation} left '
+                  + ', '.join(f'{count} {name}' for name, count in leaked.items())
+                  + f' objects behind, see {self.path}]')
+        self.generations += 1
+
+    def close(self):
+        """
+        Closes the report file and stops tracemalloc if the reporter started it.
+        """
+        if self.file is not None:
+            self.file.close()
+        if self.started_tracing:
+            tracemalloc.stop()
+
+    def __getstate__(self):
+        """
+        Leaves the open report file and the snapshot out when neat.Checkpointer
+        pickles the reporter along with the species set; a restored copy writes
+        nothing and does not stop tracemalloc.
+        """
+        state = self.__dict__.copy()
+        state['file'] = None
+        state['snapshot'] = None
+        state['started_tracing'] = False
+        return state
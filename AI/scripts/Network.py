@@ -0,0 +1,166 @@
+import math
+import numpy as np
+
+'''
+Activations
+
+#? Only the functions used by AI/config/config.txt (activation tanh, aggregation
+# sum) can be compiled; they are recognised by the names neat gives them
+'''
+SUPPORTED_ACTIVATIONS = ('tanh_activation',)
+SUPPORTED_AGGREGATIONS = ('sum_aggregation',)
+
+
+def tanh_activation(z):
+    """
+    The tanh activation exactly as neat computes it.
+
+    Args:
+        z (float): The aggregated and scaled node input.
+
+    Returns:
+        float: The node output.
+    """
+    z = max(-60.0, min(60.0, 2.5 * z))
+    return math.tanh(z)
+
+
+class CompiledNetwork:
+    """
+    Flat, neat-free description of an evaluated feed-forward network.
+
+    Every node gets a slot in a value array: the inputs take slots
+    0..num_inputs-1, the remaining nodes follow. `nodes` lists the slots to
+    evaluate in topological order, node k reads the links
+    link_sources/link_weights[link_starts[k]:link_starts[k + 1]] and outputs
+    tanh(bias + response * sum(value * weight)).
+    """
+    def __init__(self, num_inputs, num_slots, outputs, nodes, biases, responses, link_starts, link_sources, link_weights):
+        """
+        Initializes the CompiledNetwork from its flat lists.
+
+        Args:
+            num_inputs (int): The number of network inputs.
+            num_slots (int): The size of the value array.
+            outputs (list): The slot of every output, in output order.
+            nodes (list): The slots to evaluate, in topological order.
+            biases (list): The bias of every evaluated node.
+            responses (list): The response of every evaluated node.
+            link_starts (list): Offsets of the links of every node, len(nodes) + 1 values.
+            link_sources (list): The source slot of every link.
+            link_weights (list): The weight of every link.
+        """
+        self.num_inputs = num_inputs
+        self.num_slots = num_slots
+        self.outputs = outputs
+        self.nodes = nodes
+        self.biases = biases
+        self.responses = responses
+        self.link_starts = link_starts
+        self.link_sources = link_sources
+        self.link_weights = link_weights
+
+    def activate(self, inputs):
+        """
+        Evaluates the network in plain Python.
+
+        Args:
+            inputs (sequence): One value per network input.
+
+        Returns:
+            list: One value per network output.
+        """
+        values = [0.0] * self.num_slots
+        values[:self.num_inputs] = inputs
+        for k, slot in enumerate(self.nodes):
+            s = 0.0
+            for j in range(self.link_starts[k], self.link_starts[k + 1]):
+                s += values[self.link_sources[j]] * self.link_weights[j]
+            values[slot] = tanh_activation(self.biases[k] + self.responses[k] * s)
+        return [values[slot] for slot in self.outputs]
+
+
+def compile_network(net):
+    """
+    Flattens a neat FeedForwardNetwork into a CompiledNetwork.
+
+    Only the evaluation order neat already computed is used, so neat itself
+    does not have to be imported here.
+
+    Args:
+        net (neat.nn.FeedForwardNetwork): The network to flatten.
+
+    Returns:
+        CompiledNetwork: The flattened network.
+
+    Raises:
+        ValueError: If a node uses an activation or aggregation other than tanh and sum.
+    """
+    slots = {}
+    for key in net.input_nodes:
+        slots[key] = len(slots)
+    for key in net.output_nodes:
+        slots.setdefault(key, len(slots))
+    for node, _, _, _, _, _ in net.node_evals:
+        slots.setdefault(node, len(slots))
+
+    nodes, biases, responses = [], [], []
+    link_starts, link_sources, link_weights = [0], [], []
+    for node, activation, aggregation, bias, response, links in net.node_evals:
+        if activation.__name__ not in SUPPORTED_ACTIVATIONS or aggregation.__name__ not in SUPPORTED_AGGREGATIONS:
+            raise ValueError(f'Node {node} uses {activation.__name__}/{aggregation.__name__}, only tanh/sum can be compiled')
+        nodes.append(slots[node])
+        biases.append(bias)
+        responses.append(response)
+        for source, weight in links:
+            link_sources.append(slots[source])
+            link_weights.append(weight)
+        link_starts.append(len(link_sources))
+
+    return CompiledNetwork(
+        len(net.input_nodes), len(slots), [slots[key] for key in net.output_nodes],
+        nodes, biases, responses, link_starts, link_sources, link_weights
+    )
+
+
+def pack_networks(networks):
+    """
+    Concatenates CompiledNetworks into flat numpy arrays for batch kernels.
+
+    Node k of network i is at index node_offsets[i] + k of the node arrays,
+    its links are link_sources/link_weights[link_starts[k]:link_ends[k]].
+
+    Args:
+        networks (list): The CompiledNetworks, one per bird.
+
+    Returns:
+        dict: The packed arrays and `max_slots`, the largest value array needed.
+    """
+    node_offsets = [0]
+    nodes, biases, responses, link_starts, link_ends = [], [], [], [], []
+    link_sources, link_weights, outputs = [], [], []
+    for network in networks:
+        base = len(link_sources)
+        for k in range(len(network.nodes)):
+            link_starts.append(base + network.link_starts[k])
+            link_ends.append(base + network.link_starts[k + 1])
+        nodes.extend(network.nodes)
+        biases.extend(network.biases)
+        responses.extend(network.responses)
+        link_sources.extend(network.link_sources)
+        link_weights.extend(network.link_weights)
+        outputs.append(network.outputs[0])
+        node_offsets.append(len(nodes))
+
+    return {
+        'node_offsets': np.array(node_offsets, dtype=np.int64),
+        'nodes': np.array(nodes, dtype=np.int64),
+        'biases': np.array(biases, dtype=np.float64),
+        'responses': np.array(responses, dtype=np.float64),
+        'link_starts': np.array(link_starts, dtype=np.int64),
+        'link_ends': np.array(link_ends, dtype=np.int64),
+        'link_sources': np.array(link_sources, dtype=np.int64),
+        'link_weights': np.array(link_weights, dtype=np.float64),
+        'outputs': np.array(outputs, dtype=np.int64),
+        'max_slots': max((network.num_slots for network in networks), default=0),
+    }
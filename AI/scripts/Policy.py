@@ -0,0 +1,100 @@
+import numpy as np
+from AI.scripts.Network import CompiledNetwork, compile_network
+from AI.scripts.Codegen import compile_policy_network
+
+'''
+Policy file
+
+#? A numpy .npz archive with the arrays of a CompiledNetwork
+# nodes/biases/responses -> evaluated nodes in topological order
+# link_starts/link_sources/link_weights -> incoming links of every node
+# outputs -> output slots, num_inputs/num_slots -> value array layout
+'''
+
+
+def export_policy(net, path):
+    """
+    Saves a trained network as a standalone policy file.
+
+    Args:
+        net (neat.nn.FeedForwardNetwork): The network of the winning genome.
+        path (str): Where to write the .npz policy file.
+    """
+    network = compile_network(net)
+    np.savez(
+        path,
+        num_inputs=network.num_inputs,
+        num_slots=network.num_slots,
+        outputs=np.array(network.outputs, dtype=np.int64),
+        nodes=np.array(network.nodes, dtype=np.int64),
+        biases=np.array(network.biases, dtype=np.float64),
+        responses=np.array(network.responses, dtype=np.float64),
+        link_starts=np.array(network.link_starts, dtype=np.int64),
+        link_sources=np.array(network.link_sources, dtype=np.int64),
+        link_weights=np.array(network.link_weights, dtype=np.float64),
+    )
+
+
+class Policy:
+    """
+    Trained bird controller that runs without neat.
+
+    Loads a policy file written by export_policy and activates it with a
+    generated straight-line function (see AI/scripts/Codegen.py), which is
+    far cheaper per call than numpy for networks of this size.
+    """
+    def __init__(self, network):
+        """
+        Generates the activation function of a CompiledNetwork.
+
+        Args:
+            network (CompiledNetwork): The network to evaluate.
+        """
+        self.network = network
+        self.num_inputs = network.num_inputs
+        self.num_slots = network.num_slots
+        self.outputs = tuple(network.outputs)
+        self.function = compile_policy_network(network)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a policy file.
+
+        Args:
+            path (str): The .npz file written by export_policy.
+
+        Returns:
+            Policy: The loaded policy.
+        """
+        with np.load(path) as data:
+            network = CompiledNetwork(
+                int(data['num_inputs']), int(data['num_slots']), data['outputs'].tolist(),
+                data['nodes'].tolist(), data['biases'].tolist(), data['responses'].tolist(),
+                data['link_starts'].tolist(), data['link_sources'].tolist(), data['link_weights'].tolist()
+            )
+        return cls(network)
+
+    def activate(self, inputs):
+        """
+        Evaluates the network.
+
+        Args:
+            inputs (sequence): The network inputs in AI.scripts.Head.get_data order.
+
+        Returns:
+            list: One value per network output.
+        """
+        return self.function(inputs)
+
+    def decide(self, inputs):
+        """
+        Decides whether the bird should jump.
+
+        Args:
+            inputs (sequence): The network inputs in AI.scripts.Head.get_data order.
+
+        Returns:
+            bool: True if the bird should jump.
+        """
+        return self.function(inputs)[0] > 0.5
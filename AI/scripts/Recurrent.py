@@ -0,0 +1,103 @@
+import numpy as np
+from AI.scripts.Network import SUPPORTED_ACTIVATIONS, SUPPORTED_AGGREGATIONS
+
+
+class BatchedRecurrentNetworks:
+    """
+    Evaluates the recurrent networks of a whole population at once.
+
+    Every bird owns a row of two preallocated (population, max_nodes) state
+    arrays; inputs take the first columns of a row, the other nodes follow.
+    A step computes every node of every bird from the previous state, like
+    neat.nn.RecurrentNetwork does with its two value dicts, so the links of
+    all networks are flattened into one weighted np.bincount per step.
+    """
+    def __init__(self, nets):
+        """
+        Flattens the networks into index and weight arrays.
+
+        Args:
+            nets (list): The neat RecurrentNetwork of every bird.
+
+        Raises:
+            ValueError: If a node uses an activation or aggregation other than tanh and sum.
+        """
+        slot_maps = []
+        for net in nets:
+            slots = {}
+            for key in net.input_nodes:
+                slots[key] = len(slots)
+            for key in net.output_nodes:
+                slots.setdefault(key, len(slots))
+            for node, _, _, _, _, links in net.node_evals:
+                slots.setdefault(node, len(slots))
+                for source, _ in links:
+                    slots.setdefault(source, len(slots))
+            slot_maps.append(slots)
+
+        self.population = len(nets)
+        self.num_inputs = len(nets[0].input_nodes) if nets else 0
+        self.max_nodes = max((len(slots) for slots in slot_maps), default=0)
+
+        nodes, biases, responses = [], [], []
+        link_targets, link_sources, link_weights = [], [], []
+        outputs = []
+        for row, (net, slots) in enumerate(zip(nets, slot_maps)):
+            base = row * self.max_nodes
+            for node, activation, aggregation, bias, response, links in net.node_evals:
+                if activation.__name__ not in SUPPORTED_ACTIVATIONS or aggregation.__name__ not in SUPPORTED_AGGREGATIONS:
+                    raise ValueError(f'Node {node} uses {activation.__name__}/{aggregation.__name__}, only tanh/sum can be batched')
+                nodes.append(base + slots[node])
+                biases.append(bias)
+                responses.append(response)
+                for source, weight in links:
+                    link_targets.append(base + slots[node])
+                    link_sources.append(base + slots[source])
+                    link_weights.append(weight)
+            outputs.append(base + slots[net.output_nodes[0]])
+
+        self.nodes = np.array(nodes, dtype=np.int64)
+        self.biases = np.array(biases, dtype=np.float64)
+        self.responses = np.array(responses, dtype=np.float64)
+        self.link_targets = np.array(link_targets, dtype=np.int64)
+        self.link_sources = np.array(link_sources, dtype=np.int64)
+        self.link_weights = np.array(link_weights, dtype=np.float64)
+        self.outputs = np.array(outputs, dtype=np.int64)
+
+        self.states = [np.zeros((self.population, self.max_nodes), dtype=np.float64) for _ in range(2)]
+        self.active = 0
+
+    def step(self, inputs):
+        """
+        Advances the network of every bird by one step.
+
+        Args:
+            inputs (np.ndarray): (population, num_inputs) inputs in AI.scripts.Head.get_data order.
+
+        Returns:
+            np.ndarray: The first output of every bird.
+        """
+        previous = self.states[self.active]
+        current = self.states[1 - self.active]
+        self.active = 1 - self.active
+
+        previous[:, :self.num_inputs] = inputs
+        current[:, :self.num_inputs] = inputs
+
+        flat = previous.reshape(-1)
+        sums = np.bincount(self.link_targets, weights=flat[self.link_sources] * self.link_weights,
+                           minlength=flat.size)
+        z = 2.5 * (self.biases + self.responses * sums[self.nodes])
+        np.clip(z, -60.0, 60.0, out=z)
+        current.reshape(-1)[self.nodes] = np.tanh(z)
+        return current.reshape(-1)[self.outputs]
+
+    def reset_rows(self, rows):
+        """
+        Clears the state of some birds, e.g. when they die.
+
+        Args:
+            rows (int or sequence): The rows to clear.
+        """
+        self.states[0][rows] = 0.0
+        self.states[1][rows] = 0.0
@@ -0,0 +1,260 @@
+import collections
+import json
+import os
+import time
+import numpy as np
+from neat.reporting import BaseReporter
+
+'''
+Columns
+
+#? One raw little-endian file per column, one value per generation
+# species_sizes is the only ragged column: its values for generation g are
+# species_sizes[species_offsets[g - 1]:species_offsets[g]]
+'''
+COLUMNS = {
+    'generation': '<i8',
+    'best_fitness': '<f8',
+    'mean_fitness': '<f8',
+    'stdev_fitness': '<f8',
+    'min_fitness': '<f8',
+    'species_count': '<i8',
+    'species_offsets': '<i8',
+    'evaluation_time': '<f8',
+    'elapsed_time': '<f8',
+}
+RAGGED_COLUMNS = {
+    'species_sizes': '<i4',
+}
+HEADER = 'columns.json'
+
+
+class StreamingStatisticsReporter(BaseReporter):
+    """
+    NEAT reporter that streams per-generation statistics to a columnar file.
+
+    Unlike neat.StatisticsReporter it does not keep genomes or per-species
+    histories in memory. Each generation appends one value to every column
+    file in `path`, so memory use stays flat however long the run is. The
+    last few rows are also kept in `tail` for live display.
+    """
+    def __init__(self, path, tail_size=50):
+        """
+        Creates (or truncates) the statistics directory and opens the column files.
+
+        Args:
+            path (str): The directory the column files are written to.
+            tail_size (int): How many of the latest rows to keep in memory.
+        """
+        self.path = path
+        self.tail = collections.deque(maxlen=tail_size)
+        self.generation = 0
+        self.generation_start = time.time()
+        self.run_start = time.time()
+        self.species_total = 0
+
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, HEADER), 'w') as file:
+            json.dump({'columns': COLUMNS, 'ragged_columns': RAGGED_COLUMNS}, file, indent=4)
+
+        self.files = {}
+        for name in list(COLUMNS) + list(RAGGED_COLUMNS):
+            self.files[name] = open(os.path.join(self.path, name + '.bin'), 'wb')
+
+    def start_generation(self, generation):
+        """
+        Remembers the generation number and starts its timer.
+
+        Args:
+            generation (int): The generation that is about to be evaluated.
+        """
+        self.generation = generation
+        self.generation_start = time.time()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Appends the statistics of the generation that was just evaluated.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The evaluated genomes by key.
+            species (neat.species.DefaultSpeciesSet): The current species set.
+            best_genome (neat.DefaultGenome): The best genome of the generation.
+        """
+        now = time.time()
+        fitness = np.fromiter((genome.fitness for genome in population.values()), dtype=np.float64)
+        sizes = np.fromiter((len(s.members) for s in species.species.values()), dtype=np.int32)
+        self.species_total += len(sizes)
+
+        row = {
+            'generation': self.generation,
+            'best_fitness': float(best_genome.fitness),
+            'mean_fitness': float(fitness.mean()),
+            'stdev_fitness': float(fitness.std()),
+            'min_fitness': float(fitness.min()),
+            'species_count': len(sizes),
+            'species_offsets': self.species_total,
+            'evaluation_time': now - self.generation_start,
+            'elapsed_time': now - self.run_start,
+        }
+
+        self.files['species_sizes'].write(sizes.astype(RAGGED_COLUMNS['species_sizes']).tobytes())
+        for name, dtype in COLUMNS.items():
+            self.files[name].write(np.array(row[name], dtype=dtype).tobytes())
+        # Ragged data is flushed before the offsets that point into it.
+        self.files['species_sizes'].flush()
+        for name in COLUMNS:
+            self.files[name].flush()
+
+        row['species_sizes'] = sizes.tolist()
+        self.tail.append(row)
+
+    def close(self):
+        """
+        Closes all column files.
+        """
+        for file in self.files.values():
+            file.close()
+
+    def __getstate__(self):
+        """
+        Leaves the open column files out when neat.Checkpointer pickles the
+        reporter along with the species set; a restored copy writes nothing.
+        """
+        state = self.__dict__.copy()
+        state['files'] = {}
+        return state
+
+
+class StatisticsReader:
+    """
+    Incremental, memory-mapped reader for a StreamingStatisticsReporter directory.
+
+    Can be used while training is still writing: `poll()` only returns the
+    rows that were completed since the previous call.
+    """
+    def __init__(self, path):
+        """
+        Reads the column description of a statistics directory.
+
+        Args:
+            path (str): The directory written by StreamingStatisticsReporter.
+        """
+        self.path = path
+        with open(os.path.join(self.path, HEADER)) as file:
+            header = json.load(file)
+        self.columns = header['columns']
+        self.ragged_columns = header['ragged_columns']
+        self.position = 0
+
+    def _map(self, name, dtype, count=None):
+        """
+        Memory-maps a column file.
+
+        Args:
+            name (str): The column name.
+            dtype (str): The numpy dtype of the column.
+            count (int): How many values to map, or None for the whole file.
+
+        Returns:
+            numpy.ndarray: A read-only view of the column.
+        """
+        file_path = os.path.join(self.path, name + '.bin')
+        available = os.path.getsize(file_path) // np.dtype(dtype).itemsize
+        count = available if count is None else min(count, available)
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode='r', shape=(count,))
+
+    def __len__(self):
+        """
+        Returns the number of complete rows on disk.
+
+        Returns:
+            int: The number of generations that can be read.
+        """
+        return min(
+            os.path.getsize(os.path.join(self.path, name + '.bin')) // np.dtype(dtype).itemsize
+            for name, dtype in self.columns.items()
+        )
+
+    def read(self, start=0, stop=None):
+        """
+        Returns the rows in [start, stop) as memory-mapped column arrays.
+
+        Args:
+            start (int): The first row to read.
+            stop (int): The row to stop at, or None for all complete rows.
+
+        Returns:
+            dict: Column name to numpy array.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = min(start, stop)
+        rows = {name: self._map(name, dtype, stop)[start:stop] for name, dtype in self.columns.items()}
+        return rows
+
+    def species_sizes(self, row):
+        """
+        Returns the species sizes of a single row.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            numpy.ndarray: The size of every species in that generation.
+        """
+        offsets = self._map('species_offsets', self.columns['species_offsets'], row + 1)
+        begin = int(offsets[row - 1]) if row > 0 else 0
+        end = int(offsets[row])
+        return self._map('species_sizes', self.ragged_columns['species_sizes'], end)[begin:end]
+
+    def poll(self):
+        """
+        Returns the rows written since the previous call.
+
+        Returns:
+            dict: Column name to numpy array, empty arrays if nothing is new.
+        """
+        rows = self.read(self.position)
+        self.position += len(rows['generation'])
+        return rows
+
+
+def plot(path, follow=False, interval=1.0):
+    """
+    Plots best and mean fitness from a statistics directory with matplotlib.
+
+    The directory is read incrementally, so with `follow=True` the plot keeps
+    updating while training is running until the window is closed.
+
+    Args:
+        path (str): The directory written by StreamingStatisticsReporter.
+        follow (bool): Keep polling for new generations.
+        interval (float): Seconds between polls when following.
+    """
+    import matplotlib.pyplot as plt
+
+    reader = StatisticsReader(path)
+    generations, best, mean = [], [], []
+    figure, axes = plt.subplots()
+    best_line, = axes.plot([], [], label='best fitness')
+    mean_line, = axes.plot([], [], label='mean fitness')
+    axes.set_xlabel('generation')
+    axes.legend()
+
+    while True:
+        rows = reader.poll()
+        generations.extend(rows['generation'].tolist())
+        best.extend(rows['best_fitness'].tolist())
+        mean.extend(rows['mean_fitness'].tolist())
+        best_line.set_data(generations, best)
+        mean_line.set_data(generations, mean)
+        axes.relim()
+        axes.autoscale_view()
+        if not follow:
+            plt.show()
+            return
+        plt.pause(interval)
+        if not plt.fignum_exists(figure.number):
+            return
@@ -0,0 +1,248 @@
+import multiprocessing
+import traceback
+from multiprocessing import shared_memory
+import numpy as np
+from AI.scripts.VecEnv import BUFFERS, OBSERVATION_SIZE, VecEnv
+
+'''
+Subprocess vectorized environment
+
+#? env = SubprocVecEnv(4096, workers=4); obs = env.reset(seeds=0); obs, reward, done, info = env.step(actions)
+# Same interface and results as AI.scripts.VecEnv, with the games split into
+# contiguous slices, one VecEnv per worker process.
+# Every array in VecEnv.BUFFERS and the actions live in one shared memory block each;
+# a worker's VecEnv writes straight into its slice and reads its actions from it,
+# so observations are never copied or pickled between worker and learner.
+#? A step only sends one byte to every worker and gets one byte back.
+# Write the actions into env.actions yourself and call env.step() to skip copying them too.
+#? The arrays stay mapped while anything references them: close() (or leaving a
+# with block) raises BufferError instead of unmapping memory still in use, copy
+# them with np.array() first if they are needed after the environment is closed.
+'''
+STEP = b's'
+RESET = b'r'
+CLOSE = b'c'
+DONE = b'd'
+ERROR = b'e'
+#? Shared arrays: the VecEnv results plus the actions the learner writes
+SHARED_BUFFERS = dict(BUFFERS, actions=((), np.bool_))
+
+
+def attach(blocks, num_envs):
+    """
+    Wraps shared memory blocks in numpy arrays.
+
+    np.frombuffer keeps the block's buffer exported for as long as the array
+    (or any view of it) lives, so closing the block while it is in use raises
+    BufferError instead of leaving the array pointing at unmapped memory.
+
+    Args:
+        blocks (dict): Buffer name to SharedMemory.
+        num_envs (int): The total number of games.
+
+    Returns:
+        dict: Buffer name to a numpy array backed by the block.
+    """
+    return {
+        name: np.frombuffer(
+            blocks[name].buf, dtype=dtype, count=num_envs * int(np.prod(shape, dtype=np.int64))
+        ).reshape((num_envs,) + shape)
+        for name, (shape, dtype) in SHARED_BUFFERS.items()
+    }
+
+
+def worker_main(connection, blocks, num_envs, start, stop):
+    """
+    Worker process: steps the games start:stop in place until told to close.
+
+    Args:
+        connection (multiprocessing.connection.Connection): Command pipe to the learner.
+        blocks (dict): Buffer name to SharedMemory.
+        num_envs (int): The total number of games.
+        start (int): First game of this worker.
+        stop (int): One past the last game of this worker.
+    """
+    arrays = attach(blocks, num_envs)
+    views = {name: array[start:stop] for name, array in arrays.items()}
+    actions = views.pop('actions')
+    env = VecEnv(stop - start, buffers=views)
+    try:
+        while True:
+            command = connection.recv_bytes()
+            if command == STEP:
+                env.step(actions)
+            elif command == RESET:
+                env.reset(connection.recv())
+            elif command == CLOSE:
+                break
+            connection.send_bytes(DONE)
+    except Exception:
+        connection.send_bytes(ERROR + traceback.format_exc().encode())
+    finally:
+        # drop the views before the blocks can be closed
+        del env, views, actions, arrays
+        connection.close()
+
+
+class SubprocVecEnv:
+    """
+    VecEnv split over worker processes that share their arrays with the learner.
+
+    The learner and the workers map the same shared memory blocks, so the
+    arrays returned by step are the ones the workers wrote into.
+    """
+    def __init__(self, num_envs, workers=None):
+        """
+        Allocates the shared arrays and starts the workers.
+
+        Args:
+            num_envs (int): The total number of games.
+            workers (int): The number of worker processes, defaults to the CPU count.
+        """
+        workers = min(workers or multiprocessing.cpu_count(), num_envs)
+        self.num_envs = num_envs
+        self.observation_size = OBSERVATION_SIZE
+
+        self.blocks = {
+            name: shared_memory.SharedMemory(
+                create=True, size=max(num_envs * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize, 1))
+            for name, (shape, dtype) in SHARED_BUFFERS.items()
+        }
+        arrays = attach(self.blocks, num_envs)
+        for array in arrays.values():
+            array.fill(0)
+        self.observations = arrays['observations']
+        self.rewards = arrays['rewards']
+        self.dones = arrays['dones']
+        self.actions = arrays['actions']
+        self.info = {
+            'final_observation': arrays['final_observations'],
+            'episode_score': arrays['episode_score'],
+            'episode_length': arrays['episode_length'],
+        }
+
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int).tolist()
+        self.slices = list(zip(bounds[:-1], bounds[1:]))
+        self.connections = []
+        self.processes = []
+        for start, stop in self.slices:
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=worker_main,
+                args=(worker_connection, self.blocks, num_envs, start, stop),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def _wait(self):
+        """
+        Waits until every worker has finished its command.
+
+        Every reply is read before raising, so no reply is left in a pipe to
+        be mistaken for the answer to the next command.
+
+        Raises:
+            RuntimeError: If a worker failed, with the traceback of the first one.
+        """
+        replies = [connection.recv_bytes() for connection in self.connections]
+        for reply in replies:
+            if reply != DONE:
+                raise RuntimeError('VecEnv worker failed:\n' + reply[len(ERROR):].decode())
+
+    def reset(self, seeds=None):
+        """
+        Starts every game from the beginning.
+
+        Args:
+            seeds (int, list or None): As for VecEnv.reset; a base seed numbers the games across all workers.
+
+        Returns:
+            np.ndarray: The shared (num_envs, 5) start observations.
+        """
+        if isinstance(seeds, int):
+            seeds = [seeds + i for i in range(self.num_envs)]
+        elif seeds is not None and len(seeds) != self.num_envs:
+            raise ValueError(f'Expected {self.num_envs} seeds, got {len(seeds)}')
+        for connection, (start, stop) in zip(self.connections, self.slices):
+            connection.send_bytes(RESET)
+            connection.send(None if seeds is None else list(seeds[start:stop]))
+        self._wait()
+        return self.observations
+
+    def step(self, actions=None):
+        """
+        Steps every game in the workers.
+
+        Args:
+            actions (array-like): One bool or 0/1 per game, or None if
+                self.actions was already written.
+
+        Returns:
+            tuple: (observations, rewards, dones, info), the shared arrays.
+        """
+        if actions is not None:
+            np.copyto(self.actions, actions, casting='unsafe')
+        for connection in self.connections:
+            connection.send_bytes(STEP)
+        self._wait()
+        return self.observations, self.rewards, self.dones, self.info
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory.
+
+        The names of the blocks are always removed. A block whose arrays are
+        still referenced outside the environment stays mapped and is retried
+        by the next close().
+
+        Raises:
+            BufferError: If returned arrays are still referenced, copy them with np.array() before closing.
+        """
+        if self.processes:
+            for connection in self.connections:
+                try:
+                    connection.send_bytes(CLOSE)
+                except OSError:
+                    pass
+            for process in self.processes:
+                process.join()
+            for connection in self.connections:
+                connection.close()
+            self.processes = []
+            self.observations = self.rewards = self.dones = self.actions = self.info = None
+            for block in self.blocks.values():
+                block.unlink()
+
+        in_use = {}
+        for name, block in self.blocks.items():
+            try:
+                block.close()
+            except BufferError:
+                in_use[name] = block
+        self.blocks = in_use
+        if in_use:
+            raise BufferError(
+                'SubprocVecEnv closed while its ' + ', '.join(in_use) + ' arrays are still referenced; '
+                'copy them with np.array() before closing, the memory is kept until they are released')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            self.close()
+        except BufferError:
+            # do not hide the exception that is leaving the with block
+            if exc_type is None:
+                raise
+
+    def __del__(self):
+        # may run on a half built environment or after close() already raised
+        if hasattr(self, 'processes'):
+            try:
+                self.close()
+            except BufferError:
+                pass
@@ -0,0 +1,333 @@
+import argparse
+import ast
+import concurrent.futures
+import configparser
+import csv
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+import neat
+from neat.reporting import BaseReporter
+import config.config as config
+
+'''
+Search space
+
+#? key -> list of values        grid and random search pick from the list
+#? key -> (low, high) tuple     random search only, uniform (int if both ints)
+# Keys are NEAT config keys from AI/config/config.txt, e.g. pop_size,
+# conn_add_prob, weight_mutate_rate or compatibility_threshold
+'''
+
+
+class TrialPruned(Exception):
+    """
+    Raised inside a trial to stop it once it falls behind the other trials.
+    """
+    pass
+
+
+def expand_grid(space):
+    """
+    Expands a search space into every combination of its values.
+
+    Args:
+        space (dict): Config key to list of values.
+
+    Returns:
+        list: One dict of overrides per combination.
+    """
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def sample_random(space, trials, seed=0):
+    """
+    Draws random combinations from a search space.
+
+    Args:
+        space (dict): Config key to list of values or (low, high) range.
+        trials (int): The number of combinations to draw.
+        seed (int): Seed of the sampler.
+
+    Returns:
+        list: One dict of overrides per trial.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(trials):
+        overrides = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    overrides[key] = rng.randint(low, high)
+                else:
+                    overrides[key] = rng.uniform(low, high)
+            else:
+                overrides[key] = rng.choice(values)
+        samples.append(overrides)
+    return samples
+
+
+def write_config(base_path, overrides, path):
+    """
+    Writes a copy of a NEAT config file with some keys replaced.
+
+    Args:
+        base_path (str): The NEAT config file to start from.
+        overrides (dict): Config key to new value; the section is looked up.
+        path (str): Where to write the new config file.
+
+    Raises:
+        KeyError: If a key does not exist in any section of the base file.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(base_path)
+    for key, value in overrides.items():
+        sections = [section for section in parser.sections() if parser.has_option(section, key)]
+        if not sections:
+            raise KeyError(f'{key} is not a key of {base_path}')
+        for section in sections:
+            parser.set(section, key, str(value))
+    with open(path, 'w') as file:
+        parser.write(file)
+
+
+class PruningReporter(BaseReporter):
+    """
+    NEAT reporter that implements the median stopping rule across trials.
+
+    Every trial publishes its best fitness per generation into a dict shared
+    by all trials. After `warmup` generations a trial whose best fitness is
+    below the median of the other trials at the same generation is stopped.
+    """
+    def __init__(self, trial, progress, lock, warmup, min_trials=3):
+        """
+        Initializes the reporter.
+
+        Args:
+            trial (int): The index of this trial.
+            progress (dict): Shared dict, generation -> {trial: best fitness}.
+            lock (multiprocessing.Lock): Lock guarding `progress`.
+            warmup (int): Generations every trial is allowed to run.
+            min_trials (int): Other trials needed before comparing.
+        """
+        self.trial = trial
+        self.progress = progress
+        self.lock = lock
+        self.warmup = warmup
+        self.min_trials = min_trials
+        self.generation = 0
+        self.evaluated = 0
+
+    def start_generation(self, generation):
+        """
+        Remembers the generation that is about to be evaluated.
+
+        Args:
+            generation (int): The generation number.
+        """
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        """
+        Publishes the best fitness and stops the trial if it is behind.
+
+        Args:
+            config (neat.config.Config): The NEAT configuration.
+            population (dict): The evaluated genomes by key.
+            species (neat.species.DefaultSpeciesSet): The current species set.
+            best_genome (neat.DefaultGenome): The best genome of the generation.
+
+        Raises:
+            TrialPruned: If the trial is below the median of the others.
+        """
+        self.evaluated += 1
+        with self.lock:
+            scores = dict(self.progress.get(self.generation, {}))
+            scores[self.trial] = best_genome.fitness
+            self.progress[self.generation] = scores
+        others = [fitness for trial, fitness in scores.items() if trial != self.trial]
+        if self.generation >= self.warmup and len(others) >= self.min_trials:
+            if best_genome.fitness < statistics.median(others):
+                raise TrialPruned()
+
+
+def run_trial(trial, overrides, base_path, seed, generations, max_steps, progress, lock, warmup):
+    """
+    Trains one configuration headless. Runs in a worker process.
+
+    Args:
+        trial (int): The index of the trial.
+        overrides (dict): The NEAT config keys to replace.
+        base_path (str): The NEAT config file to start from.
+        seed (int): Seed of the course and of NEAT's random choices.
+        generations (int): The maximum number of generations.
+        max_steps (int): Simulation steps after which a generation ends.
+        progress (dict): Shared per-generation progress for pruning.
+        lock (multiprocessing.Lock): Lock guarding `progress`.
+        warmup (int): Generations before a trial can be pruned.
+
+    Returns:
+        dict: The result row of the trial.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    config.HEADLESS = True
+    config.PRINT_DATA = False
+    config.DASHBOARD = False
+    config.COURSE_SEED = seed
+    config.MAX_GENERATION_STEPS = max_steps
+    config.SIM_STEPS_PER_RENDER = max(config.SIM_STEPS_PER_RENDER, 64)
+    # one kernel thread per worker, the pool already uses every core
+    os.environ['NUMBA_NUM_THREADS'] = '1'
+    # main pulls in pygame and the game objects, only workers need it
+    import main
+    from AI.scripts.Accelerator import use_one_thread
+    use_one_thread()
+
+    random.seed(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, 'config.txt')
+        write_config(base_path, overrides, config_path)
+        config_file = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+
+    population = neat.Population(config_file)
+    reporter = PruningReporter(trial, progress, lock, warmup)
+    population.add_reporter(reporter)
+
+    status = 'finished'
+    start = time.time()
+    try:
+        population.run(main.main_ai, generations)
+    except TrialPruned:
+        status = 'pruned'
+    except neat.CompleteExtinctionException:
+        status = 'extinct'
+    wall_time = time.time() - start
+
+    best = population.best_genome.fitness if population.best_genome else None
+    solved = best is not None and best >= config_file.fitness_threshold
+    return {
+        'trial': trial,
+        **overrides,
+        'seed': seed,
+        'status': 'solved' if solved else status,
+        'generations': reporter.evaluated,
+        'generations_to_threshold': reporter.evaluated if solved else '',
+        'best_fitness': best,
+        'wall_time': round(wall_time, 3),
+    }
+
+
+def sweep(base_path, trials, output, workers=None, seed=0, generations=50, max_steps=20000, warmup=5):
+    """
+    Runs every trial in a process pool and writes a results table.
+
+    Args:
+        base_path (str): The NEAT config file to start from.
+        trials (list): One dict of config overrides per trial.
+        output (str): Path of the CSV results table.
+        workers (int): Worker processes, defaults to the number of CPUs.
+        seed (int): Course seed shared by every trial so they are comparable.
+        generations (int): The maximum number of generations per trial.
+        max_steps (int): Simulation steps after which a generation ends.
+        warmup (int): Generations before a trial can be pruned.
+
+    Returns:
+        list: The result rows, in trial order.
+    """
+    manager = multiprocessing.Manager()
+    progress = manager.dict()
+    lock = manager.Lock()
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_trial, trial, overrides, base_path, seed, generations, max_steps, progress, lock, warmup)
+            for trial, overrides in enumerate(trials)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f'[Sweep: trial {result["trial"]} {result["status"]} after {result["generations"]} generations, '
+                  f'best fitness {result["best_fitness"]}, {result["wall_time"]} s]')
+    manager.shutdown()
+
+    results.sort(key=lambda result: result['trial'])
+    fields = []
+    for result in results:
+        fields.extend(key for key in result if key not in fields)
+    with open(output, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+def parse_space(arguments):
+    """
+    Parses `key=v1,v2,...` and `key=low:high` arguments into a search space.
+
+    Args:
+        arguments (list): The command line arguments.
+
+    Returns:
+        dict: The search space.
+    """
+    def parse(value):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value
+
+    space = {}
+    for argument in arguments:
+        key, values = argument.split('=', 1)
+        if ':' in values:
+            low, high = values.split(':', 1)
+            space[key] = (parse(low), parse(high))
+        else:
+            space[key] = [parse(value) for value in values.split(',')]
+    return space
+
+
+def main(argv=None):
+    """
+    Command line entry point, e.g.
+
+        python -m AI.scripts.Sweep pop_size=50,100 conn_add_prob=0.3,0.5
+        python -m AI.scripts.Sweep --random 20 weight_mutate_rate=0.1:0.9
+
+    Args:
+        argv (list): The arguments, defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description='Parallel hyperparameter sweep over the NEAT config.')
+    parser.add_argument('space', nargs='+', help='key=v1,v2,... for a list, key=low:high for a range')
+    parser.add_argument('--config', default='AI/config/config.txt', help='base NEAT config file')
+    parser.add_argument('--random', type=int, default=0, metavar='TRIALS', help='random search instead of grid')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--max-steps', type=int, default=20000)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--output', default='sweep.csv')
+    args = parser.parse_args(argv)
+
+    space = parse_space(args.space)
+    if args.random:
+        trials = sample_random(space, args.random, args.seed)
+    else:
+        if any(isinstance(values, tuple) for values in space.values()):
+            parser.error('ranges (low:high) need --random')
+        trials = expand_grid(space)
+    sweep(args.config, trials, args.output, args.workers, args.seed, args.generations, args.max_steps, args.warmup)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+import os
+import random
+import numpy as np
+import pygame
+import config.config as config
+import config.constants as constants
+import scripts.load as load
+from scripts.Agent import Agent
+from scripts.Pipe import Pipe
+from scripts.SimClock import SimClock
+
+'''
+Vectorized environment
+
+#? env = VecEnv(1024); obs = env.reset(seeds=0); obs, reward, done, info = env.step(actions)
+# obs -> (num_envs, 5) float64 in AI.scripts.Head.get_data order:
+#        y, distance_to_pipe, distance_to_pipe_only_x, gap_y_center, rel_y_to_gap
+# actions -> (num_envs,) bools or 0/1, True jumps (if the jump cooldown allows it)
+# reward -> +0.1 per survived step, +5 per point, -1 for crashing (like the 'default' fitness)
+# done -> the bird crashed; that game is reset right away and obs holds its new start,
+#         info['final_observation'], info['episode_score'] and info['episode_length'] describe the finished one
+# Every game has its own pipes, clock and course seed. The rules are those of
+# Player/PipeManager as arrays in the order of a MainAI step, checked by
+# python cli.py golden --engines vecenv.
+# The config.PIPE_PAIRS pairs of a game are a ring like in PipeManager; pipe_x and
+# pipe_y hold the next pair of every game, the one observed and collided with.
+#? The returned arrays are reused by the next step, copy them to keep them.
+'''
+OBSERVATION_SIZE = 5
+#? Pipe.SPEED per pipe update; a MainAI step updates the pipes twice, with the
+#  other objects and at the start of ai_update (see PIPE_UPDATES in scripts/Golden.py)
+PIPE_SPEED = Pipe.SPEED
+PIPE_UPDATES = 2
+#? PipeManager.SNAP_POINTS, which only exists on the instance
+SNAP_POINTS = [-48, -32, -16, 0]
+SURVIVAL_REWARD = 0.1
+SCORE_REWARD = 5.0
+COLLISION_REWARD = -1.0
+#? Result arrays of a step: name -> (shape of one game, dtype)
+BUFFERS = {
+    'observations': ((OBSERVATION_SIZE,), np.float64),
+    'rewards': ((), np.float64),
+    'dones': ((), np.bool_),
+    'final_observations': ((OBSERVATION_SIZE,), np.float64),
+    'episode_score': ((), np.int64),
+    'episode_length': ((), np.int64),
+}
+
+
+def sprite_size(name):
+    """
+    Reads the size of the first sprite of an asset folder without a display.
+
+    Args:
+        name (str): The folder in assets/images, e.g. 'player'.
+
+    Returns:
+        tuple: (width, height) of the sprite.
+    """
+    first = sorted(os.listdir(load.BASE_IMG_PATH + name))[0]
+    return pygame.image.load(load.BASE_IMG_PATH + name + '/' + first).get_size()
+
+
+class VecEnv:
+    """
+    Batch of independent Flappy Bird games stepped together with numpy.
+
+    Needs neither a display nor neat. All state lives in one array per
+    variable with a row per game, so a step costs a few dozen numpy
+    operations however many games run; only games whose pipe leaves the
+    screen draw a new height from their own random generator.
+    """
+    def __init__(self, num_envs, buffers=None):
+        """
+        Allocates the state of every game; call reset before stepping.
+
+        Args:
+            num_envs (int): The number of parallel games.
+            buffers (dict): Arrays to write the results into instead of new ones,
+                named like BUFFERS, e.g. views of shared memory.
+        """
+        self.num_envs = num_envs
+        self.observation_size = OBSERVATION_SIZE
+
+        bird_width, bird_height = sprite_size('player')
+        pipe_width, pipe_height = sprite_size('pipe')
+        self.BIRD_X = config.WIDTH // 6 - bird_width // 2
+        self.BIRD_WIDTH = bird_width
+        self.BIRD_HEIGHT = bird_height
+        self.HALF_HEIGHT = bird_height // 2
+        self.START_Y = config.HEIGHT // 2 - bird_height // 2
+        self.PIPE_WIDTH = pipe_width
+        self.PIPE_HEIGHT = pipe_height
+        self.PAIRS = config.PIPE_PAIRS
+        self.SPACING = config.PIPE_SPACING
+        self.CAN_JUMP_TICKS = SimClock.to_ticks(Agent.CAN_JUMP_COOLDOWN)
+        self.COLLISION_TICKS = SimClock.to_ticks(Agent.COLLISION_COOLDOWN)
+        if self.PAIRS > 1 and self.SPACING < pipe_width + bird_width:
+            raise ValueError(f'PIPE_SPACING {self.SPACING} is less than a pipe and a bird wide')
+
+        n = num_envs
+        self.games = np.arange(n)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.pipe_xs = np.zeros((n, self.PAIRS), dtype=np.int64)
+        self.pipe_ys = np.zeros((n, self.PAIRS), dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.next = np.zeros(n, dtype=np.int64)
+        self.pipe_x = np.zeros(n, dtype=np.int64)
+        self.pipe_y = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.float64)
+        self.velocity = np.zeros(n, dtype=np.float64)
+        self.can_jump = np.zeros(n, dtype=np.bool_)
+        self.jump_timer = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.hit = np.zeros(n, dtype=np.bool_)
+        self.collision_timer = np.zeros(n, dtype=np.int64)
+        self.score_timer = np.zeros(n, dtype=np.int64)
+        self.can_add_score = np.zeros(n, dtype=np.bool_)
+        self.collision = np.zeros(n, dtype=np.bool_)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.randoms = [random.Random() for _ in range(n)]
+
+        buffers = dict(buffers or {})
+        for name, (shape, dtype) in BUFFERS.items():
+            if name not in buffers:
+                buffers[name] = np.zeros((n,) + shape, dtype=dtype)
+        self.observations = buffers['observations']
+        self.rewards = buffers['rewards']
+        self.dones = buffers['dones']
+        self.final_observations = buffers['final_observations']
+        self.episode_score = buffers['episode_score']
+        self.episode_length = buffers['episode_length']
+
+    def reset(self, seeds=None):
+        """
+        Starts every game from the beginning.
+
+        Args:
+            seeds (int, list or None): One course seed per game, a base seed
+                (game i gets seed + i) or None for random courses. The pipes of
+                a game replay PipeManager.seed(seed) exactly.
+
+        Returns:
+            np.ndarray: The (num_envs, 5) start observations.
+        """
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        elif isinstance(seeds, int):
+            seeds = [seeds + i for i in range(self.num_envs)]
+        elif len(seeds) != self.num_envs:
+            raise ValueError(f'Expected {self.num_envs} seeds, got {len(seeds)}')
+        self.randoms = [random.Random(seed) for seed in seeds]
+        self.reset_games(np.arange(self.num_envs))
+        self.observe()
+        return self.observations
+
+    def reset_games(self, games):
+        """
+        Puts some games back to their start state, like Player.reset and PipeManager.reset.
+
+        Their course generators continue, so a game gets a new course on every reset.
+
+        Args:
+            games (np.ndarray): The indices of the games to reset.
+        """
+        self.ticks[games] = 0
+        self.pipe_xs[games] = config.WIDTH + np.arange(self.PAIRS) * self.SPACING
+        self.pipe_ys[games] = np.array([
+            [self.randoms[game].choice(SNAP_POINTS) for _ in range(self.PAIRS)] for game in games.tolist()
+        ], dtype=np.int64).reshape(len(games), self.PAIRS)
+        self.head[games] = 0
+        self.next[games] = 0
+        self.pipe_x[games] = self.pipe_xs[games, 0]
+        self.pipe_y[games] = self.pipe_ys[games, 0]
+        self.y[games] = self.START_Y
+        self.velocity[games] = 0.0
+        self.can_jump[games] = True
+        self.jump_timer[games] = 0
+        self.score[games] = 0
+        self.hit[games] = False
+        self.collision_timer[games] = 0
+        self.score_timer[games] = 0
+        self.can_add_score[games] = True
+        self.length[games] = 0
+
+    def observe(self, games=slice(None)):
+        """
+        Computes the sensors from the current bird and pipe, like Agent.update.
+
+        Args:
+            games (slice or np.ndarray): The games to observe, all by default.
+        """
+        center = self.y[games] + self.HALF_HEIGHT
+        gap_y_center = self.pipe_y[games] + self.PIPE_HEIGHT + constants.GAP // 2
+        distance_x = (self.pipe_x[games] + self.PIPE_WIDTH // 2) - config.WIDTH // 6
+        observations = self.observations
+        observations[games, 0] = center
+        observations[games, 1] = np.sqrt(distance_x**2 + (gap_y_center - center)**2)
+        observations[games, 2] = distance_x
+        observations[games, 3] = gap_y_center
+        observations[games, 4] = center - gap_y_center
+
+    def apply_actions(self, actions):
+        """
+        Makes the birds jump whose action is set and whose cooldown allows it, like Agent.jump.
+
+        Args:
+            actions (array-like): One bool or 0/1 per game.
+        """
+        jumps = np.asarray(actions, dtype=np.bool_) & self.can_jump
+        self.velocity[jumps] -= Agent.FORCE
+        self.can_jump[jumps] = False
+
+    def advance(self):
+        """
+        Runs one frame of every game without resetting crashed ones.
+
+        Moves the clocks and pipes, computes the sensors of the frame and
+        applies the bird physics, pipe collisions, scoring and bounds check.
+
+        Returns:
+            np.ndarray: The collision flag of every game in this frame.
+        """
+        self.ticks += 1
+        ticks = self.ticks
+
+        pipe_xs, head, following = self.pipe_xs, self.head, self.next
+        for _ in range(PIPE_UPDATES):
+            pipe_xs -= PIPE_SPEED
+            for game in np.flatnonzero(pipe_xs[self.games, head] < -self.PIPE_WIDTH).tolist():
+                pair = head[game]
+                if self.PAIRS > 1:
+                    pipe_xs[game, pair] = max(config.WIDTH, pipe_xs[game, pair - 1] + self.SPACING)
+                else:
+                    pipe_xs[game, pair] = config.WIDTH
+                self.pipe_ys[game, pair] = self.randoms[game].choice(SNAP_POINTS)
+                head[game] = (pair + 1) % self.PAIRS
+            if self.PAIRS > 1:
+                passed = pipe_xs[self.games, following] + self.PIPE_WIDTH <= self.BIRD_X
+                following[passed] = (following[passed] + 1) % self.PAIRS
+        self.pipe_x[:] = pipe_xs[self.games, following]
+        self.pipe_y[:] = self.pipe_ys[self.games, following]
+
+        # the sensors are taken before the bird moves, as Agent.update does
+        self.observe()
+
+        expired = self.hit & (ticks - self.collision_timer > self.COLLISION_TICKS)
+        self.hit[expired] = False
+        self.collision_timer[expired] = ticks[expired]
+
+        ready = ticks - self.score_timer > self.COLLISION_TICKS
+        self.score_timer[ready] = ticks[ready]
+        self.can_add_score |= ready
+
+        velocity = self.velocity
+        velocity += Agent.GRAVITY
+        np.clip(velocity, -Agent.MAX_VELOCITY, Agent.MAX_VELOCITY, out=velocity)
+        self.y += velocity
+
+        # pygame.Rect rounds half away from zero when given a float
+        top = np.where(self.y >= 0, np.floor(self.y + 0.5), -np.floor(0.5 - self.y))
+        pipe_x, pipe_y = self.pipe_x, self.pipe_y
+        overlaps_x = (self.BIRD_X < pipe_x + self.PIPE_WIDTH) & (pipe_x < self.BIRD_X + self.BIRD_WIDTH)
+        bottom_y = pipe_y + constants.GAP
+        overlaps_top = (top < pipe_y + self.PIPE_HEIGHT) & (pipe_y < top + self.BIRD_HEIGHT)
+        overlaps_bottom = (top < bottom_y + self.PIPE_HEIGHT) & (bottom_y < top + self.BIRD_HEIGHT)
+        collision = ~self.hit & overlaps_x & (overlaps_top | overlaps_bottom)
+        self.hit |= collision
+
+        scored = self.can_add_score & (pipe_x < self.BIRD_X) & (self.BIRD_X < pipe_x + self.PIPE_WIDTH)
+        self.score += scored
+        self.score_timer[scored] = ticks[scored]
+        self.can_add_score &= ~scored
+
+        collision |= (self.y > config.HEIGHT - self.HALF_HEIGHT) | (self.y < 0 - self.HALF_HEIGHT)
+
+        can_jump = ticks - self.jump_timer > self.CAN_JUMP_TICKS
+        self.can_jump |= can_jump
+        self.jump_timer[can_jump] = ticks[can_jump]
+
+        self.length += 1
+        self.collision = collision
+        return collision
+
+    def step(self, actions):
+        """
+        Applies one action per game, advances every game by one frame and resets the crashed ones.
+
+        Args:
+            actions (array-like): One bool or 0/1 per game.
+
+        Returns:
+            tuple: (observations, rewards, dones, info) as described at the top of the module.
+        """
+        previous_score = self.score.copy()
+        self.apply_actions(actions)
+        dones = self.advance()
+
+        rewards = self.rewards
+        np.multiply(self.score - previous_score, SCORE_REWARD, out=rewards)
+        rewards += np.where(dones, COLLISION_REWARD, SURVIVAL_REWARD)
+        self.dones[:] = dones
+
+        games = np.flatnonzero(dones)
+        if len(games):
+            self.final_observations[games] = self.observations[games]
+            self.episode_score[games] = self.score[games]
+            self.episode_length[games] = self.length[games]
+            self.reset_games(games)
+            self.observe(games)
+
+        info = {
+            'final_observation': self.final_observations,
+            'episode_score': self.episode_score,
+            'episode_length': self.episode_length,
+        }
+        return self.observations, rewards, self.dones, info
@@ -0,0 +1,261 @@
+import argparse
+import os
+import config.config as config
+
+'''
+Command line entry point
+
+#? python cli.py train [--headless] [--islands N] [--generations N] [--seed N] [--memory-report]
+#? python cli.py watch [--policy AI/champion.npz]
+#? python cli.py play
+#? python cli.py replay AI/checkpoints/neat-checkpoint-9
+#? python cli.py bench [--steps N] [--repeat N]
+#? python cli.py golden [--seeds 0 1 2] [--frames N] [--engines agent accelerator] [--policy AI/champion.npz]
+#? python cli.py plot [--path AI/statistics] [--follow]
+# Every subcommand accepts --width, --height and --fps. The settings are
+# written into config.config before main is imported, since main picks its
+# imports from them, and every subcommand imports only what it needs.
+'''
+
+LOCAL_DIR = os.path.dirname(os.path.abspath(__file__))
+NEAT_CONFIG = os.path.join(LOCAL_DIR, 'AI/config/config.txt')
+
+
+def train(args):
+    """
+    Trains a NEAT population, optionally headless or as islands.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    import random
+    config.AI = True
+    config.PILOT = False
+    config.HEADLESS = args.headless
+    config.PRINT_DATA = args.print_data
+    config.DASHBOARD = args.dashboard
+    config.ISLANDS = args.islands
+    config.MAX_GENERATION_STEPS = args.max_steps
+    config.CHECKPOINT_INTERVAL = args.checkpoint_every
+    config.MEMORY_REPORT = args.memory_report
+    if args.steps_per_render:
+        config.SIM_STEPS_PER_RENDER = args.steps_per_render
+    if args.seed is not None:
+        config.COURSE_SEED = args.seed
+        random.seed(args.seed)
+    import main
+
+    main.run(args.config, args.generations)
+
+
+def watch(args):
+    """
+    Lets the exported champion policy fly the bird.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    config.AI = False
+    config.PILOT = True
+    config.POLICY_PATH = args.policy
+    config.PRINT_DATA = False
+    import main
+
+    main.Main().game_loop()
+
+
+def play(args):
+    """
+    Starts the game for a human player.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    config.AI = False
+    config.PILOT = False
+    config.PRINT_DATA = False
+    import main
+
+    main.Main().game_loop()
+
+
+def replay(args):
+    """
+    Restores a NEAT checkpoint and renders its next generations.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    config.AI = True
+    config.PILOT = False
+    config.HEADLESS = False
+    config.PRINT_DATA = False
+    config.DASHBOARD = False
+    if args.seed is not None:
+        config.COURSE_SEED = args.seed
+    import neat
+    import main
+
+    population = neat.Checkpointer.restore_checkpoint(args.checkpoint)
+    population.add_reporter(neat.StdOutReporter(True))
+    population.run(main.main_ai, args.generations)
+
+
+def bench(args):
+    """
+    Measures the headless simulation speed of one generation.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    import random
+    import time
+    config.AI = True
+    config.PILOT = False
+    config.HEADLESS = True
+    config.PRINT_DATA = False
+    config.DASHBOARD = False
+    config.COURSE_SEED = args.seed
+    config.MAX_GENERATION_STEPS = args.steps
+    config.SIM_STEPS_PER_RENDER = max(config.SIM_STEPS_PER_RENDER, 64)
+    config.ACCELERATOR = not args.no_accelerator
+    import neat
+    import main
+
+    random.seed(args.seed)
+    config_file = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                     neat.DefaultSpeciesSet, neat.DefaultStagnation, args.config)
+    genomes = list(neat.Population(config_file).population.items())
+    for repeat in range(args.repeat):
+        for _, genome in genomes:
+            genome.fitness = None
+        game = main.MainAI(genomes, config_file)
+        start = time.perf_counter()
+        game.game_loop()
+        elapsed = time.perf_counter() - start
+        print(f'[Bench {repeat}: {len(genomes)} birds, {game.step_count} steps in {elapsed:.3f} s, '
+              f'{game.step_count / elapsed:.0f} steps/s, accelerator {"on" if game.accelerator else "off"}]')
+
+
+def golden(args):
+    """
+    Compares the simulation engines against golden Player trajectories.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    config.PRINT_DATA = False
+    from scripts.Golden import ENGINES, run_harness
+
+    controller = None
+    if args.policy:
+        from AI.scripts.Policy import Policy
+        controller = Policy.load(args.policy).decide
+    results = run_harness(args.seeds, args.frames, args.engines or list(ENGINES), controller,
+                          not args.until_collision)
+    diverged = sum(result is not None for result in results.values())
+    print(f'[Golden: {len(results) - diverged} of {len(results)} runs match]')
+    if diverged:
+        raise SystemExit(1)
+
+
+def plot(args):
+    """
+    Plots best and mean fitness from the streamed statistics (needs matplotlib).
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    from AI.scripts.StreamingStatistics import plot as plot_statistics
+    try:
+        plot_statistics(args.path, args.follow, args.interval)
+    except ImportError as error:
+        raise SystemExit(f'[Plot: {error}, install it with pip install matplotlib]')
+
+
+def build_parser():
+    """
+    Builds the argument parser with every subcommand.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description='Flappy Bird with NEAT.')
+    parser.add_argument('--width', type=int, default=None, help='override config.WIDTH')
+    parser.add_argument('--height', type=int, default=None, help='override config.HEIGHT')
+    parser.add_argument('--fps', type=int, default=None, help='override config.FPS')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_train = subparsers.add_parser('train', help='train a NEAT population')
+    parser_train.add_argument('--config', default=NEAT_CONFIG, help='NEAT config file')
+    parser_train.add_argument('--headless', action='store_true', help='no window and no frame limit')
+    parser_train.add_argument('--islands', type=int, default=config.ISLANDS, help='parallel island populations')
+    parser_train.add_argument('--generations', type=int, default=50)
+    parser_train.add_argument('--seed', type=int, default=None, help='course and NEAT seed')
+    parser_train.add_argument('--max-steps', type=int, default=config.MAX_GENERATION_STEPS,
+                              help='simulation steps after which a generation ends (0 -> no limit)')
+    parser_train.add_argument('--steps-per-render', type=int, default=None)
+    parser_train.add_argument('--checkpoint-every', type=int, default=config.CHECKPOINT_INTERVAL, metavar='N',
+                              help='save a NEAT checkpoint every N generations')
+    parser_train.add_argument('--dashboard', action='store_true', help='serve the live dashboard')
+    parser_train.add_argument('--print-data', action='store_true', help='print the data of every bird')
+    parser_train.add_argument('--memory-report', action='store_true',
+                              help=f'trace memory per generation into {config.MEMORY_REPORT_PATH} (slow)')
+    parser_train.set_defaults(handler=train)
+
+    parser_watch = subparsers.add_parser('watch', help='watch the exported champion policy play')
+    parser_watch.add_argument('--policy', default=config.POLICY_PATH, help='policy file written by train')
+    parser_watch.set_defaults(handler=watch)
+
+    parser_play = subparsers.add_parser('play', help='play the game yourself')
+    parser_play.set_defaults(handler=play)
+
+    parser_replay = subparsers.add_parser('replay', help='render generations of a NEAT checkpoint')
+    parser_replay.add_argument('checkpoint', help='checkpoint file written by train --checkpoint-every')
+    parser_replay.add_argument('--generations', type=int, default=1)
+    parser_replay.add_argument('--seed', type=int, default=None, help='course seed')
+    parser_replay.set_defaults(handler=replay)
+
+    parser_bench = subparsers.add_parser('bench', help='measure the headless simulation speed')
+    parser_bench.add_argument('--config', default=NEAT_CONFIG, help='NEAT config file')
+    parser_bench.add_argument('--steps', type=int, default=5000, help='simulation steps per run')
+    parser_bench.add_argument('--repeat', type=int, default=3)
+    parser_bench.add_argument('--seed', type=int, default=0)
+    parser_bench.add_argument('--no-accelerator', action='store_true', help='use the Agent objects')
+    parser_bench.set_defaults(handler=bench)
+
+    parser_golden = subparsers.add_parser('golden', help='check the engines against golden trajectories')
+    parser_golden.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2], help='course seeds')
+    parser_golden.add_argument('--frames', type=int, default=3000, help='frames per trajectory')
+    parser_golden.add_argument('--engines', nargs='+', default=None, help='engines to check (default all)')
+    parser_golden.add_argument('--policy', default=None, help='fly with a policy file instead of random jumps')
+    parser_golden.add_argument('--until-collision', action='store_true', help='end trajectories at the first collision')
+    parser_golden.set_defaults(handler=golden)
+
+    parser_plot = subparsers.add_parser('plot', help='plot best and mean fitness of a training run (needs matplotlib)')
+    parser_plot.add_argument('--path', default=config.STATISTICS_PATH, help='statistics directory written by train')
+    parser_plot.add_argument('--follow', action='store_true', help='keep updating while training runs')
+    parser_plot.add_argument('--interval', type=float, default=1.0, help='seconds between updates with --follow')
+    parser_plot.set_defaults(handler=plot)
+    return parser
+
+
+def main(argv=None):
+    """
+    Parses the arguments, applies the overrides and runs the subcommand.
+
+    Args:
+        argv (list): The arguments, defaults to sys.argv.
+    """
+    args = build_parser().parse_args(argv)
+    if args.width is not None:
+        config.WIDTH = args.width
+    if args.height is not None:
+        config.HEIGHT = args.height
+    if args.fps is not None:
+        config.FPS = args.fps
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,122 @@ SCREEN_WIDTH = 1280
 HEIGHT = 135
 SCREEN_HEIGHT = 720
 FPS = 60
+#? PIPE_PAIRS -> Pipe pairs on the course at once, the birds always measure the next one they have not passed
+PIPE_PAIRS = 1
+#? PIPE_SPACING -> Horizontal distance between two pipe pairs (at least a pipe and a bird wide) when PIPE_PAIRS > 1
+PIPE_SPACING = 120
+
+'''
+Frame Pacing Variables
+'''
+#? FRAME_PACING -> How manual play waits for the next frame: 'tick', 'sleep', 'busy' or 'hybrid' (see scripts/FramePacer.py)
+FRAME_PACING = 'hybrid'
+#? FRAME_SPIN_MS -> Milliseconds spun before every frame deadline in 'hybrid' mode
+FRAME_SPIN_MS = 2.0
+#? VSYNC = True -> Manual play is presented in sync with the display (falls back to FRAME_PACING without driver support)
+VSYNC = False
+#? FRAME_STATS = True -> Prints frame time and input-to-present latency percentiles every FRAME_STATS_INTERVAL frames
+FRAME_STATS = False
+FRAME_STATS_INTERVAL = 600
 
 '''
 AI Variable
 '''
-#? AI = True -> Enables AI (need PRINT_DATA = True)
+#? AI = True -> Enables AI
 AI = True
-#? PRINT_DATA = True -> Prints data to the console for debugging also is essential for AI to work so AI must be True
-PRINT_DATA = True if AI else False
\ No newline at end of file
+#? PRINT_DATA = True -> Prints the data of every bird every frame to the console for debugging (slow, keeps the Agent path)
+PRINT_DATA = False
+#? HEADLESS = True -> Trains without a visible window or frame limit, as fast as the simulation runs
+HEADLESS = False
+#? COURSE_SEED -> Seed of the pipe heights replayed every generation (None -> random course)
+COURSE_SEED = None
+#? MAX_GENERATION_STEPS -> Ends a generation after this many simulation steps (0 -> until every bird dies)
+MAX_GENERATION_STEPS = 0
+
+'''
+Dashboard Variables
+'''
+#? DASHBOARD = True -> Streams training progress to a browser at http://DASHBOARD_HOST:DASHBOARD_PORT (needs AI = True)
+DASHBOARD = False
+DASHBOARD_HOST = '127.0.0.1'
+DASHBOARD_PORT = 8765
+#? DASHBOARD_QUEUE_SIZE -> Generations buffered for the server thread before the oldest ones are dropped
+DASHBOARD_QUEUE_SIZE = 64
+
+'''
+Statistics Variables
+'''
+#? STATISTICS_PATH -> Directory the per-generation statistics columns are streamed to
+STATISTICS_PATH = 'AI/statistics'
+#? STATISTICS_TAIL -> Latest generations kept in memory for live display
+STATISTICS_TAIL = 50
+#? MEMORY_REPORT = True -> run() traces memory and counts live Player, Agent, Pipe and Surface objects every generation (slow, see AI/scripts/MemoryReporter.py)
+MEMORY_REPORT = False
+#? MEMORY_REPORT_PATH -> File the per-generation memory report is written to
+MEMORY_REPORT_PATH = 'AI/statistics/memory.txt'
+#? MEMORY_TOP_MODULES -> Modules with the largest allocation change listed per generation
+MEMORY_TOP_MODULES = 10
+
+'''
+Training Variables
+'''
+#? COMPACT_THRESHOLD -> Fraction of dead birds in the active set that triggers compacting it
+COMPACT_THRESHOLD = 0.25
+#? SIM_STEPS_PER_RENDER -> Fixed simulation steps run per rendered frame at FPS (speeds training up)
+SIM_STEPS_PER_RENDER = 1
+#? ACTION_REPEAT -> Networks are queried every ACTION_REPEAT steps, the last decision is held in between
+ACTION_REPEAT = 1
+#? ACCELERATOR = True -> Simulates the birds with the numba kernel in AI/scripts/Accelerator.py when numba is installed (not with PRINT_DATA)
+ACCELERATOR = True
+#? THREADED_RENDER = True -> The simulation runs free in its own thread, the window draws its latest snapshot at FPS
+THREADED_RENDER = False
+#? CODEGEN = True -> Networks not run by the accelerator are activated by per-genome generated functions (AI/scripts/Codegen.py)
+CODEGEN = True
+#? RENDER_MODE -> 'sprites' draws every alive bird, 'density' a heatmap of the birds per row plus DENSITY_TOP_K sprites (see scripts/Density.py)
+RENDER_MODE = 'sprites'
+#? DENSITY_TOP_K -> Birds closest to the center of the gap still drawn as sprites in the 'density' view
+DENSITY_TOP_K = 8
+
+'''
+Policy Variables
+'''
+#? POLICY_PATH -> Where run() exports the champion network and where PILOT mode loads it from
+POLICY_PATH = 'AI/champion.npz'
+#? PILOT = True -> With AI = False the exported champion policy flies the bird instead of the keyboard/mouse
+PILOT = False
+
+'''
+Island Variables
+'''
+#? ISLANDS > 1 -> run() evolves this many populations headless in separate processes on different course seeds
+ISLANDS = 1
+#? MIGRATION_INTERVAL -> Generations between two exchanges of top genomes between neighbouring islands
+MIGRATION_INTERVAL = 10
+#? MIGRANTS -> Top genomes an island sends to the next one per exchange
+MIGRANTS = 2
+
+'''
+Checkpoint Variables
+'''
+#? CHECKPOINT_INTERVAL -> run() saves a NEAT checkpoint every this many generations (0 -> no checkpoints)
+CHECKPOINT_INTERVAL = 0
+#? CHECKPOINT_PREFIX -> Checkpoint files are named CHECKPOINT_PREFIX + generation, `python cli.py replay` restores them
+CHECKPOINT_PREFIX = 'AI/checkpoints/neat-checkpoint-'
+
+'''
+Fitness Variables
+'''
+#? FITNESS -> Name of the fitness function in AI/scripts/Fitness.py applied to the counters at the end of a generation
+FITNESS = 'default'
+
+'''
+Recording Variables
+'''
+#? RECORD = True -> Records every drawn training frame in the background (see scripts/Recorder.py)
+RECORD = False
+#? RECORD_PATH -> Video file (.mp4, needs ffmpeg) or directory of PNG frames
+RECORD_PATH = 'recordings/training.mp4'
+#? RECORD_QUEUE_SIZE -> Frames buffered for the encoder thread
+RECORD_QUEUE_SIZE = 120
+#? RECORD_POLICY -> 'drop' drops frames while the queue is full, 'throttle' captures fewer frames instead
+RECORD_POLICY = 'drop'
@@ -1,14 +1,36 @@
 import pygame
 import os
+import threading
 import config.config as config
 import config.constants as constants
 from scripts.Player import Player
+from scripts.Agent import Agent
 from scripts.Background import Background
 from scripts.PipeManager import PipeManager
 from scripts.GUI import GUI
+from scripts.SimClock import SimClock
+from scripts.FixedTimestep import FixedTimestep
+from scripts.Recorder import Recorder
+from scripts.Snapshot import SnapshotBuffer, SnapshotRenderer
+from scripts.Density import RENDER_MODES, DensityBand, histogram, closest_to_gap
+from scripts.FramePacer import FramePacer
+if config.AI or config.PILOT:
+    from AI.scripts.Head import Head
+if config.PILOT:
+    from AI.scripts.Policy import Policy
 if config.AI:
     import neat
-    from AI.scripts.Head import Head
+    from AI.scripts.Policy import export_policy
+    from AI.scripts.Dashboard import Dashboard, DashboardReporter
+    from AI.scripts.StreamingStatistics import StreamingStatisticsReporter
+    if config.MEMORY_REPORT:
+        from AI.scripts.MemoryReporter import MemoryReporter
+    from AI.scripts.Islands import run_islands
+    import AI.scripts.Accelerator as accelerator
+    import numpy as np
+    from AI.scripts.Fitness import get_fitness_function
+    from AI.scripts.Recurrent import BatchedRecurrentNetworks
+    from AI.scripts.Codegen import GeneratedNetwork
 
 class Main:
     """
@@ -27,12 +49,26 @@ class Main:
         '''
         Pygame variables
         '''
+        if config.HEADLESS:
+            # sprites still need a display to be converted, just not a visible one
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         pygame.display.init()
         pygame.display.set_caption(constants.TITLE)
-        self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        vsync = config.VSYNC and not config.HEADLESS
+        if vsync:
+            # pygame only honours vsync for SCALED or OPENGL windows
+            try:
+                self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+            except pygame.error:
+                print('[VSYNC is not supported by this display, pacing with FRAME_PACING]')
+                vsync = False
+        if not vsync:
+            self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         self.screen = pygame.Surface((config.WIDTH, config.HEIGHT))
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(config.FPS, config.FRAME_PACING, config.FRAME_SPIN_MS, vsync, config.FRAME_STATS_INTERVAL)
+        self.sim_clock = SimClock()
         self.game_is_on = True
         
         '''
@@ -42,8 +78,10 @@ class Main:
         self.background = Background()
         self.pipe_manager = PipeManager()
         self.pipes = self.pipe_manager.get_pipes()
+        self.observation = self.pipe_manager.get_observation()
         self.gui = GUI()
-        self.ai_head = Head() if config.AI else None
+        self.ai_head = Head() if config.AI or config.PILOT else None
+        self.policy = Policy.load(config.POLICY_PATH) if config.PILOT else None
         
         self.objects = [
             self.background,
@@ -77,6 +115,10 @@ class Main:
         '''
 
         while self.game_is_on:
+            # Wait before reading input rather than after presenting, so the
+            # input is as fresh as possible when the frame reaches the screen.
+            self.pacer.wait_for_input()
+            
             '''
             Handle events
             '''
@@ -92,6 +134,8 @@ class Main:
             if pygame.mouse.get_pressed()[0]:
                 self.player.jump()
             
+            self.sim_clock.advance()
+            
             '''
             Update
             '''
@@ -109,11 +153,16 @@ class Main:
                         if not isinstance(object, Player):
                             object.update()
                         else:
-                            collision, self.gui = object.update(self.pipes, self.gui)
+                            collision = object.update(self.observation)
                     except Exception as e:
                         pass
+                self.gui.update_score(self.player.get_score())
                 if collision == True:
                     self.reset()
+                elif self.policy:
+                    self.ai_head.set_data(self.player.get_stored_data())
+                    if self.policy.decide(self.ai_head.get_data()):
+                        self.player.jump()
             update()
             
             '''
@@ -137,9 +186,12 @@ class Main:
             '''
             scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
             self.window.blit(scaled_surface, (0, 0))
-            pygame.display.flip()
-            self.clock.tick(config.FPS)
+            self.pacer.present()
+            if config.FRAME_STATS and self.pacer.frames % config.FRAME_STATS_INTERVAL == 0:
+                print(self.pacer.report())
 
+        if config.FRAME_STATS:
+            print(self.pacer.report())
         pygame.quit()
 
 class MainAI(Main):
@@ -167,17 +219,76 @@ class MainAI(Main):
         '''
         AI Variables
         '''
+        # The birds take their cooldown timers from the SimClock, so every
+        # generation starts it from zero like the course.
+        self.sim_clock.reset()
         self.nets = []
         self.gens = []
         self.neurons = []
         
+        feed_forward = config_file.genome_config.feed_forward
+        network_type = neat.nn.FeedForwardNetwork if feed_forward else neat.nn.RecurrentNetwork
         for _, gen in genomes:
-            net = neat.nn.FeedForwardNetwork.create(gen, config_file)
+            net = network_type.create(gen, config_file)
             self.nets.append(net)
-            self.neurons.append(Player())
+            self.neurons.append(Agent())
             gen.fitness = 0
             self.gens.append(gen)
         
+        # self.neurons and self.nets hold the active set; self.active maps each
+        # active slot to its genome in self.gens and the fitness counters. Dead
+        # birds are only masked out in self.alive until compact() drops them.
+        self.active = list(range(len(self.gens)))
+        self.alive = [True] * len(self.gens)
+        self.alive_count = len(self.gens)
+        self.dead_count = 0
+        self.actions = [False] * len(self.gens)
+        
+        # Fitness is not accumulated per bird and frame. A bird that dies records
+        # the frames it survived and the score events it saw, and write_fitness
+        # turns the counters into fitness once with config.FITNESS.
+        self.fitness_function = get_fitness_function(config.FITNESS)
+        self.frames = np.zeros(len(self.gens), dtype=np.int64)
+        self.score_events = np.zeros(len(self.gens), dtype=np.int64)
+        self.collisions = np.zeros(len(self.gens), dtype=np.int64)
+        self.frame = 0
+        self.score_event_count = 0
+        
+        # With numba installed the whole population is simulated by one compiled
+        # kernel; networks it can not compile keep the Agent path, and so does
+        # PRINT_DATA, the kernel has no per-bird printing.
+        self.accelerator = None
+        if config.ACCELERATOR and accelerator.AVAILABLE and feed_forward and not config.PRINT_DATA:
+            try:
+                self.accelerator = accelerator.Accelerator(self.neurons, self.nets)
+            except ValueError:
+                self.accelerator = None
+        
+        # Birds that are activated one by one run a function generated for their
+        # genome instead of walking the node lists of neat's network.
+        if config.CODEGEN and feed_forward and self.accelerator is None:
+            self.nets = [GeneratedNetwork.create(gen, config_file) for gen in self.gens]
+        
+        # Recurrent networks keep their node values in one (population, max_nodes)
+        # array and advance together after the birds moved; networks that can not
+        # be batched are activated one by one.
+        self.recurrent = None
+        if not feed_forward:
+            try:
+                self.recurrent = BatchedRecurrentNetworks(self.nets)
+                self.recurrent_inputs = np.zeros((len(self.gens), self.recurrent.num_inputs))
+            except ValueError:
+                self.recurrent = None
+        
+        '''
+        Fixed timestep
+        '''
+        # Every simulation step advances the physics and the SimClock by one
+        # frame at config.FPS; SIM_STEPS_PER_RENDER of them run per drawn frame.
+        self.timestep = FixedTimestep(1000 / config.FPS, config.SIM_STEPS_PER_RENDER)
+        self.elapsed = 0
+        self.step_count = 0
+        
         
         '''
         Variables
@@ -191,16 +302,145 @@ class MainAI(Main):
         self.background = Background()
         self.pipe_manager = PipeManager()
         self.pipes = self.pipe_manager.get_pipes()
+        self.observation = self.pipe_manager.get_observation()
         self.gui = GUI()
         self.ai_head = Head() if config.AI else None
+        self.dashboard = Dashboard() if config.DASHBOARD else None
+        self.recorder = Recorder() if config.RECORD else None
+        if config.RENDER_MODE not in RENDER_MODES:
+            raise ValueError(f'Unknown RENDER_MODE {config.RENDER_MODE!r}, expected one of {RENDER_MODES}')
+        self.density_band = DensityBand(Agent.X, Agent.COLLIDER_WIDTH, config.HEIGHT) if config.RENDER_MODE == 'density' else None
+        # the density view bins the y of the Agents from this array, ai_update writes it
+        # as it moves them so drawing never walks the population
+        self.ys = np.array([neuron.y for neuron in self.neurons], dtype=np.float64) if self.density_band and not self.accelerator else None
         
         # final self.objects:
-        # [self.background, self.neuron_1, self.neuron_2..., self.pipe_manager, self.gui]
-        self.objects = [self.background]
-        self.objects.extend(self.neurons)
-        self.objects.extend([self.pipe_manager, self.gui]) 
+        # [self.background, self.pipe_manager, self.gui]
+        # the neurons are kept out of it, they are updated by ai_update only
+        self.objects = [self.background, self.pipe_manager, self.gui]
         
+        if config.COURSE_SEED is not None:
+            self.pipe_manager.seed(config.COURSE_SEED)
         self.reset()
+    
+    def compact(self):
+        '''
+        Drops the dead birds from the active set.
+
+        Rebuilds self.neurons, self.nets, self.active and self.alive with only
+        the alive birds, keeping their order. Called once the number of dead
+        birds in the active set crosses COMPACT_THRESHOLD instead of popping
+        every bird from three lists as it dies.
+        '''
+        alive = self.alive
+        self.neurons = [neuron for neuron, is_alive in zip(self.neurons, alive) if is_alive]
+        self.nets = [net for net, is_alive in zip(self.nets, alive) if is_alive]
+        self.active = [index for index, is_alive in zip(self.active, alive) if is_alive]
+        self.actions = [action for action, is_alive in zip(self.actions, alive) if is_alive]
+        if self.ys is not None:
+            self.ys = self.ys[np.flatnonzero(alive)]
+        self.alive = [True] * len(self.neurons)
+        self.dead_count = 0
+    
+    def fitness_counters(self):
+        '''
+        Returns the fitness counters of every genome, filling in the survivors.
+        '''
+        if self.accelerator:
+            return self.accelerator.fitness_counters()
+        for i, index in enumerate(self.active):
+            if self.alive[i]:
+                self.frames[index] = self.frame
+                self.score_events[index] = self.score_event_count
+        return self.frames, self.score_events, self.collisions
+    
+    def write_fitness(self):
+        '''
+        Computes the fitness of the generation from the counters and writes it to the genomes.
+        '''
+        fitnesses = self.fitness_function(*self.fitness_counters())
+        for gen, fitness in zip(self.gens, fitnesses.tolist()):
+            gen.fitness = fitness
+    
+    def density_birds(self):
+        '''
+        Bins the alive birds per screen row and picks the birds of the density view.
+
+        Returns the bird count of every row and the DENSITY_TOP_K alive Agents
+        closest to the center of the gap, with their y up to date. The rows are
+        counted with one np.bincount, only the picked Agents are touched.
+        '''
+        if self.accelerator:
+            alive = self.accelerator.alive.nonzero()[0]
+            ys = self.accelerator.y[alive]
+        else:
+            alive = np.flatnonzero(self.alive)
+            ys = self.ys[alive]
+        counts = histogram(ys, Agent.COLLIDER_HEIGHT, config.HEIGHT)
+        birds = []
+        for j in closest_to_gap(ys, self.observation.gap_y_center, Agent.COLLIDER_HEIGHT, config.DENSITY_TOP_K).tolist():
+            neuron = self.neurons[int(alive[j])]
+            neuron.y = float(ys[j])
+            birds.append(neuron)
+        return counts, birds
+    
+    def take_snapshot(self, buffer):
+        '''
+        Publishes the birds, pipes and score of the current step into a SnapshotBuffer.
+        '''
+        density = None
+        if self.density_band:
+            density, birds = self.density_birds()
+            ys = [neuron.y for neuron in birds]
+        elif self.accelerator:
+            alive = self.accelerator.alive.nonzero()[0].tolist()
+            ys = self.accelerator.y[alive].tolist()
+            birds = [self.neurons[i] for i in alive]
+        else:
+            birds = [neuron for neuron, is_alive in zip(self.neurons, self.alive) if is_alive]
+            ys = [neuron.y for neuron in birds]
+        colors = [(neuron.red, neuron.green, neuron.blue, 255) for neuron in birds]
+        buffer.publish(ys, colors, [(pipe.x, pipe.y) for pipe in self.pipe_manager.get_pipes()], self.score, self.step_count, density)
+    
+    def render_threaded(self, step):
+        '''
+        Runs the simulation in a worker thread and draws its snapshots until the generation ends.
+
+        The simulation publishes a snapshot whenever the renderer has taken the
+        previous one; the renderer draws the latest one at config.FPS.
+        '''
+        buffer = SnapshotBuffer()
+        renderer = SnapshotRenderer(Agent.X)
+        errors = []
+        
+        def simulate():
+            try:
+                while self.game_is_on and step():
+                    if buffer.wanted:
+                        self.take_snapshot(buffer)
+            except BaseException as error:
+                errors.append(error)
+        
+        thread = threading.Thread(target=simulate, name='simulation', daemon=True)
+        thread.start()
+        stopped = False
+        while thread.is_alive():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    stopped = True
+                    self.game_is_on = False
+            renderer.draw(self.screen, self.background, self.gui, buffer.read())
+            if self.recorder:
+                self.recorder.capture(self.screen)
+            scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
+            self.window.blit(scaled_surface, (0, 0))
+            pygame.display.flip()
+            self.clock.tick(config.FPS)
+        thread.join()
+        if errors:
+            raise errors[0]
+        if stopped:
+            self.write_fitness()
         
     def game_loop(self):
         '''
@@ -239,59 +479,134 @@ class MainAI(Main):
                             continue
                     except Exception as e:
                         pass
-            update()
             
             '''
             AI Update
             '''
             def ai_update():
                 '''
-                AI update loop that runs every frame. It updates the AI's perception of the game world,
-                runs the neural network, and then updates the player based on the output of the neural network.
-                It also updates the fitness of each genome and removes any genomes that have a collision.
+                AI update loop that runs every simulation step. It updates the AI's perception of the game world,
+                runs the neural network every ACTION_REPEAT steps (holding the last decision in between), and then
+                updates the player based on the output of the neural network.
+                It also updates the fitness of each genome and masks out any birds that have a collision.
                 '''
-                if not self.neurons:
+                if not self.alive_count:
+                    self.write_fitness()
                     self.game_is_on = False
                     return
 
                 self.pipe_manager.update()
-                self.pipes = self.pipe_manager.get_pipes()
 
                 prev_score = self.score
+                first_alive = None
+                query = self.step_count % config.ACTION_REPEAT == 0
+                deferred = query and self.recurrent is not None
+
+                if self.accelerator:
+                    self.alive_count -= self.accelerator.step(self.observation, self.sim_clock.get_ticks(), query)
+                    if not self.alive_count:
+                        self.write_fitness()
+                        self.game_is_on = False
+                        return
+                    self.score = self.accelerator.first_alive_score()
+                    if self.score != prev_score:
+                        self.accelerator.add_score_event()
+                    return
 
-                for i in range(len(self.neurons) - 1, -1, -1):
-                    neuron = self.neurons[i]
-                    collision, self.gui = neuron.update(self.pipes, self.gui)
+                ys = self.ys
+                for i, neuron in enumerate(self.neurons):
+                    if not self.alive[i]:
+                        continue
+                    collision = neuron.update(self.observation)
+                    if ys is not None:
+                        ys[i] = neuron.y
                     if collision:
-                        self.gens[i].fitness -= 1
-                        self.neurons.pop(i)
-                        self.nets.pop(i)
-                        self.gens.pop(i)
+                        index = self.active[i]
+                        self.frames[index] = self.frame
+                        self.score_events[index] = self.score_event_count
+                        self.collisions[index] = 1
+                        if self.recurrent:
+                            self.recurrent.reset_rows(index)
+                            self.recurrent_inputs[index] = 0.0
+                        self.alive[i] = False
+                        self.alive_count -= 1
+                        self.dead_count += 1
                         continue
 
-                    data = neuron.get_stored_data()
-                    self.ai_head.set_data(data)
-                    inputs = self.ai_head.get_data()
-                    output = self.nets[i].activate(inputs)
-                    if output[0] > 0.5:
+                    if query:
+                        data = neuron.get_stored_data()
+                        self.ai_head.set_data(data)
+                        inputs = self.ai_head.get_data()
+                        if deferred:
+                            self.recurrent_inputs[self.active[i]] = inputs
+                        else:
+                            output = self.nets[i].activate(inputs)
+                            self.actions[i] = output[0] > 0.5
+                    if self.actions[i] and not deferred:
                         neuron.jump()
 
-                    self.gens[i].fitness += 0.1
+                    if first_alive is None:
+                        first_alive = neuron
 
-                if not self.neurons:
+                if not self.alive_count:
+                    self.write_fitness()
                     self.game_is_on = False
                     return
 
-                self.score = self.neurons[0].get_score()
+                if deferred:
+                    outputs = self.recurrent.step(self.recurrent_inputs).tolist()
+                    for i, index in enumerate(self.active):
+                        if self.alive[i]:
+                            self.actions[i] = outputs[index] > 0.5
+                            if self.actions[i]:
+                                self.neurons[i].jump()
+
+                self.frame += 1
+                self.score = first_alive.get_score()
                 if self.score != prev_score:
-                    for gen in self.gens:
-                        gen.fitness += 5
+                    self.score_event_count += 1
+
+                if self.dead_count > config.COMPACT_THRESHOLD * len(self.neurons):
+                    self.compact()
 
             
-            if config.AI:
-                ai_update()
-                if self.game_is_on == False:
+            '''
+            Fixed timestep
+            '''
+            def step():
+                '''
+                Runs one simulation step and returns False once the generation is over.
+                '''
+                self.sim_clock.advance()
+                update()
+                if config.AI:
+                    ai_update()
+                    if self.game_is_on == False:
+                        return False
+                    if self.dashboard:
+                        self.dashboard.record_step(self.alive_count, self.sim_clock.get_ticks())
+                self.step_count += 1
+                if config.MAX_GENERATION_STEPS and self.step_count >= config.MAX_GENERATION_STEPS:
+                    self.write_fitness()
+                    self.game_is_on = False
+                    return False
+                return True
+            
+            # The simulation runs free in its own thread and the window shows its
+            # latest snapshot, so presenting frames can not slow training down.
+            if config.THREADED_RENDER and not config.HEADLESS:
+                self.render_threaded(step)
+                break
+            
+            # Headless runs do not wait for the wall clock, they just simulate.
+            steps = self.timestep.steps_per_render if config.HEADLESS else self.timestep.advance(self.elapsed)
+            for _ in range(steps):
+                if not step():
                     break
+            if self.game_is_on == False:
+                break
+            if config.HEADLESS:
+                continue
             
             '''
             Draw
@@ -300,15 +615,29 @@ class MainAI(Main):
                 '''
                 Draws all game objects onto the game screen.
 
-                This includes the background, each neuron (AI player), the pipes, and the GUI.
+                This includes the background, each neuron (AI player) or the density view, the pipes, and the GUI.
                 '''
                 self.screen.fill((0, 0, 0))
                 self.background.draw(self.screen)
-                for neuron in self.neurons:
-                    neuron.draw(self.screen)
+                if self.density_band:
+                    counts, birds = self.density_birds()
+                    self.density_band.draw(self.screen, counts)
+                    for neuron in birds:
+                        neuron.draw(self.screen)
+                else:
+                    if self.accelerator:
+                        self.alive = self.accelerator.sync(self.neurons)
+                    for neuron, is_alive in zip(self.neurons, self.alive):
+                        if is_alive:
+                            neuron.draw(self.screen)
                 self.pipe_manager.draw(self.screen)
+                # alive birds all pass the same pipes on the same ticks, so
+                # self.score is the best score of the population
+                self.gui.update_score(self.score)
                 self.gui.draw(self.screen)
             draw()
+            if self.recorder:
+                self.recorder.capture(self.screen)
             
             
             '''
@@ -317,7 +646,7 @@ class MainAI(Main):
             scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
             self.window.blit(scaled_surface, (0, 0))
             pygame.display.flip()
-            self.clock.tick(config.FPS)
+            self.elapsed = self.clock.tick(config.FPS)
 
 
 
@@ -337,16 +666,20 @@ def main_ai(genomes, config_file):
     game.game_loop()
 
 
-def run(config_path):
+def run(config_path, generations=50):
     """
     Runs the AI version of the game with the given NEAT configuration file.
 
     Parameters:
     config_path (str): The path to the NEAT configuration file.
+    generations (int): The maximum number of generations.
 
     This function creates a NEAT population with the given configuration, adds the
-    standard reporters (StdOutReporter and StatisticsReporter), and runs the population
-    for 50 generations, calling the main_ai function for each generation.
+    standard output reporter, a StreamingStatisticsReporter and with config.MEMORY_REPORT
+    a MemoryReporter, and runs the population
+    for the given number of generations, calling the main_ai function for each generation. The winning
+    genome is exported as a standalone policy to config.POLICY_PATH. With
+    config.ISLANDS > 1 the populations evolve as islands instead, see AI/scripts/Islands.py.
     """
     config_file = neat.config.Config(neat.DefaultGenome, 
                                 neat.DefaultReproduction, 
@@ -354,10 +687,36 @@ def run(config_path):
                                 neat.DefaultStagnation, 
                                 config_path)
 
+    if config.ISLANDS > 1:
+        winner = run_islands(config_path, generations=generations, seed=config.COURSE_SEED or 0)
+        export_policy(neat.nn.FeedForwardNetwork.create(winner, config_file), config.POLICY_PATH)
+        print(f'[Champion policy saved to {config.POLICY_PATH}]')
+        return
+
     population = neat.Population(config_file)
     population.add_reporter(neat.StdOutReporter(True))
-    population.add_reporter(neat.StatisticsReporter())
-    winner = population.run(main_ai, 50)
+    statistics = StreamingStatisticsReporter(config.STATISTICS_PATH, config.STATISTICS_TAIL)
+    population.add_reporter(statistics)
+    if config.MEMORY_REPORT:
+        memory = MemoryReporter(config.MEMORY_REPORT_PATH, config.MEMORY_TOP_MODULES)
+        population.add_reporter(memory)
+    if config.DASHBOARD:
+        population.add_reporter(DashboardReporter())
+        Dashboard().start()
+    if config.CHECKPOINT_INTERVAL:
+        os.makedirs(os.path.dirname(config.CHECKPOINT_PREFIX), exist_ok=True)
+        population.add_reporter(neat.Checkpointer(config.CHECKPOINT_INTERVAL, filename_prefix=config.CHECKPOINT_PREFIX))
+    try:
+        winner = population.run(main_ai, generations)
+    finally:
+        # the column files are closed however training ends
+        statistics.close()
+        if config.MEMORY_REPORT:
+            memory.close()
+        if config.RECORD:
+            Recorder().close()
+    export_policy(neat.nn.FeedForwardNetwork.create(winner, config_file), config.POLICY_PATH)
+    print(f'[Champion policy saved to {config.POLICY_PATH}]')
 
 if __name__ == "__main__":
     if config.AI:
@@ -372,27 +731,63 @@ if __name__ == "__main__":
         game.game_loop()
 import pygame
 import os
+import threading
 import config.config as config
 import config.constants as constants
 from scripts.Player import Player
+from scripts.Agent import Agent
 from scripts.Background import Background
 from scripts.PipeManager import PipeManager
 from scripts.GUI import GUI
+from scripts.SimClock import SimClock
+from scripts.FixedTimestep import FixedTimestep
+from scripts.Recorder import Recorder
+from scripts.Snapshot import SnapshotBuffer, SnapshotRenderer
+from scripts.Density import RENDER_MODES, DensityBand, histogram, closest_to_gap
+from scripts.FramePacer import FramePacer
+if config.AI or config.PILOT:
+    from AI.scripts.Head import Head
+if config.PILOT:
+    from AI.scripts.Policy import Policy
 if config.AI:
     import neat
-    from AI.scripts.Head import Head
+    from AI.scripts.Policy import export_policy
+    from AI.scripts.Dashboard import Dashboard, DashboardReporter
+    from AI.scripts.StreamingStatistics import StreamingStatisticsReporter
+    if config.MEMORY_REPORT:
+        from AI.scripts.MemoryReporter import MemoryReporter
+    from AI.scripts.Islands import run_islands
+    import AI.scripts.Accelerator as accelerator
+    import numpy as np
+    from AI.scripts.Fitness import get_fitness_function
+    from AI.scripts.Recurrent import BatchedRecurrentNetworks
+    from AI.scripts.Codegen import GeneratedNetwork
 
 class Main:
     def __init__(self):
         '''
         Pygame variables
         '''
+        if config.HEADLESS:
+            # sprites still need a display to be converted, just not a visible one
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         pygame.display.init()
         pygame.display.set_caption(constants.TITLE)
-        self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        vsync = config.VSYNC and not config.HEADLESS
+        if vsync:
+            # pygame only honours vsync for SCALED or OPENGL windows
+            try:
+                self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+            except pygame.error:
+                print('[VSYNC is not supported by this display, pacing with FRAME_PACING]')
+                vsync = False
+        if not vsync:
+            self.window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         self.screen = pygame.Surface((config.WIDTH, config.HEIGHT))
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(config.FPS, config.FRAME_PACING, config.FRAME_SPIN_MS, vsync, config.FRAME_STATS_INTERVAL)
+        self.sim_clock = SimClock()
         self.game_is_on = True
         
         '''
@@ -402,8 +797,10 @@ class Main:
         self.background = Background()
         self.pipe_manager = PipeManager()
         self.pipes = self.pipe_manager.get_pipes()
+        self.observation = self.pipe_manager.get_observation()
         self.gui = GUI()
-        self.ai_head = Head() if config.AI else None
+        self.ai_head = Head() if config.AI or config.PILOT else None
+        self.policy = Policy.load(config.POLICY_PATH) if config.PILOT else None
         
         self.objects = [
             self.background,
@@ -437,6 +834,10 @@ class Main:
         '''
 
         while self.game_is_on:
+            # Wait before reading input rather than after presenting, so the
+            # input is as fresh as possible when the frame reaches the screen.
+            self.pacer.wait_for_input()
+            
             '''
             Handle events
             '''
@@ -452,6 +853,8 @@ class Main:
             if pygame.mouse.get_pressed()[0]:
                 self.player.jump()
             
+            self.sim_clock.advance()
+            
             '''
             Update
             '''
@@ -469,11 +872,16 @@ class Main:
                         if not isinstance(object, Player):
                             object.update()
                         else:
-                            collision, self.gui = object.update(self.pipes, self.gui)
+                            collision = object.update(self.observation)
                     except Exception as e:
                         pass
+                self.gui.update_score(self.player.get_score())
                 if collision == True:
                     self.reset()
+                elif self.policy:
+                    self.ai_head.set_data(self.player.get_stored_data())
+                    if self.policy.decide(self.ai_head.get_data()):
+                        self.player.jump()
             update()
             
             '''
@@ -497,9 +905,12 @@ class Main:
             '''
             scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
             self.window.blit(scaled_surface, (0, 0))
-            pygame.display.flip()
-            self.clock.tick(config.FPS)
+            self.pacer.present()
+            if config.FRAME_STATS and self.pacer.frames % config.FRAME_STATS_INTERVAL == 0:
+                print(self.pacer.report())
 
+        if config.FRAME_STATS:
+            print(self.pacer.report())
         pygame.quit()
 
 class MainAI(Main):
@@ -520,17 +931,76 @@ class MainAI(Main):
         '''
         AI Variables
         '''
+        # The birds take their cooldown timers from the SimClock, so every
+        # generation starts it from zero like the course.
+        self.sim_clock.reset()
         self.nets = []
         self.gens = []
         self.neurons = []
         
+        feed_forward = config_file.genome_config.feed_forward
+        network_type = neat.nn.FeedForwardNetwork if feed_forward else neat.nn.RecurrentNetwork
         for _, gen in genomes:
-            net = neat.nn.FeedForwardNetwork.create(gen, config_file)
+            net = network_type.create(gen, config_file)
             self.nets.append(net)
-            self.neurons.append(Player())
+            self.neurons.append(Agent())
             gen.fitness = 0
             self.gens.append(gen)
         
+        # self.neurons and self.nets hold the active set; self.active maps each
+        # active slot to its genome in self.gens and the fitness counters. Dead
+        # birds are only masked out in self.alive until compact() drops them.
+        self.active = list(range(len(self.gens)))
+        self.alive = [True] * len(self.gens)
+        self.alive_count = len(self.gens)
+        self.dead_count = 0
+        self.actions = [False] * len(self.gens)
+        
+        # Fitness is not accumulated per bird and frame. A bird that dies records
+        # the frames it survived and the score events it saw, and write_fitness
+        # turns the counters into fitness once with config.FITNESS.
+        self.fitness_function = get_fitness_function(config.FITNESS)
+        self.frames = np.zeros(len(self.gens), dtype=np.int64)
+        self.score_events = np.zeros(len(self.gens), dtype=np.int64)
+        self.collisions = np.zeros(len(self.gens), dtype=np.int64)
+        self.frame = 0
+        self.score_event_count = 0
+        
+        # With numba installed the whole population is simulated by one compiled
+        # kernel; networks it can not compile keep the Agent path, and so does
+        # PRINT_DATA, the kernel has no per-bird printing.
+        self.accelerator = None
+        if config.ACCELERATOR and accelerator.AVAILABLE and feed_forward and not config.PRINT_DATA:
+            try:
+                self.accelerator = accelerator.Accelerator(self.neurons, self.nets)
+            except ValueError:
+                self.accelerator = None
+        
+        # Birds that are activated one by one run a function generated for their
+        # genome instead of walking the node lists of neat's network.
+        if config.CODEGEN and feed_forward and self.accelerator is None:
+            self.nets = [GeneratedNetwork.create(gen, config_file) for gen in self.gens]
+        
+        # Recurrent networks keep their node values in one (population, max_nodes)
+        # array and advance together after the birds moved; networks that can not
+        # be batched are activated one by one.
+        self.recurrent = None
+        if not feed_forward:
+            try:
+                self.recurrent = BatchedRecurrentNetworks(self.nets)
+                self.recurrent_inputs = np.zeros((len(self.gens), self.recurrent.num_inputs))
+            except ValueError:
+                self.recurrent = None
+        
+        '''
+        Fixed timestep
+        '''
+        # Every simulation step advances the physics and the SimClock by one
+        # frame at config.FPS; SIM_STEPS_PER_RENDER of them run per drawn frame.
+        self.timestep = FixedTimestep(1000 / config.FPS, config.SIM_STEPS_PER_RENDER)
+        self.elapsed = 0
+        self.step_count = 0
+        
         
         '''
         Variables
@@ -544,16 +1014,145 @@ class MainAI(Main):
         self.background = Background()
         self.pipe_manager = PipeManager()
         self.pipes = self.pipe_manager.get_pipes()
+        self.observation = self.pipe_manager.get_observation()
         self.gui = GUI()
         self.ai_head = Head() if config.AI else None
+        self.dashboard = Dashboard() if config.DASHBOARD else None
+        self.recorder = Recorder() if config.RECORD else None
+        if config.RENDER_MODE not in RENDER_MODES:
+            raise ValueError(f'Unknown RENDER_MODE {config.RENDER_MODE!r}, expected one of {RENDER_MODES}')
+        self.density_band = DensityBand(Agent.X, Agent.COLLIDER_WIDTH, config.HEIGHT) if config.RENDER_MODE == 'density' else None
+        # the density view bins the y of the Agents from this array, ai_update writes it
+        # as it moves them so drawing never walks the population
+        self.ys = np.array([neuron.y for neuron in self.neurons], dtype=np.float64) if self.density_band and not self.accelerator else None
         
         # final self.objects:
-        # [self.background, self.neuron_1, self.neuron_2..., self.pipe_manager, self.gui]
-        self.objects = [self.background]
-        self.objects.extend(self.neurons)
-        self.objects.extend([self.pipe_manager, self.gui]) 
+        # [self.background, self.pipe_manager, self.gui]
+        # the neurons are kept out of it, they are updated by ai_update only
+        self.objects = [self.background, self.pipe_manager, self.gui]
         
+        if config.COURSE_SEED is not None:
+            self.pipe_manager.seed(config.COURSE_SEED)
         self.reset()
+    
+    def compact(self):
+        '''
+        Drops the dead birds from the active set.
+
+        Rebuilds self.neurons, self.nets, self.active and self.alive with only
+        the alive birds, keeping their order. Called once the number of dead
+        birds in the active set crosses COMPACT_THRESHOLD instead of popping
+        every bird from three lists as it dies.
+        '''
+        alive = self.alive
+        self.neurons = [neuron for neuron, is_alive in zip(self.neurons, alive) if is_alive]
+        self.nets = [net for net, is_alive in zip(self.nets, alive) if is_alive]
+        self.active = [index for index, is_alive in zip(self.active, alive) if is_alive]
+        self.actions = [action for action, is_alive in zip(self.actions, alive) if is_alive]
+        if self.ys is not None:
+            self.ys = self.ys[np.flatnonzero(alive)]
+        self.alive = [True] * len(self.neurons)
+        self.dead_count = 0
+    
+    def fitness_counters(self):
+        '''
+        Returns the fitness counters of every genome, filling in the survivors.
+        '''
+        if self.accelerator:
+            return self.accelerator.fitness_counters()
+        for i, index in enumerate(self.active):
+            if self.alive[i]:
+                self.frames[index] = self.frame
+                self.score_events[index] = self.score_event_count
+        return self.frames, self.score_events, self.collisions
+    
+    def write_fitness(self):
+        '''
+        Computes the fitness of the generation from the counters and writes it to the genomes.
+        '''
+        fitnesses = self.fitness_function(*self.fitness_counters())
+        for gen, fitness in zip(self.gens, fitnesses.tolist()):
+            gen.fitness = fitness
+    
+    def density_birds(self):
+        '''
+        Bins the alive birds per screen row and picks the birds of the density view.
+
+        Returns the bird count of every row and the DENSITY_TOP_K alive Agents
+        closest to the center of the gap, with their y up to date. The rows are
+        counted with one np.bincount, only the picked Agents are touched.
+        '''
+        if self.accelerator:
+            alive = self.accelerator.alive.nonzero()[0]
+            ys = self.accelerator.y[alive]
+        else:
+            alive = np.flatnonzero(self.alive)
+            ys = self.ys[alive]
+        counts = histogram(ys, Agent.COLLIDER_HEIGHT, config.HEIGHT)
+        birds = []
+        for j in closest_to_gap(ys, self.observation.gap_y_center, Agent.COLLIDER_HEIGHT, config.DENSITY_TOP_K).tolist():
+            neuron = self.neurons[int(alive[j])]
+            neuron.y = float(ys[j])
+            birds.append(neuron)
+        return counts, birds
+    
+    def take_snapshot(self, buffer):
+        '''
+        Publishes the birds, pipes and score of the current step into a SnapshotBuffer.
+        '''
+        density = None
+        if self.density_band:
+            density, birds = self.density_birds()
+            ys = [neuron.y for neuron in birds]
+        elif self.accelerator:
+            alive = self.accelerator.alive.nonzero()[0].tolist()
+            ys = self.accelerator.y[alive].tolist()
+            birds = [self.neurons[i] for i in alive]
+        else:
+            birds = [neuron for neuron, is_alive in zip(self.neurons, self.alive) if is_alive]
+            ys = [neuron.y for neuron in birds]
+        colors = [(neuron.red, neuron.green, neuron.blue, 255) for neuron in birds]
+        buffer.publish(ys, colors, [(pipe.x, pipe.y) for pipe in self.pipe_manager.get_pipes()], self.score, self.step_count, density)
+    
+    def render_threaded(self, step):
+        '''
+        Runs the simulation in a worker thread and draws its snapshots until the generation ends.
+
+        The simulation publishes a snapshot whenever the renderer has taken the
+        previous one; the renderer draws the latest one at config.FPS.
+        '''
+        buffer = SnapshotBuffer()
+        renderer = SnapshotRenderer(Agent.X)
+        errors = []
+        
+        def simulate():
+            try:
+                while self.game_is_on and step():
+                    if buffer.wanted:
+                        self.take_snapshot(buffer)
+            except BaseException as error:
+                errors.append(error)
+        
+        thread = threading.Thread(target=simulate, name='simulation', daemon=True)
+        thread.start()
+        stopped = False
+        while thread.is_alive():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    stopped = True
+                    self.game_is_on = False
+            renderer.draw(self.screen, self.background, self.gui, buffer.read())
+            if self.recorder:
+                self.recorder.capture(self.screen)
+            scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
+            self.window.blit(scaled_surface, (0, 0))
+            pygame.display.flip()
+            self.clock.tick(config.FPS)
+        thread.join()
+        if errors:
+            raise errors[0]
+        if stopped:
+            self.write_fitness()
         
     def game_loop(self):
         '''
@@ -592,59 +1191,134 @@ class MainAI(Main):
                             continue
                     except Exception as e:
                         pass
-            update()
             
             '''
             AI Update
             '''
             def ai_update():
                 '''
-                AI update loop that runs every frame. It updates the AI's perception of the game world,
-                runs the neural network, and then updates the player based on the output of the neural network.
-                It also updates the fitness of each genome and removes any genomes that have a collision.
+                AI update loop that runs every simulation step. It updates the AI's perception of the game world,
+                runs the neural network every ACTION_REPEAT steps (holding the last decision in between), and then
+                updates the player based on the output of the neural network.
+                It also updates the fitness of each genome and masks out any birds that have a collision.
                 '''
-                if not self.neurons:
+                if not self.alive_count:
+                    self.write_fitness()
                     self.game_is_on = False
                     return
 
                 self.pipe_manager.update()
-                self.pipes = self.pipe_manager.get_pipes()
 
                 prev_score = self.score
+                first_alive = None
+                query = self.step_count % config.ACTION_REPEAT == 0
+                deferred = query and self.recurrent is not None
+
+                if self.accelerator:
+                    self.alive_count -= self.accelerator.step(self.observation, self.sim_clock.get_ticks(), query)
+                    if not self.alive_count:
+                        self.write_fitness()
+                        self.game_is_on = False
+                        return
+                    self.score = self.accelerator.first_alive_score()
+                    if self.score != prev_score:
+                        self.accelerator.add_score_event()
+                    return
 
-                for i in range(len(self.neurons) - 1, -1, -1):
-                    neuron = self.neurons[i]
-                    collision, self.gui = neuron.update(self.pipes, self.gui)
+                ys = self.ys
+                for i, neuron in enumerate(self.neurons):
+                    if not self.alive[i]:
+                        continue
+                    collision = neuron.update(self.observation)
+                    if ys is not None:
+                        ys[i] = neuron.y
                     if collision:
-                        self.gens[i].fitness -= 1
-                        self.neurons.pop(i)
-                        self.nets.pop(i)
-                        self.gens.pop(i)
+                        index = self.active[i]
+                        self.frames[index] = self.frame
+                        self.score_events[index] = self.score_event_count
+                        self.collisions[index] = 1
+                        if self.recurrent:
+                            self.recurrent.reset_rows(index)
+                            self.recurrent_inputs[index] = 0.0
+                        self.alive[i] = False
+                        self.alive_count -= 1
+                        self.dead_count += 1
                         continue
 
-                    data = neuron.get_stored_data()
-                    self.ai_head.set_data(data)
-                    inputs = self.ai_head.get_data()
-                    output = self.nets[i].activate(inputs)
-                    if output[0] > 0.5:
+                    if query:
+                        data = neuron.get_stored_data()
+                        self.ai_head.set_data(data)
+                        inputs = self.ai_head.get_data()
+                        if deferred:
+                            self.recurrent_inputs[self.active[i]] = inputs
+                        else:
+                            output = self.nets[i].activate(inputs)
+                            self.actions[i] = output[0] > 0.5
+                    if self.actions[i] and not deferred:
                         neuron.jump()
 
-                    self.gens[i].fitness += 0.1
+                    if first_alive is None:
+                        first_alive = neuron
 
-                if not self.neurons:
+                if not self.alive_count:
+                    self.write_fitness()
                     self.game_is_on = False
                     return
 
-                self.score = self.neurons[0].get_score()
+                if deferred:
+                    outputs = self.recurrent.step(self.recurrent_inputs).tolist()
+                    for i, index in enumerate(self.active):
+                        if self.alive[i]:
+                            self.actions[i] = outputs[index] > 0.5
+                            if self.actions[i]:
+                                self.neurons[i].jump()
+
+                self.frame += 1
+                self.score = first_alive.get_score()
                 if self.score != prev_score:
-                    for gen in self.gens:
-                        gen.fitness += 5
+                    self.score_event_count += 1
+
+                if self.dead_count > config.COMPACT_THRESHOLD * len(self.neurons):
+                    self.compact()
 
             
-            if config.AI:
-                ai_update()
-                if self.game_is_on == False:
+            '''
+            Fixed timestep
+            '''
+            def step():
+                '''
+                Runs one simulation step and returns False once the generation is over.
+                '''
+                self.sim_clock.advance()
+                update()
+                if config.AI:
+                    ai_update()
+                    if self.game_is_on == False:
+                        return False
+                    if self.dashboard:
+                        self.dashboard.record_step(self.alive_count, self.sim_clock.get_ticks())
+                self.step_count += 1
+                if config.MAX_GENERATION_STEPS and self.step_count >= config.MAX_GENERATION_STEPS:
+                    self.write_fitness()
+                    self.game_is_on = False
+                    return False
+                return True
+            
+            # The simulation runs free in its own thread and the window shows its
+            # latest snapshot, so presenting frames can not slow training down.
+            if config.THREADED_RENDER and not config.HEADLESS:
+                self.render_threaded(step)
+                break
+            
+            # Headless runs do not wait for the wall clock, they just simulate.
+            steps = self.timestep.steps_per_render if config.HEADLESS else self.timestep.advance(self.elapsed)
+            for _ in range(steps):
+                if not step():
                     break
+            if self.game_is_on == False:
+                break
+            if config.HEADLESS:
+                continue
             
             '''
             Draw
@@ -653,15 +1327,29 @@ class MainAI(Main):
                 '''
                 Draws all game objects onto the game screen.
 
-                This includes the background, each neuron (AI player), the pipes, and the GUI.
+                This includes the background, each neuron (AI player) or the density view, the pipes, and the GUI.
                 '''
                 self.screen.fill((0, 0, 0))
                 self.background.draw(self.screen)
-                for neuron in self.neurons:
-                    neuron.draw(self.screen)
+                if self.density_band:
+                    counts, birds = self.density_birds()
+                    self.density_band.draw(self.screen, counts)
+                    for neuron in birds:
+                        neuron.draw(self.screen)
+                else:
+                    if self.accelerator:
+                        self.alive = self.accelerator.sync(self.neurons)
+                    for neuron, is_alive in zip(self.neurons, self.alive):
+                        if is_alive:
+                            neuron.draw(self.screen)
                 self.pipe_manager.draw(self.screen)
+                # alive birds all pass the same pipes on the same ticks, so
+                # self.score is the best score of the population
+                self.gui.update_score(self.score)
                 self.gui.draw(self.screen)
             draw()
+            if self.recorder:
+                self.recorder.capture(self.screen)
             
             
             '''
@@ -670,7 +1358,7 @@ class MainAI(Main):
             scaled_surface = pygame.transform.scale(self.screen, self.window.get_size())
             self.window.blit(scaled_surface, (0, 0))
             pygame.display.flip()
-            self.clock.tick(config.FPS)
+            self.elapsed = self.clock.tick(config.FPS)
 
 
 
@@ -690,16 +1378,20 @@ def main_ai(genomes, config_file):
     game.game_loop()
 
 
-def run(config_path):
+def run(config_path, generations=50):
     """
     Runs the AI version of the game with the given NEAT configuration file.
 
     Parameters:
     config_path (str): The path to the NEAT configuration file.
+    generations (int): The maximum number of generations.
 
     This function creates a NEAT population with the given configuration, adds the
-    standard reporters (StdOutReporter and StatisticsReporter), and runs the population
-    for 50 generations, calling the main_ai function for each generation.
+    standard output reporter, a StreamingStatisticsReporter and with config.MEMORY_REPORT
+    a MemoryReporter, and runs the population
+    for the given number of generations, calling the main_ai function for each generation. The winning
+    genome is exported as a standalone policy to config.POLICY_PATH. With
+    config.ISLANDS > 1 the populations evolve as islands instead, see AI/scripts/Islands.py.
     """
     config_file = neat.config.Config(neat.DefaultGenome, 
                                 neat.DefaultReproduction, 
@@ -707,10 +1399,36 @@ def run(config_path):
                                 neat.DefaultStagnation, 
                                 config_path)
 
+    if config.ISLANDS > 1:
+        winner = run_islands(config_path, generations=generations, seed=config.COURSE_SEED or 0)
+        export_policy(neat.nn.FeedForwardNetwork.create(winner, config_file), config.POLICY_PATH)
+        print(f'[Champion policy saved to {config.POLICY_PATH}]')
+        return
+
     population = neat.Population(config_file)
     population.add_reporter(neat.StdOutReporter(True))
-    population.add_reporter(neat.StatisticsReporter())
-    winner = population.run(main_ai, 50)
+    statistics = StreamingStatisticsReporter(config.STATISTICS_PATH, config.STATISTICS_TAIL)
+    population.add_reporter(statistics)
+    if config.MEMORY_REPORT:
+        memory = MemoryReporter(config.MEMORY_REPORT_PATH, config.MEMORY_TOP_MODULES)
+        population.add_reporter(memory)
+    if config.DASHBOARD:
+        population.add_reporter(DashboardReporter())
+        Dashboard().start()
+    if config.CHECKPOINT_INTERVAL:
+        os.makedirs(os.path.dirname(config.CHECKPOINT_PREFIX), exist_ok=True)
+        population.add_reporter(neat.Checkpointer(config.CHECKPOINT_INTERVAL, filename_prefix=config.CHECKPOINT_PREFIX))
+    try:
+        winner = population.run(main_ai, generations)
+    finally:
+        # the column files are closed however training ends
+        statistics.close()
+        if config.MEMORY_REPORT:
+            memory.close()
+        if config.RECORD:
+            Recorder().close()
+    export_policy(neat.nn.FeedForwardNetwork.create(winner, config_file), config.POLICY_PATH)
+    print(f'[Champion policy saved to {config.POLICY_PATH}]')
 
 if __name__ == "__main__":
     if config.AI:
@@ -0,0 +1,270 @@
+import pygame
+import random
+import math
+import config.config as config
+from scripts.Assets import Assets
+from scripts.SimClock import SimClock
+
+
+class AgentSprite:
+    """
+    Render-only state of an Agent.
+
+    Holds the animation counter and the tinted animation frames of a bird.
+    It is only created the first time the bird is drawn, and frames are only
+    tinted when they are first shown.
+    """
+    __slots__ = ('index', 'index_counter', 'frames')
+
+    def __init__(self):
+        """
+        Initializes the animation counter and an empty frame cache.
+        """
+        self.index = 0
+        self.index_counter = 0
+        self.frames = [None] * (Agent.MAX_INDEX + 1)
+
+    def next_frame(self, color):
+        """
+        Advances the animation and returns the tinted frame to show.
+
+        Args:
+            color (tuple): The RGBA color the frame is multiplied with.
+
+        Returns:
+            pygame.Surface: The tinted animation frame.
+        """
+        self.index_counter += Agent.ANIMATION_SPEED
+        if self.index_counter > Agent.MAX_INDEX + 0.95:
+            self.index_counter = 0
+            self.index = 0
+        else:
+            self.index = math.floor(self.index_counter)
+
+        frame = self.frames[self.index]
+        if frame is None:
+            frame = Assets().assets['player'][self.index].copy()
+            frame.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            self.frames[self.index] = frame
+        return frame
+
+
+class Agent:
+    """
+    Lightweight simulation record of a single bird for AI training.
+
+    Follows the same rules as Player (gravity, jump and score cooldowns,
+    pipe collisions and the out-of-bounds check) but keeps only the
+    simulation state in `__slots__`. Constants shared by all birds live on
+    the class, collisions are computed without per-bird pygame.Rect objects
+    and everything needed for drawing is kept in an AgentSprite that only
+    exists for birds that are actually drawn.
+    """
+    __slots__ = (
+        'y', 'velocity', 'can_jump', 'jump_cooldown_timer', 'score', 'collision',
+        'collision_cooldown_timer', 'hit', 'score_cooldown_timer', 'can_add_score',
+        'distance_to_pipe', 'distance_to_pipe_only_x', 'gap_y_center', 'rel_y_to_gap',
+        'real_y', 'red', 'green', 'blue', 'sprite'
+    )
+
+    '''
+    Constants
+    '''
+    GRAVITY = 0.1
+    FORCE = 5
+    MAX_VELOCITY = 2
+    CAN_JUMP_COOLDOWN = 500
+    COLLISION_COOLDOWN = 500
+    ANIMATION_SPEED = 0.5
+    DRAW_COLLIDER = False
+
+    # Loaded from the player sprite and config.FPS by load_constants()
+    CAN_JUMP_TICKS = None
+    COLLISION_TICKS = None
+    COLLIDER_WIDTH = None
+    COLLIDER_HEIGHT = None
+    MAX_INDEX = None
+    X = None
+    START_Y = None
+    CLOCK = None
+
+    @classmethod
+    def load_constants(cls):
+        """
+        Reads the sprite dependent constants shared by every agent.
+
+        The player sprite determines the collider size and the number of
+        animation frames; the bird column and the start height follow from
+        them exactly as they do for Player. Cooldowns read the SimClock and
+        are counted in its steps.
+        """
+        player = Assets().assets['player']
+        cls.COLLIDER_WIDTH = player[0].get_width()
+        cls.COLLIDER_HEIGHT = player[0].get_height()
+        cls.MAX_INDEX = len(player) - 1
+        cls.X = config.WIDTH // 6 - cls.COLLIDER_WIDTH // 2
+        cls.START_Y = config.HEIGHT // 2 - cls.COLLIDER_HEIGHT // 2
+        cls.CLOCK = SimClock()
+        cls.CAN_JUMP_TICKS = SimClock.to_ticks(cls.CAN_JUMP_COOLDOWN)
+        cls.COLLISION_TICKS = SimClock.to_ticks(cls.COLLISION_COOLDOWN)
+
+    def __init__(self):
+        """
+        Initialize the Agent at the start position with a random tint.
+        """
+        if Agent.COLLIDER_WIDTH is None:
+            Agent.load_constants()
+
+        self.distance_to_pipe = 0
+        self.distance_to_pipe_only_x = 0
+        self.gap_y_center = 0
+        self.rel_y_to_gap = 0
+        self.collision_cooldown_timer = self.CLOCK.get_ticks()
+        self.reset()
+        self.real_y = self.y + self.COLLIDER_HEIGHT // 2
+
+    def get_score(self):
+        """
+        Returns the current score of the agent
+
+        Returns:
+            int: The current score of the agent
+        """
+        return self.score
+
+    def jump(self):
+        """
+        Makes the agent jump if its jump cooldown allows it.
+        """
+        if self.can_jump:
+            self.velocity -= self.FORCE
+            self.can_jump = False
+
+    def get_stored_data(self):
+        """
+        Returns the sensory data of the agent from its last update.
+
+        The list is built on request instead of being stored every frame.
+
+        Returns:
+            list: [y, velocity, score, collision, distance_to_pipe, distance_to_pipe_only_x, gap_y_center, rel_y_to_gap]
+        """
+        return [self.real_y, self.velocity, self.score, self.collision, self.distance_to_pipe, self.distance_to_pipe_only_x, self.gap_y_center, self.rel_y_to_gap]
+
+    def print_data(self):
+        """
+        Prints the current data of the agent to the console.
+        """
+        print(f'[Player data: y: {self.real_y}, velocity: {self.velocity}, score: {self.score}, collision: {self.collision}, distance to pipe: {self.distance_to_pipe}, distance to pipe only x: {self.distance_to_pipe_only_x}, gap y center: {self.gap_y_center}, rel y to gap: {self.rel_y_to_gap}]')
+
+    def recolor(self):
+        """
+        Picks a new random tint and drops the frames tinted with the old one.
+        """
+        self.red = random.randint(0,255)
+        self.green = random.randint(0,255)
+        self.blue = random.randint(0,255)
+        self.sprite = None
+
+    def reset(self):
+        """
+        Resets the agent to its initial state and gives it a new tint.
+        """
+        self.y = self.START_Y
+        self.velocity = 0
+        self.can_jump = True
+        self.jump_cooldown_timer = self.CLOCK.get_ticks()
+        self.score = 0
+        self.collision = False
+        self.hit = False
+        self.score_cooldown_timer = self.CLOCK.get_ticks()
+        self.can_add_score = True
+        self.recolor()
+
+    def update(self, observation):
+        """
+        Advances the agent by one frame.
+
+        Computes the y dependent sensory data on top of the shared pipe terms,
+        applies gravity, checks pipe collisions, scoring and the screen bounds
+        with the same rules as Player.update.
+
+        Args:
+            observation (Observation): The shared pipe terms from PipeManager.get_observation.
+
+        Returns:
+            bool: The collision status.
+        """
+        ticks = self.CLOCK.get_ticks()
+        half_height = self.COLLIDER_HEIGHT // 2
+
+        self.collision = False
+        self.distance_to_pipe_only_x = observation.distance_to_pipe_only_x
+        self.gap_y_center = observation.gap_y_center
+        player_center_y = self.y + half_height
+        dy = self.gap_y_center - player_center_y
+        self.real_y = player_center_y
+
+        self.distance_to_pipe = math.sqrt(observation.distance_x_squared + dy**2)
+        self.rel_y_to_gap = player_center_y - self.gap_y_center
+
+        if self.hit:
+            if ticks - self.collision_cooldown_timer > self.COLLISION_TICKS:
+                self.hit = False
+                self.collision_cooldown_timer = ticks
+
+        if ticks - self.score_cooldown_timer > self.COLLISION_TICKS:
+            self.score_cooldown_timer = ticks
+            self.can_add_score = True
+
+        self.velocity += self.GRAVITY
+        if self.velocity > self.MAX_VELOCITY:
+            self.velocity = self.MAX_VELOCITY
+        if self.velocity < -self.MAX_VELOCITY:
+            self.velocity = -self.MAX_VELOCITY
+        self.y += self.velocity
+
+        if not self.hit:
+            # pygame.Rect rounds half away from zero when given a float
+            top = int(self.y + 0.5) if self.y >= 0 else -int(0.5 - self.y)
+            left = self.X
+            width = observation.pipe_width
+            height = observation.pipe_height
+            for pipe_x, pipe_y in ((observation.top_x, observation.top_y), (observation.bottom_x, observation.bottom_y)):
+                if (left < pipe_x + width and pipe_x < left + self.COLLIDER_WIDTH and
+                        top < pipe_y + height and pipe_y < top + self.COLLIDER_HEIGHT):
+                    self.collision = True
+                    self.hit = True
+                    break
+
+        if self.can_add_score:
+            if observation.top_x < self.X < observation.top_x + observation.pipe_width:
+                self.score += 1
+                self.score_cooldown_timer = ticks
+                self.can_add_score = False
+
+        if self.y > config.HEIGHT - half_height or self.y < 0 - half_height:
+            self.collision = True
+
+        if ticks - self.jump_cooldown_timer > self.CAN_JUMP_TICKS:
+            self.can_jump = True
+            self.jump_cooldown_timer = ticks
+
+        if config.PRINT_DATA:
+            self.print_data()
+
+        return self.collision
+
+    def draw(self, screen):
+        """
+        Renders the agent, tinting its animation frames on first use.
+
+        Args:
+            screen (pygame.Surface): The surface to draw the agent onto
+        """
+        if self.sprite is None:
+            self.sprite = AgentSprite()
+        frame = self.sprite.next_frame((self.red, self.green, self.blue, 255))
+        screen.blit(frame, (self.X, self.y))
+        if self.DRAW_COLLIDER:
+            pygame.draw.rect(screen, (255, 0, 0), (self.X, self.y, self.COLLIDER_WIDTH, self.COLLIDER_HEIGHT), 1)
@@ -0,0 +1,120 @@
+import numpy as np
+import pygame
+
+'''
+Density view
+
+#? RENDER_MODE = 'density' -> the alive birds are drawn as one heatmap band in the bird column
+# Every screen row of the band is colored by how many bird centers are in it
+# (log scaled, empty rows stay transparent); the rows are counted with one
+# np.bincount. Only the DENSITY_TOP_K birds closest to the center of the gap
+# are drawn as sprites on top, so drawing costs the same for any population.
+'''
+RENDER_MODES = ('sprites', 'density')
+#? Colormap anchors from few (dark purple) to many (pale yellow) birds per row
+COLORMAP = [
+    (0.0, (40, 11, 84)),
+    (0.35, (140, 41, 129)),
+    (0.65, (229, 92, 48)),
+    (1.0, (252, 255, 164)),
+]
+
+
+def build_colormap(size=256):
+    """
+    Interpolates the COLORMAP anchors into a lookup table.
+
+    Args:
+        size (int): The number of entries.
+
+    Returns:
+        np.ndarray: (size, 3) uint8 RGB colors.
+    """
+    positions = np.linspace(0.0, 1.0, size)
+    stops = [stop for stop, _ in COLORMAP]
+    return np.stack([
+        np.interp(positions, stops, [color[channel] for _, color in COLORMAP])
+        for channel in range(3)
+    ], axis=1).astype(np.uint8)
+
+
+def histogram(ys, bird_height, height):
+    """
+    Counts the alive birds per screen row by the row of their center.
+
+    Args:
+        ys (np.ndarray): The y of every alive bird.
+        bird_height (int): The height of the bird sprite.
+        height (int): The number of screen rows.
+
+    Returns:
+        np.ndarray: (height,) int64 bird count per row.
+    """
+    rows = np.clip(np.asarray(ys) + bird_height // 2, 0, height - 1).astype(np.intp)
+    return np.bincount(rows, minlength=height)
+
+
+def closest_to_gap(ys, gap_y_center, bird_height, k):
+    """
+    Picks the birds whose center is closest to the center of the gap.
+
+    Args:
+        ys (np.ndarray): The y of every alive bird.
+        gap_y_center (float): The y of the center of the gap the birds fly at.
+        bird_height (int): The height of the bird sprite.
+        k (int): How many birds to pick.
+
+    Returns:
+        np.ndarray: Indices into ys, the closest bird first.
+    """
+    distance = np.abs(np.asarray(ys) + bird_height // 2 - gap_y_center)
+    if k <= 0 or not len(distance):
+        return np.zeros(0, dtype=np.intp)
+    if k < len(distance):
+        closest = np.argpartition(distance, k - 1)[:k]
+    else:
+        closest = np.arange(len(distance))
+    return closest[np.argsort(distance[closest], kind='stable')]
+
+
+class DensityBand:
+    """
+    Draws per-row bird counts as a color-mapped band in the bird column.
+
+    The band is one surface of the bird width and the screen height that is
+    recolored in place, so a frame costs the same for any number of birds.
+    """
+    def __init__(self, x, width, height):
+        """
+        Initializes the band surface and the colormap.
+
+        Args:
+            x (int): The x position of the bird column.
+            width (int): The width of the band, the bird sprite width.
+            height (int): The screen height, one bin per row.
+        """
+        self.x = x
+        self.colormap = build_colormap()
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    def draw(self, screen, counts):
+        """
+        Recolors the band from the row counts and draws it.
+
+        Args:
+            screen (pygame.Surface): The native resolution game screen.
+            counts (np.ndarray): The bird count of every row, from histogram.
+        """
+        peak = counts.max() if len(counts) else 0
+        scale = np.log1p(counts) / np.log1p(peak) if peak else np.zeros(len(counts))
+        colors = self.colormap[(scale * (len(self.colormap) - 1)).astype(np.intp)]
+        alpha = np.where(counts > 0, 96 + scale * 159, 0).astype(np.uint8)
+
+        # surfarray views are indexed [x, y], every column of the band is the same
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[:] = colors[np.newaxis]
+        del pixels
+        alphas = pygame.surfarray.pixels_alpha(self.surface)
+        alphas[:] = alpha[np.newaxis]
+        del alphas
+        screen.blit(self.surface, (self.x, 0))
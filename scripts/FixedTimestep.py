@@ -0,0 +1,44 @@
+class FixedTimestep:
+    """
+    Fixed-timestep accumulator that decouples simulation from rendering.
+
+    Every rendered frame adds the real time it took, scaled by
+    `steps_per_render`, to an accumulator which is then spent in whole
+    simulation steps of `dt` milliseconds. At the target frame rate this runs
+    `steps_per_render` steps per frame, and slow frames are caught up by
+    running more steps (at most `max_steps`) instead of stretching the step.
+    """
+    def __init__(self, dt, steps_per_render=1, max_steps=None):
+        """
+        Initializes the accumulator.
+
+        Args:
+            dt (float): The length of one simulation step in milliseconds.
+            steps_per_render (int): Simulation steps per frame at the target frame rate.
+            max_steps (int): Upper bound of steps run for one frame. Defaults to
+                four times `steps_per_render`.
+        """
+        self.dt = dt
+        self.steps_per_render = steps_per_render
+        self.max_steps = max_steps if max_steps is not None else 4 * steps_per_render
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """
+        Adds the real time of the last frame and returns the steps to run.
+
+        Args:
+            elapsed (float): Milliseconds since the previous rendered frame.
+
+        Returns:
+            int: The number of simulation steps to run before the next render.
+        """
+        self.accumulator += elapsed * self.steps_per_render
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            # Too far behind, drop the backlog rather than spiral further behind.
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
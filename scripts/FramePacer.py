@@ -0,0 +1,146 @@
+import time
+from collections import deque
+import pygame
+
+'''
+Frame pacing
+
+#? 'tick' -> pygame.time.Clock.tick after presenting, low resolution sleep (the old behaviour)
+#? 'sleep' -> time.sleep until the frame deadline
+#? 'busy' -> spins on time.perf_counter until the frame deadline, exact but keeps one core busy
+#? 'hybrid' -> sleeps until spin_ms before the deadline and spins the rest
+# Except for 'tick' the pacer also waits *before* input is read, until the frame
+# deadline minus the time a frame usually takes, so input is sampled as late
+# as possible and presented right at the deadline.
+'''
+MODES = ('tick', 'sleep', 'busy', 'hybrid')
+
+
+def percentile(values, fraction):
+    """
+    Returns a percentile of some values by the nearest rank.
+
+    Args:
+        values (iterable): The samples.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, 0.0 without samples.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+class FramePacer:
+    """
+    Paces the manual game loop to a fixed frame rate and measures it.
+
+    Call `wait_for_input` before reading input and `present` instead of
+    pygame.display.flip. Frame times (present to present) and input-to-present
+    latencies are kept for the last `window` frames.
+    """
+    def __init__(self, fps, mode='hybrid', spin_ms=2.0, vsync=False, window=600):
+        """
+        Initializes the pacer.
+
+        Args:
+            fps (int): The target frame rate.
+            mode (str): One of MODES.
+            spin_ms (float): Milliseconds spun before a deadline in 'hybrid' mode.
+            vsync (bool): Whether pygame.display.flip already waits for the display.
+            window (int): Frames kept for the statistics.
+
+        Raises:
+            ValueError: If mode is not a known mode.
+        """
+        if mode not in MODES:
+            raise ValueError(f'Unknown FRAME_PACING {mode!r}, expected one of {MODES}')
+        self.mode = mode
+        self.period = 1.0 / fps
+        self.spin = spin_ms / 1000.0
+        self.vsync = vsync
+        self.clock = pygame.time.Clock()
+
+        # time an input sample usually needs until it is ready to present
+        self.work = 0.0
+        self.deadline = None
+        self.input_time = None
+        self.last_present = None
+        self.frame_times = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)
+        self.missed = 0
+        self.frames = 0
+
+    def _wait_until(self, target):
+        """
+        Blocks until a perf_counter time with the configured mode.
+
+        Args:
+            target (float): The time.perf_counter value to wait for.
+        """
+        if self.mode == 'hybrid':
+            remaining = target - time.perf_counter() - self.spin
+            if remaining > 0:
+                time.sleep(remaining)
+        elif self.mode == 'sleep':
+            remaining = target - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            return
+        while time.perf_counter() < target:
+            pass
+
+    def wait_for_input(self):
+        """
+        Waits until input has to be read to make the next deadline.
+        """
+        if self.mode != 'tick' and self.deadline is not None:
+            # half the usual frame work again is left as a margin for slow frames
+            self._wait_until(self.deadline - 1.5 * self.work)
+        self.input_time = time.perf_counter()
+
+    def present(self):
+        """
+        Waits for the frame deadline, flips the display and records the frame.
+        """
+        now = time.perf_counter()
+        if self.input_time is not None:
+            self.work += 0.1 * ((now - self.input_time) - self.work)
+        if self.mode != 'tick' and not self.vsync and self.deadline is not None:
+            self._wait_until(self.deadline)
+
+        pygame.display.flip()
+        now = time.perf_counter()
+        if self.mode == 'tick':
+            self.clock.tick(round(1.0 / self.period))
+
+        if self.last_present is not None:
+            self.frame_times.append(now - self.last_present)
+        if self.input_time is not None:
+            self.latencies.append(now - self.input_time)
+        self.last_present = now
+        self.frames += 1
+
+        if self.deadline is None or now > self.deadline + self.period:
+            # first frame or a whole frame late, pace from now instead of catching up
+            if self.deadline is not None:
+                self.missed += 1
+            self.deadline = now + self.period
+        else:
+            self.deadline += self.period
+
+    def report(self):
+        """
+        Returns the frame time and latency percentiles of the recent frames.
+
+        Returns:
+            str: One line with p50/p99 frame times and input-to-present latencies in milliseconds.
+        """
+        return (f'[Frames: {self.mode}{" + vsync" if self.vsync else ""}, '
+                f'frame time p50 {1000 * percentile(self.frame_times, 0.5):.2f} ms '
+                f'p99 {1000 * percentile(self.frame_times, 0.99):.2f} ms, '
+                f'input to present p50 {1000 * percentile(self.latencies, 0.5):.2f} ms '
+                f'p99 {1000 * percentile(self.latencies, 0.99):.2f} ms, '
+                f'{self.missed} missed]')
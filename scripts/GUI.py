@@ -7,7 +7,8 @@ class GUI:
     Graphical User Interface manager for displaying the game score.
 
     Handles font initialization, score rendering, and positioning
-    of the score display on the screen.
+    of the score display on the screen. The digits are rendered once and
+    the score is composed from them, only when it actually changes.
     """
     def __init__(self):
         """
@@ -15,25 +16,50 @@ class GUI:
         its position on the screen.
 
         This constructor creates a Pygame font object for displaying the score,
-        renders the initial score to be shown, and calculates the x, y coordinates
-        to center the score on the screen.
+        renders the glyph of every digit, composes the initial score to be shown,
+        and calculates the x, y coordinates to center the score on the screen.
         """
 
         self.score = 0
         self.font = pygame.font.SysFont("arial", 26)
-        self.score_to_show = self.font.render(str(self.score), True, constants.WHITE) 
+        self.glyphs = {digit: self.font.render(digit, True, constants.WHITE) for digit in '0123456789'}
+        self.score_to_show = self.compose(self.score)
         self.x = config.WIDTH // 2 - self.score_to_show.get_width() // 2
         self.y = config.HEIGHT // 16
     
+    def compose(self, score):
+        """
+        Composes the image of a score from the cached digit glyphs.
+
+        Parameters:
+        score (int): The score to compose.
+
+        Returns:
+        pygame.Surface: The rendered score.
+        """
+        glyphs = [self.glyphs[digit] for digit in str(score)]
+        surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs),
+                                  max(glyph.get_height() for glyph in glyphs)), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+    
     def update_score(self, score):
         """
         Updates the score to be shown on the GUI.
 
+        Called once per frame with the best score; the image is only composed
+        again when the score changed.
+
         Parameters:
         score (int): The new score to be shown.
         """
+        if score == self.score:
+            return
         self.score = score
-        self.score_to_show = self.font.render(str(self.score), True, constants.WHITE)
+        self.score_to_show = self.compose(self.score)
     
     def reset(self):
         """
@@ -42,7 +68,7 @@ class GUI:
         This method is called when the player loses a life and the game is reset.
         """
         self.score = 0
-        self.score_to_show = self.font.render(str(self.score), True, constants.WHITE)
+        self.score_to_show = self.compose(self.score)
         
     def draw(self, screen):
         """
@@ -0,0 +1,369 @@
+import os
+import random
+import numpy as np
+import pygame
+from scripts.Player import Player
+from scripts.Agent import Agent
+from scripts.PipeManager import PipeManager
+from scripts.SimClock import SimClock
+
+'''
+Golden trajectories
+
+#? A trajectory is one bird flown through a seeded course with one jump input per frame
+# Every frame runs SimClock.advance(), the PipeManager updates of its path, the
+# bird update and then the jump input, and records the bird at the end of the frame.
+#? Paths, the number of PipeManager updates per frame:
+# 'game' -> 1, Main.game_loop updates the pipes once with the other objects
+# 'training' -> 2, a MainAI step updates the pipes with the other objects and
+#               again at the start of ai_update, so training pipes move twice
+#               as fast (AI.scripts.VecEnv.PIPE_UPDATES mirrors it)
+# A reference is recorded from Player for every path an engine is registered
+# on; the engine replays the same inputs and is compared field by field.
+#? through_collisions = True -> the bird is neither reset nor removed when it collides,
+# so the hit window and the out-of-bounds check keep being exercised
+# Engines that remove a bird when it dies (like the accelerator) end at their first
+# collision and are compared up to and including it.
+#? Add engines with @register('name'), see python cli.py golden --help
+'''
+PIPE_UPDATES = {'game': 1, 'training': 2}
+FIELDS = ('pipe_x', 'pipe_y', 'y', 'velocity', 'score', 'collision', 'hit', 'can_jump')
+# changed by the jump input, which a removed bird never gets in the frame it dies
+INPUT_FIELDS = ('velocity', 'can_jump')
+ENGINES = {}
+# engine name -> the path its reference is recorded on
+PATHS = {}
+
+
+def register(name, path='game'):
+    """
+    Registers an engine the harness can compare against the reference.
+
+    The engine is called as engine(seed, actions, through_collisions) and
+    returns a Trajectory.
+
+    Args:
+        name (str): The name of the engine.
+        path (str): The path the engine simulates, a key of PIPE_UPDATES.
+
+    Returns:
+        function: Decorator that registers and returns the engine unchanged.
+    """
+    def decorator(engine):
+        ENGINES[name] = engine
+        PATHS[name] = path
+        return engine
+    return decorator
+
+
+class Trajectory:
+    """
+    Per-frame record of one bird flying one course.
+
+    Every field in FIELDS is a numpy array with one value per simulated
+    frame; `actions` holds the jump input given after every frame.
+    """
+    def __init__(self, seed, actions, rows, stops_at_collision=False):
+        """
+        Initializes the trajectory from its recorded rows.
+
+        Args:
+            seed (int): The course seed.
+            actions (list): The jump input of every frame.
+            rows (list): One tuple of FIELDS values per frame.
+            stops_at_collision (bool): Whether the engine ends a bird at its first collision.
+        """
+        self.seed = seed
+        self.actions = list(actions)
+        self.stops_at_collision = stops_at_collision
+        columns = list(zip(*rows)) if rows else [()] * len(FIELDS)
+        self.columns = {field: np.array(column, dtype=np.float64) for field, column in zip(FIELDS, columns)}
+
+    def __len__(self):
+        """
+        Returns the number of recorded frames.
+
+        Returns:
+            int: The number of frames.
+        """
+        return len(self.columns['y'])
+
+    def __getitem__(self, field):
+        """
+        Returns one field of every frame.
+
+        Args:
+            field (str): One of FIELDS.
+
+        Returns:
+            np.ndarray: The field values.
+        """
+        return self.columns[field]
+
+    def collision_frames(self):
+        """
+        Returns the frames in which the bird collided.
+
+        Returns:
+            list: The frame indices.
+        """
+        return np.nonzero(self.columns['collision'])[0].tolist()
+
+
+def ensure_display():
+    """
+    Opens a hidden display if none is open, since sprites are converted on load.
+    """
+    if pygame.display.get_surface() is None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+
+def start_course(seed):
+    """
+    Rewinds the SimClock and replays the pipes of a course seed from the start.
+
+    Args:
+        seed (int): The course seed.
+
+    Returns:
+        PipeManager: The pipe manager, reset to the first pipe of the course.
+    """
+    ensure_display()
+    SimClock().reset()
+    pipe_manager = PipeManager()
+    pipe_manager.seed(seed)
+    pipe_manager.reset()
+    return pipe_manager
+
+
+def scripted_actions(frames, seed, probability=0.08):
+    """
+    Draws a reproducible random jump sequence.
+
+    Args:
+        frames (int): The number of frames.
+        seed (int): Seed of the sequence.
+        probability (float): Chance of a jump input in a frame.
+
+    Returns:
+        list: One bool per frame.
+    """
+    rng = random.Random(seed)
+    return [rng.random() < probability for _ in range(frames)]
+
+
+def move_pipes(pipe_manager, path):
+    """
+    Moves the pipes as often as one frame of a path does.
+
+    Args:
+        pipe_manager (PipeManager): The pipes of the course.
+        path (str): A key of PIPE_UPDATES.
+    """
+    for _ in range(PIPE_UPDATES[path]):
+        pipe_manager.update()
+
+
+def record_reference(seed, frames, controller, through_collisions=True, path='game'):
+    """
+    Records the reference trajectory with Player and PipeManager.
+
+    Args:
+        seed (int): The course seed.
+        frames (int): The number of frames to simulate.
+        controller (list or callable): One jump input per frame, or a function
+            that decides from the inputs in AI.scripts.Head.get_data order, e.g. Policy.decide.
+        through_collisions (bool): Keep flying after a collision instead of stopping.
+        path (str): The path to record, a key of PIPE_UPDATES.
+
+    Returns:
+        Trajectory: The reference, with the jump inputs the controller gave.
+    """
+    pipe_manager = start_course(seed)
+    observation = pipe_manager.get_observation()
+    clock = SimClock()
+    player = Player()
+    player.PRINT_DATA = False
+    player.reset()
+
+    rows, actions = [], []
+    for frame in range(frames):
+        clock.advance()
+        move_pipes(pipe_manager, path)
+        collision = player.update(observation)
+        if callable(controller):
+            data = player.get_stored_data()
+            action = bool(controller((data[0], data[4], data[5], data[6], data[7])))
+        else:
+            action = bool(controller[frame])
+        actions.append(action)
+        if action:
+            player.jump()
+        rows.append((observation.top_x, observation.top_y, player.y, player.velocity,
+                     player.score, collision, player.hit, player.can_jump))
+        if collision and not through_collisions:
+            break
+    return Trajectory(seed, actions, rows)
+
+
+@register('player')
+def player_engine(seed, actions, through_collisions):
+    """
+    Replays the inputs through Player itself, checks that the harness is deterministic.
+    """
+    return record_reference(seed, len(actions), actions, through_collisions)
+
+
+@register('agent', path='training')
+def agent_engine(seed, actions, through_collisions):
+    """
+    Replays the inputs through the slotted Agent used for training, in the order of a MainAI step.
+    """
+    pipe_manager = start_course(seed)
+    observation = pipe_manager.get_observation()
+    clock = SimClock()
+    agent = Agent()
+
+    rows = []
+    for action in actions:
+        clock.advance()
+        move_pipes(pipe_manager, 'training')
+        collision = agent.update(observation)
+        if action:
+            agent.jump()
+        rows.append((observation.top_x, observation.top_y, agent.y, agent.velocity,
+                     agent.score, collision, agent.hit, agent.can_jump))
+        if collision and not through_collisions:
+            break
+    return Trajectory(seed, actions, rows)
+
+
+@register('accelerator', path='training')
+def accelerator_engine(seed, actions, through_collisions):
+    """
+    Replays the inputs through the numba kernel, with the networks switched off.
+
+    The pipes are moved as in a MainAI step, which the kernel runs in.
+
+    The kernel removes a bird at its first collision, so the trajectory ends there.
+    """
+    import AI.scripts.Accelerator as accelerator
+    if not accelerator.AVAILABLE:
+        raise RuntimeError('numba is not installed')
+    pipe_manager = start_course(seed)
+    observation = pipe_manager.get_observation()
+    clock = SimClock()
+    agent = Agent()
+    kernel = accelerator.Accelerator([agent], [])
+
+    rows = []
+    for action in actions:
+        clock.advance()
+        move_pipes(pipe_manager, 'training')
+        kernel.action[0] = action
+        collision = kernel.step(observation, clock.get_ticks(), False) > 0
+        rows.append((observation.top_x, observation.top_y, kernel.y[0], kernel.velocity[0],
+                     kernel.score[0], collision, kernel.hit[0], kernel.can_jump[0]))
+        if collision:
+            break
+    return Trajectory(seed, actions, rows, stops_at_collision=True)
+
+
+@register('vecenv', path='training')
+def vecenv_engine(seed, actions, through_collisions):
+    """
+    Replays the inputs through a single game of the numpy VecEnv, which moves the pipes like a MainAI step.
+    """
+    from AI.scripts.VecEnv import VecEnv
+    env = VecEnv(1)
+    env.reset([seed])
+
+    rows = []
+    for action in actions:
+        collision = bool(env.advance()[0])
+        env.apply_actions([action])
+        rows.append((env.pipe_x[0], env.pipe_y[0], env.y[0], env.velocity[0],
+                     env.score[0], collision, env.hit[0], env.can_jump[0]))
+        if collision and not through_collisions:
+            break
+    return Trajectory(seed, actions, rows)
+
+
+def first_divergence(reference, candidate):
+    """
+    Finds the first frame where a candidate trajectory differs from the reference.
+
+    Values have to be exactly equal. A candidate that stops at its first
+    collision only has to match up to that frame, and in it only the fields
+    that do not depend on the jump input.
+
+    Args:
+        reference (Trajectory): The reference trajectory.
+        candidate (Trajectory): The trajectory of the engine under test.
+
+    Returns:
+        tuple: (frame, field, reference value, candidate value), or None if they match.
+    """
+    length = min(len(reference), len(candidate))
+    stopped = candidate.stops_at_collision and length and candidate['collision'][length - 1]
+    first = None
+    for field in FIELDS:
+        compared = length - 1 if stopped and field in INPUT_FIELDS else length
+        mismatches = np.nonzero(reference[field][:compared] != candidate[field][:compared])[0]
+        if len(mismatches) and (first is None or mismatches[0] < first[0]):
+            frame = int(mismatches[0])
+            first = (frame, field, reference[field][frame].item(), candidate[field][frame].item())
+    if first is not None:
+        return first
+
+    if len(candidate) != len(reference):
+        if not (stopped and len(candidate) < len(reference)):
+            return (length, 'length', len(reference), len(candidate))
+    return None
+
+
+def run_harness(seeds, frames, engines=None, controller=None, through_collisions=True):
+    """
+    Records the references of every seed and compares every engine against the one of its path.
+
+    Args:
+        seeds (list): The course seeds.
+        frames (int): Frames per trajectory.
+        engines (list): Names of registered engines, defaults to all of them.
+        controller (callable): Decides the jumps from the sensors, e.g. Policy.decide.
+            Defaults to scripted random jumps seeded with the course seed.
+        through_collisions (bool): Keep flying after collisions.
+
+    Returns:
+        dict: (engine, seed) to the first divergence or None.
+    """
+    engines = list(ENGINES) if engines is None else engines
+    results = {}
+    for seed in seeds:
+        inputs = controller if controller is not None else scripted_actions(frames, seed)
+        references = {}
+        for name in engines:
+            path = PATHS[name]
+            if path not in references:
+                reference = record_reference(seed, frames, inputs, through_collisions, path)
+                collisions = reference.collision_frames()
+                print(f'[Golden seed {seed} ({path}): {len(reference)} frames, score {int(reference["score"][-1])}, '
+                      f'{len(collisions)} collision frames, first at {collisions[0] if collisions else None}]')
+                references[path] = reference
+            reference = references[path]
+            try:
+                candidate = ENGINES[name](seed, reference.actions, through_collisions)
+            except RuntimeError as error:
+                print(f'[Golden seed {seed}: {name} skipped, {error}]')
+                continue
+            divergence = first_divergence(reference, candidate)
+            results[(name, seed)] = divergence
+            if divergence is None:
+                print(f'[Golden seed {seed}: {name} matches for {len(candidate)} frames]')
+            else:
+                frame, field, expected, actual = divergence
+                print(f'[Golden seed {seed}: {name} diverges at frame {frame} in {field}: '
+                      f'reference {expected}, {name} {actual}]')
+    return results
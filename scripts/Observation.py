@@ -0,0 +1,51 @@
+import config.config as config
+import config.constants as constants
+
+
+class Observation:
+    """
+    Pipe-derived sensor terms shared by every bird in a frame.
+
+    All birds fly in the same column, so everything that only depends on the
+    pipes (the gap center, the horizontal distance to the pipe and the pipe
+    colliders) is the same for each of them. PipeManager refreshes one
+    Observation whenever the pipes change and the birds only compute the
+    terms that depend on their own y.
+    """
+    __slots__ = (
+        'top_x', 'top_y', 'bottom_x', 'bottom_y', 'pipe_width', 'pipe_height',
+        'gap_y_center', 'distance_to_pipe_only_x', 'distance_x_squared'
+    )
+
+    def __init__(self, pipe_width, pipe_height, x, y):
+        """
+        Initializes the observation from the next pipe pair.
+
+        Args:
+            pipe_width (int): The width of a pipe collider.
+            pipe_height (int): The height of a pipe collider.
+            x (int): The x of the next pipe pair.
+            y (int): The y of its top pipe.
+        """
+        self.pipe_width = pipe_width
+        self.pipe_height = pipe_height
+        self.refresh(x, y)
+
+    def refresh(self, x, y):
+        """
+        Recomputes the shared terms from the next pipe pair.
+
+        The center of the bird column is config.WIDTH // 6 for any sprite
+        width, since birds are placed at WIDTH // 6 - width // 2.
+
+        Args:
+            x (int): The x of the next pipe pair.
+            y (int): The y of its top pipe, the bottom pipe is constants.GAP lower.
+        """
+        self.top_x = x
+        self.top_y = y
+        self.bottom_x = x
+        self.bottom_y = y + constants.GAP
+        self.gap_y_center = y + self.pipe_height + constants.GAP // 2
+        self.distance_to_pipe_only_x = (x + self.pipe_width // 2) - config.WIDTH // 6
+        self.distance_x_squared = self.distance_to_pipe_only_x**2
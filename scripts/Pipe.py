@@ -10,6 +10,9 @@ class Pipe:
     both top and bottom pipe instances. Handles automatic reset when
     moving off-screen.
     """
+    # pixels a pipe moves per simulation step, read by AI/scripts/VecEnv.py as well
+    SPEED = 1
+
     def __init__(self, y):
         """
         Initialize the Pipe at a given vertical position.
@@ -19,7 +22,6 @@ class Pipe:
         """
         self.assets = Assets()
         
-        self.SPEED = 1
         self.COLLIDER_WIDTH = self.assets.assets['pipe'][0].get_width()
         self.COLLIDER_HEIGHT = self.assets.assets['pipe'][0].get_height()
         self.DRAW_COLLIDER = False
@@ -1,6 +1,10 @@
 import random
+import numpy as np
+import config.config as config
 import config.constants as constants
+from scripts.Assets import Assets
 from scripts.Pipe import Pipe
+from scripts.Observation import Observation
 
 class PipeManager:
     """
@@ -33,12 +37,17 @@ class PipeManager:
 
         This function is called when an instance of PipeManager is created. It
         initializes the PipeManager by setting the gap between the top and
-        bottom pipes and the snap points. It also creates the first two pipes
-        with a random y-coordinate.
+        bottom pipes and the snap points. It also lays out config.PIPE_PAIRS
+        pipe pairs config.PIPE_SPACING apart, each with a random y-coordinate.
 
-        The `get_new_snap_point()` function is used to get a new y-coordinate
-        for the first pipe, and the second pipe is created with the gap
-        distance above the first pipe.
+        The pairs live in a ring buffer of x and y arrays. `head` is the pair
+        that leaves the screen next and `next` the first pair the bird column
+        has not passed yet; both only ever move forward by one, so finding the
+        pipe the birds measure and collide with is O(1) however many pairs
+        there are. The shared Observation of the next pair is created as well.
+
+        Raises:
+            ValueError: If several pairs are closer than a pipe and a bird are wide.
         """
         if getattr(self, '_initialized', False):
             return
@@ -46,9 +55,38 @@ class PipeManager:
         
         self.GAP = constants.GAP
         self.SNAP_POINTS = [-48,-32, -16, 0]
+        self.PAIRS = config.PIPE_PAIRS
+        self.SPACING = config.PIPE_SPACING
+        self.random = random
+        
+        # Pipe objects only draw the pairs, the course itself is in the arrays
+        self.pipes = []
+        for _ in range(self.PAIRS):
+            self.pipes += [Pipe(0), Pipe(self.GAP)]
+        self.SPEED = self.pipes[0].SPEED
+        self.PIPE_WIDTH = self.pipes[0].COLLIDER_WIDTH
+        self.PIPE_HEIGHT = self.pipes[0].COLLIDER_HEIGHT
+        # left edge of the bird column, a pair whose right edge is left of it is passed
+        self.BIRD_X = config.WIDTH // 6 - Assets().assets['player'][0].get_width() // 2
+        if self.PAIRS > 1 and self.SPACING < self.PIPE_WIDTH + Assets().assets['player'][0].get_width():
+            raise ValueError(f'PIPE_SPACING {self.SPACING} is less than a pipe and a bird wide')
         
-        y = self.get_new_snap_point()
-        self.pipes = [Pipe(y), Pipe(y + self.GAP)]
+        self.xs = np.zeros(self.PAIRS, dtype=np.int64)
+        self.ys = np.zeros(self.PAIRS, dtype=np.int64)
+        self.head = 0
+        self.next = 0
+        self.layout()
+        self.observation = Observation(self.PIPE_WIDTH, self.PIPE_HEIGHT, int(self.xs[0]), int(self.ys[0]))
+
+    def layout(self):
+        """
+        Places every pair at the right edge of the screen, PIPE_SPACING apart, with new heights.
+        """
+        for pair in range(self.PAIRS):
+            self.xs[pair] = config.WIDTH + pair * self.SPACING
+            self.ys[pair] = self.get_new_snap_point()
+        self.head = 0
+        self.next = 0
 
     def get_new_snap_point(self):
         """
@@ -60,66 +98,98 @@ class PipeManager:
         Returns:
             int: The new y-coordinate for the next pipe.
         """
-        return random.choice(self.SNAP_POINTS)
+        return self.random.choice(self.SNAP_POINTS)
+    
+    def seed(self, seed):
+        """
+        Gives the pipes their own random generator so the course can be replayed.
+
+        The same seed always produces the same sequence of pipe heights,
+        independently of any other use of the random module.
+
+        Args:
+            seed (int): The course seed, or None to go back to the shared random module.
+        """
+        self.random = random if seed is None else random.Random(seed)
     
     def get_pipes(self):
         """
         Gets the list of all pipes.
 
-        This function returns the list of all pipes created by the
-        PipeManager.
+        This function moves the Pipe objects to the current course and returns
+        them, a top and a bottom pipe per pair. It costs O(PIPE_PAIRS), so it
+        is meant for drawing, the simulation reads get_observation instead.
 
         Returns:
             list: A list of Pipe objects.
         """
+        for pair, (x, y) in enumerate(zip(self.xs.tolist(), self.ys.tolist())):
+            top, bottom = self.pipes[2 * pair], self.pipes[2 * pair + 1]
+            top.x = bottom.x = x
+            top.set_y(y)
+            bottom.set_y(y + self.GAP)
         return self.pipes
     
+    def get_observation(self):
+        """
+        Gets the pipe-derived sensor terms shared by every bird.
+
+        The same Observation object is refreshed in place whenever the pipes
+        change, so it can be fetched once and kept.
+
+        Returns:
+            Observation: The shared observation of the current pipes.
+        """
+        return self.observation
+    
     def reset(self):
         """
         Resets the position of the pipes.
 
-        This function generates a new y-coordinate for the first pipe using
-        the `get_new_snap_point` method and resets the position of both pipes.
-        The second pipe is positioned at a distance specified by `GAP` above 
-        the first pipe.
+        This function lays the pairs out at the right edge of the screen
+        again with new y-coordinates from `get_new_snap_point`.
         """
 
-        y = self.get_new_snap_point()
-        self.pipes[0].reset(y)
-        self.pipes[1].reset(y + self.GAP)
+        self.layout()
+        self.observation.refresh(int(self.xs[0]), int(self.ys[0]))
 
         
     def update(self):
         """
         Updates the position of the pipes.
 
-        This function iterates over all pipes and updates them. If the first
-        pipe is off the screen, it resets the position of both pipes and
-        generates a new y-coordinate for the first pipe, positioning the
-        second pipe at a distance specified by `GAP` above the first pipe.
-        """
-        if self.pipes:
-            for pipe in self.pipes:
-                pipe.update()
-            
-            if self.pipes[0].check_off_screen():
-                self.pipes[0].reset_x()
-                self.pipes[1].reset_x()
-                
-                new_y = self.get_new_snap_point()
-                
-                self.pipes[0].set_y(new_y)
-                self.pipes[1].set_y(new_y + self.GAP)
+        This function moves every pair to the left. If the pair at the head of
+        the ring is off the screen, it is moved PIPE_SPACING behind the last
+        pair (but not onto the screen) with a new y-coordinate from
+        `get_new_snap_point`. Once the next pair is passed by the bird column
+        the following one becomes the next pair. The shared Observation is
+        refreshed with the next pair afterwards.
+        """
+        xs = self.xs
+        xs -= self.SPEED
+        
+        head = self.head
+        if xs[head] < -self.PIPE_WIDTH:
+            if self.PAIRS > 1:
+                xs[head] = max(config.WIDTH, xs[head - 1] + self.SPACING)
+            else:
+                xs[head] = config.WIDTH
+            self.ys[head] = self.get_new_snap_point()
+            self.head = (head + 1) % self.PAIRS
+        
+        if self.PAIRS > 1 and xs[self.next] + self.PIPE_WIDTH <= self.BIRD_X:
+            self.next = (self.next + 1) % self.PAIRS
+        
+        self.observation.refresh(int(xs[self.next]), int(self.ys[self.next]))
                 
     
     def draw(self, screen):
         """
         Draws all pipes onto the game screen.
 
-        This function iterates over all pipes and calls their draw method,
-        rendering them onto the provided screen surface.
+        This function moves the Pipe objects to the current course and calls
+        their draw method, rendering them onto the provided screen surface.
         """
 
-        if self.pipes:
-            for pipe in self.pipes:
-                pipe.draw(screen)
\ No newline at end of file
+        for pipe in self.get_pipes():
+            pipe.draw(screen)
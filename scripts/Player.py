@@ -2,8 +2,8 @@ import pygame
 import random
 import math
 import config.config as config
-import config.constants as constants
 from scripts.Assets import Assets
+from scripts.SimClock import SimClock
 from AI.scripts.Head import Head
 
 class Player:
@@ -23,6 +23,7 @@ class Player:
         Assets
         '''
         self.assets = Assets()
+        self.clock = SimClock()
         
         '''
         Constants
@@ -31,6 +32,7 @@ class Player:
         self.FORCE = 5
         self.MAX_VELOCITY = 2
         self.CAN_JUMP_COOLDOWN = 500
+        self.CAN_JUMP_TICKS = SimClock.to_ticks(self.CAN_JUMP_COOLDOWN)
         self.COLLIDER_WIDTH = self.assets.assets['player'][0].get_width()
         self.COLLIDER_HEIGHT = self.assets.assets['player'][0].get_height()
         self.PRINT_DATA = config.PRINT_DATA
@@ -43,12 +45,13 @@ class Player:
         self.y = config.HEIGHT // 2 - self.assets.assets['player'][0].get_height() // 2
         self.velocity = 0
         self.can_jump = True
-        self.jump_cooldown_timer = pygame.time.get_ticks()
+        self.jump_cooldown_timer = self.clock.get_ticks()
         self.collider = pygame.Rect(self.x, self.y, self.COLLIDER_WIDTH, self.COLLIDER_HEIGHT)
         self.score = 0
         self.collision = False
-        self.collision_cooldown_timer = pygame.time.get_ticks()
+        self.collision_cooldown_timer = self.clock.get_ticks()
         self.collision_cooldown = 500
+        self.collision_cooldown_ticks = SimClock.to_ticks(self.collision_cooldown)
         self.hit = False
         self.sprite = self.assets.assets['player']
         self.distance_to_pipe = 0
@@ -90,6 +93,17 @@ class Player:
             self.velocity -= self.FORCE 
             self.can_jump = False
     
+    def store_data(self):
+        """
+        Stores the current data of the player in the stored_data attribute.
+
+        The data includes the player's y position, velocity, score, collision
+        status, distance to the next pipe, distance to the next pipe only in
+        the x direction, y center of the gap of the next pipe, and relative y
+        position to the gap of the next pipe.
+        """
+        self.stored_data = [self.real_y, self.velocity, self.score, self.collision, self.distance_to_pipe, self.distance_to_pipe_only_x, self.gap_y_center, self.rel_y_to_gap]
+    
     def print_data(self):
         """
         Prints the current data of the player to the console.
@@ -101,7 +115,7 @@ class Player:
         only in the x direction, y center of the gap of the next pipe,
         and relative y position to the gap of the next pipe.
         """
-        self.stored_data = [self.real_y, self.velocity, self.score, self.collision, self.distance_to_pipe, self.distance_to_pipe_only_x, self.gap_y_center, self.rel_y_to_gap]
+        self.store_data()
         print(f'[Player data: y: {self.real_y}, velocity: {self.velocity}, score: {self.score}, collision: {self.collision}, distance to pipe: {self.distance_to_pipe}, distance to pipe only x: {self.distance_to_pipe_only_x}, gap y center: {self.gap_y_center}, rel y to gap: {self.rel_y_to_gap}]')
     
     def get_stored_data(self):
@@ -155,41 +169,41 @@ class Player:
         self.y = config.HEIGHT // 2 - self.assets.assets['player'][0].get_height() // 2
         self.velocity = 0
         self.can_jump = True
-        self.jump_cooldown_timer = pygame.time.get_ticks()
+        self.jump_cooldown_timer = self.clock.get_ticks()
         self.score = 0
         self.collision = False
         self.hit = False
-        self.score_cooldown_timer = pygame.time.get_ticks()
+        self.score_cooldown_timer = self.clock.get_ticks()
         self.can_add_score = True
         self.recolor()
         
-    def update(self, pipes, gui):
+    def update(self, observation):
         """
         Updates the player's state and handles interactions with pipes.
 
         This function updates the player's position, velocity, and animation. It calculates
-        the distance to the nearest pipe and adjusts the player's y position based on gravity.
-        It checks for collisions with pipes and updates the player's score and GUI accordingly.
+        the distance to the nearest pipe from the pipe terms shared by every bird in the
+        observation and adjusts the player's y position based on gravity.
+        It checks for collisions with pipes and updates the player's score accordingly; the GUI
+        reads the score once per frame.
         The function also manages cooldowns for jumping and scoring, and prints the player's
         data if configured to do so.
 
         Args:
-            pipes (list): A list of pipe objects to interact with.
-            gui (GUI): The GUI object to update the score display.
+            observation (Observation): The shared pipe terms from PipeManager.get_observation.
 
         Returns:
-            tuple: A tuple containing the collision status (bool) and the updated GUI object.
+            bool: The collision status.
         """
 
         self.collision = False
-        self.distance_to_pipe_only_x = (pipes[0].x + pipes[0].COLLIDER_WIDTH // 2) - (self.x + self.collider.width // 2)
-        pipe_center_y = pipes[0].y + pipes[0].COLLIDER_HEIGHT + constants.GAP // 2
+        self.distance_to_pipe_only_x = observation.distance_to_pipe_only_x
+        self.gap_y_center = observation.gap_y_center
         player_center_y = self.y + self.collider.height // 2
-        dy = pipe_center_y - player_center_y
+        dy = self.gap_y_center - player_center_y
         self.real_y = self.y + self.COLLIDER_HEIGHT // 2
 
-        self.distance_to_pipe = math.sqrt(self.distance_to_pipe_only_x**2 + dy**2)
-        self.gap_y_center = pipes[0].y + pipes[0].COLLIDER_HEIGHT + constants.GAP // 2
+        self.distance_to_pipe = math.sqrt(observation.distance_x_squared + dy**2)
         
         self.index_counter += self.animation_speed
         if self.index_counter > self.max_index + 0.95:
@@ -204,12 +218,12 @@ class Player:
 
         
         if self.hit:
-            if pygame.time.get_ticks() - self.collision_cooldown_timer > self.collision_cooldown:
+            if self.clock.get_ticks() - self.collision_cooldown_timer > self.collision_cooldown_ticks:
                 self.hit = False
-                self.collision_cooldown_timer = pygame.time.get_ticks()
+                self.collision_cooldown_timer = self.clock.get_ticks()
         
-        if pygame.time.get_ticks() - self.score_cooldown_timer > self.collision_cooldown:
-            self.score_cooldown_timer = pygame.time.get_ticks()
+        if self.clock.get_ticks() - self.score_cooldown_timer > self.collision_cooldown_ticks:
+            self.score_cooldown_timer = self.clock.get_ticks()
             self.can_add_score = True
         
         self.velocity += self.GRAVITY
@@ -221,33 +235,33 @@ class Player:
         
         self.collider.topleft = (self.x, self.y)
         if not self.hit:
-            if pipes:
-                pipe_one_collieder = pygame.Rect(pipes[0].x, pipes[0].y, pipes[0].COLLIDER_WIDTH, pipes[0].COLLIDER_HEIGHT)
-                pipe_two_collieder = pygame.Rect(pipes[1].x, pipes[1].y, pipes[1].COLLIDER_WIDTH, pipes[1].COLLIDER_HEIGHT)
-                if self.collider.colliderect(pipe_one_collieder) or self.collider.colliderect(pipe_two_collieder):
-                    self.collision = True
-                    self.hit = True
+            pipe_one_collieder = pygame.Rect(observation.top_x, observation.top_y, observation.pipe_width, observation.pipe_height)
+            pipe_two_collieder = pygame.Rect(observation.bottom_x, observation.bottom_y, observation.pipe_width, observation.pipe_height)
+            if self.collider.colliderect(pipe_one_collieder) or self.collider.colliderect(pipe_two_collieder):
+                self.collision = True
+                self.hit = True
             
         if self.can_add_score:
-            if pipes[0].x < self.x < pipes[0].x + pipes[0].COLLIDER_WIDTH:
+            if observation.top_x < self.x < observation.top_x + observation.pipe_width:
                 self.score += 1
-                gui.update_score(self.score)
-                self.score_cooldown_timer = pygame.time.get_ticks()
+                self.score_cooldown_timer = self.clock.get_ticks()
                 self.can_add_score = False
         
         
         if self.y > config.HEIGHT - self.COLLIDER_HEIGHT//2 or self.y < 0 - self.COLLIDER_HEIGHT//2:
             self.collision = True
         
-        if pygame.time.get_ticks() - self.jump_cooldown_timer > self.CAN_JUMP_COOLDOWN:
+        if self.clock.get_ticks() - self.jump_cooldown_timer > self.CAN_JUMP_TICKS:
             self.can_jump = True
-            self.jump_cooldown_timer = pygame.time.get_ticks()
+            self.jump_cooldown_timer = self.clock.get_ticks()
         
         if self.PRINT_DATA:
             self.print_data()
+        else:
+            self.store_data()
         
         
-        return self.collision, gui
+        return self.collision
         
     def draw(self, screen):
         """
@@ -0,0 +1,181 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import pygame
+import config.config as config
+
+'''
+Recording
+
+#? RECORD_PATH ending in .mp4/.mkv/.webm/.avi -> encoded by ffmpeg when it is installed
+#? anything else (or no ffmpeg) -> directory of numbered PNG frames
+# Without ffmpeg a video RECORD_PATH becomes a frame directory without the
+# extension, e.g. recordings/training.mp4 -> recordings/training/, with a warning.
+# Frames are copied with pygame.surfarray at the native WIDTH x HEIGHT and
+# handed to the encoder thread through a bounded queue that is never waited on.
+#? RECORD_POLICY = 'drop' -> frames that do not fit in the queue are dropped
+#? RECORD_POLICY = 'throttle' -> only every n-th frame is captured, n grows while the queue is filling up
+'''
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.avi')
+POLICIES = ('drop', 'throttle')
+
+
+class Recorder:
+    """
+    Singleton background recorder for the game screen.
+
+    The game loop hands every drawn frame to `capture`, which copies the
+    pixels and returns immediately; a daemon thread encodes them to a video
+    with ffmpeg or to a PNG sequence. When the encoder falls behind, frames
+    are dropped or captured less often, but the game loop is never stalled.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance of Recorder and enforces the singleton pattern.
+
+        Returns:
+            Recorder: The instance of Recorder.
+        """
+        if cls._instance is None:
+            cls._instance = super(Recorder, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the Recorder singleton and starts the encoder thread.
+
+        Raises:
+            ValueError: If config.RECORD_POLICY is not a known policy.
+        """
+        if getattr(self, '_initialized', False):
+            return
+        self._initialized = True
+
+        if config.RECORD_POLICY not in POLICIES:
+            raise ValueError(f'Unknown RECORD_POLICY {config.RECORD_POLICY!r}, expected one of {POLICIES}')
+        self.PATH = config.RECORD_PATH
+        self.POLICY = config.RECORD_POLICY
+        self.FPS = config.FPS
+
+        self.queue = queue.Queue(maxsize=config.RECORD_QUEUE_SIZE)
+        self.captured = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.stride = 1
+        self.counter = 0
+        self.encoded = 0
+        self.error = None
+
+        self.ffmpeg = None
+        if self.PATH.lower().endswith(VIDEO_EXTENSIONS):
+            self.ffmpeg = shutil.which('ffmpeg')
+            if not self.ffmpeg:
+                self.PATH = os.path.splitext(self.PATH)[0]
+                print(f'[Recorder: ffmpeg not found, saving PNG frames to {self.PATH} instead]')
+        self.process = None
+        self.thread = threading.Thread(target=self._encode, name='recorder', daemon=True)
+        self.thread.start()
+
+    def capture(self, screen):
+        """
+        Copies a frame and queues it for the encoder without waiting.
+
+        Args:
+            screen (pygame.Surface): The native resolution game screen.
+        """
+        if self.error is not None:
+            # the encoder is gone, nothing would ever take the frame
+            self.dropped += 1
+            return
+        if self.POLICY == 'throttle':
+            self.counter += 1
+            if self.counter % self.stride:
+                self.skipped += 1
+                return
+            filled = self.queue.qsize() / self.queue.maxsize
+            if filled > 0.75:
+                self.stride = min(self.stride * 2, 64)
+            elif filled < 0.25 and self.stride > 1:
+                self.stride //= 2
+
+        frame = pygame.surfarray.array3d(screen)
+        try:
+            self.queue.put_nowait(frame)
+            self.captured += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _open_ffmpeg(self, width, height):
+        """
+        Starts ffmpeg reading raw RGB frames from its stdin.
+
+        Args:
+            width (int): The frame width.
+            height (int): The frame height.
+        """
+        directory = os.path.dirname(self.PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.process = subprocess.Popen(
+            [self.ffmpeg, '-loglevel', 'error', '-y',
+             '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(self.FPS), '-i', '-',
+             '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', self.PATH],
+            stdin=subprocess.PIPE,
+        )
+
+    def _encode(self):
+        """
+        Encoder thread: writes queued frames until close() sends None.
+
+        An error (e.g. ffmpeg exiting and the pipe breaking) ends the thread
+        and is kept in `error`; capture() then drops every frame.
+        """
+        try:
+            if not self.ffmpeg:
+                os.makedirs(self.PATH, exist_ok=True)
+            while True:
+                frame = self.queue.get()
+                if frame is None:
+                    break
+                # surfarray frames are (width, height, 3), encoders expect rows first
+                if self.ffmpeg:
+                    if self.process is None:
+                        self._open_ffmpeg(frame.shape[0], frame.shape[1])
+                    self.process.stdin.write(frame.transpose(1, 0, 2).tobytes())
+                else:
+                    surface = pygame.surfarray.make_surface(frame)
+                    pygame.image.save(surface, os.path.join(self.PATH, f'frame_{self.encoded:06d}.png'))
+                self.encoded += 1
+            if self.process is not None:
+                self.process.stdin.close()
+                self.process.wait()
+        except Exception as error:
+            self.error = error
+            if self.process is not None:
+                self.process.kill()
+                self.process.wait()
+
+    def close(self):
+        """
+        Encodes the frames still queued and finishes the file.
+
+        Waits for the encoder, so call it once training is over.
+        """
+        if self.thread is None:
+            return
+        # a full queue is only drained by a running encoder, never wait on a dead one
+        while self.thread.is_alive():
+            try:
+                self.queue.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                pass
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            print(f'[Recorder: encoding failed after {self.encoded} frames: {self.error!r}]')
+        print(f'[Recorder: {self.encoded} frames saved to {self.PATH}, {self.dropped} dropped, {self.skipped} skipped]')
@@ -0,0 +1,76 @@
+import config.config as config
+
+
+class SimClock:
+    """
+    Singleton simulation clock.
+
+    Provides the ticks used by the jump, score and collision cooldowns. A
+    tick is one simulation step: the clock counts whole steps instead of
+    adding up milliseconds, so a cooldown always ends on the same step
+    however long the clock has been running and however many steps are run
+    per rendered frame.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance of SimClock and enforces the singleton pattern.
+
+        Returns:
+            SimClock: The instance of SimClock.
+        """
+        if cls._instance is None:
+            cls._instance = super(SimClock, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the SimClock singleton at step zero.
+        """
+        if getattr(self, '_initialized', False):
+            return
+        self._initialized = True
+
+        self.ticks = 0
+
+    @staticmethod
+    def to_ticks(milliseconds):
+        """
+        Converts a cooldown in milliseconds to simulation steps at config.FPS.
+
+        `elapsed > to_ticks(milliseconds)` holds exactly when the elapsed steps
+        last longer than the cooldown, computed in integers so no rounding of
+        1000 / FPS can move the step a cooldown ends on.
+
+        Args:
+            milliseconds (int): The cooldown.
+
+        Returns:
+            int: The cooldown in whole simulation steps.
+        """
+        return milliseconds * config.FPS // 1000
+
+    def get_ticks(self):
+        """
+        Returns the simulated time.
+
+        Returns:
+            int: The number of simulation steps since the clock started.
+        """
+        return self.ticks
+
+    def advance(self, steps=1):
+        """
+        Moves the simulated time forward.
+
+        Args:
+            steps (int): The number of simulation steps.
+        """
+        self.ticks += steps
+
+    def reset(self):
+        """
+        Sets the simulated time back to zero.
+        """
+        self.ticks = 0
@@ -0,0 +1,162 @@
+import math
+import threading
+import pygame
+from scripts.Assets import Assets
+from scripts.Density import DensityBand
+
+
+class Snapshot:
+    """
+    Compact copy of everything needed to draw one simulation step.
+
+    Only holds plain values: the y and tint of every alive bird, the
+    position of every pipe and the score. The lists are never modified
+    after publishing, the simulation builds new ones for every snapshot.
+    In the density view the birds are only the ones drawn as sprites and
+    `density` holds the bird count of every screen row.
+    """
+    __slots__ = ('ys', 'colors', 'pipes', 'score', 'step', 'density')
+
+    def __init__(self):
+        """
+        Initializes an empty snapshot.
+        """
+        self.ys = []
+        self.colors = []
+        self.pipes = []
+        self.score = 0
+        self.step = -1
+        self.density = None
+
+
+class SnapshotBuffer:
+    """
+    Double buffer of Snapshots between the simulation and the render thread.
+
+    The simulation fills the back snapshot and swaps it to the front; the
+    renderer reads the fields of the front snapshot under the same short
+    lock, so it always gets one consistent step. Neither side ever waits
+    for the other to finish a frame.
+    """
+    def __init__(self):
+        """
+        Initializes both snapshots and the lock guarding the swap.
+        """
+        self.snapshots = [Snapshot(), Snapshot()]
+        self.front = 0
+        self.lock = threading.Lock()
+        self.wanted = True
+
+    def publish(self, ys, colors, pipes, score, step, density=None):
+        """
+        Writes a new step into the back snapshot and makes it the front one.
+
+        Args:
+            ys (list): The y of every alive bird.
+            colors (list): The RGBA tint of every alive bird.
+            pipes (list): The (x, y) of every top and bottom pipe.
+            score (int): The score of the population.
+            step (int): The simulation step the snapshot was taken at.
+            density (np.ndarray): The bird count of every screen row, None to draw only the sprites.
+        """
+        back = self.snapshots[1 - self.front]
+        back.ys = ys
+        back.colors = colors
+        back.pipes = pipes
+        back.score = score
+        back.step = step
+        back.density = density
+        with self.lock:
+            self.front = 1 - self.front
+            self.wanted = False
+
+    def read(self):
+        """
+        Returns the latest step and asks the simulation for a new one.
+
+        Returns:
+            tuple: (ys, colors, pipes, score, step, density) of the front snapshot.
+        """
+        with self.lock:
+            front = self.snapshots[self.front]
+            self.wanted = True
+            return front.ys, front.colors, front.pipes, front.score, front.step, front.density
+
+
+class SnapshotRenderer:
+    """
+    Draws snapshots without touching the simulation objects.
+
+    Bird frames are tinted lazily and cached per color; all birds share one
+    animation counter.
+    """
+    ANIMATION_SPEED = 0.5
+
+    def __init__(self, bird_x):
+        """
+        Initializes the renderer.
+
+        Args:
+            bird_x (int): The x position of the bird column.
+        """
+        self.assets = Assets()
+        self.bird_x = bird_x
+        self.max_index = len(self.assets.assets['player']) - 1
+        self.index = 0
+        self.index_counter = 0
+        self.frames = {}
+        self.band = None
+
+    def frame(self, color):
+        """
+        Returns the current animation frame tinted with a color.
+
+        Args:
+            color (tuple): The RGBA tint.
+
+        Returns:
+            pygame.Surface: The tinted frame.
+        """
+        frames = self.frames.get(color)
+        if frames is None:
+            frames = self.frames[color] = [None] * (self.max_index + 1)
+        frame = frames[self.index]
+        if frame is None:
+            frame = self.assets.assets['player'][self.index].copy()
+            frame.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            frames[self.index] = frame
+        return frame
+
+    def draw(self, screen, background, gui, snapshot):
+        """
+        Draws a snapshot onto the screen.
+
+        Args:
+            screen (pygame.Surface): The native resolution game screen.
+            background (Background): The background to draw first.
+            gui (GUI): The GUI showing the score.
+            snapshot (tuple): The snapshot as returned by SnapshotBuffer.read.
+        """
+        ys, colors, pipes, score, _, density = snapshot
+
+        self.index_counter += self.ANIMATION_SPEED
+        if self.index_counter > self.max_index + 0.95:
+            self.index_counter = 0
+            self.index = 0
+        else:
+            self.index = math.floor(self.index_counter)
+
+        screen.fill((0, 0, 0))
+        background.draw(screen)
+        if density is not None:
+            if self.band is None:
+                player = self.assets.assets['player'][0]
+                self.band = DensityBand(self.bird_x, player.get_width(), screen.get_height())
+            self.band.draw(screen, density)
+        for y, color in zip(ys, colors):
+            screen.blit(self.frame(color), (self.bird_x, y))
+        pipe = self.assets.assets['pipe'][0]
+        for x, y in pipes:
+            screen.blit(pipe, (x, y))
+        gui.update_score(score)
+        gui.draw(screen)